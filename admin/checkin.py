@@ -7,6 +7,7 @@ from aiogram.types import Message
 from loguru import logger
 
 from bot.database.manager import DatabaseManager
+from bot.services.chat_admin_cache import ChatAdminCache
 from config.settings import settings
 
 checkin_router = Router(name="checkin_router")
@@ -14,7 +15,7 @@ checkin_router.message.filter(F.chat.type.in_(["group", "supergroup"]))
 
 
 @checkin_router.message(Command("checkin"))
-async def checkin_command(message: Message, db_manager: DatabaseManager):
+async def checkin_command(message: Message, db_manager: DatabaseManager, chat_admins: ChatAdminCache):
     """
     Команда для переключения режима проверки существующих участников группы.
     Доступна только администраторам группы.
@@ -37,8 +38,7 @@ async def checkin_command(message: Message, db_manager: DatabaseManager):
 
             if not is_global_admin:
                 try:
-                    chat_member = await message.bot.get_chat_member(group_id, user_id)
-                    is_group_admin = chat_member.status in ["administrator", "creator"]
+                    is_group_admin = await chat_admins.is_admin(message.bot, group_id, user_id)
                 except Exception as e:
                     logger.error(f"Ошибка проверки прав администратора: {e}")
                     try:
@@ -1,18 +1,28 @@
 """Базовые функции для административных операций."""
+from typing import Optional
+
 from aiogram.types import User
 from config.settings import Settings
 from bot.services.admin_service import AdminService
+from bot.services.chat_admin_cache import ChatAdminCache
 from loguru import logger
 
 from bot.database.models.admin import Admin
 
 
 async def user_is_admin_in_chat(
-    user: User, chat_id: int, admin_service: AdminService, settings: Settings, bot=None
+    user: User,
+    chat_id: int,
+    admin_service: AdminService,
+    settings: Settings,
+    bot=None,
+    chat_admins: Optional[ChatAdminCache] = None,
 ) -> bool:
     """
     Проверяет, является ли пользователь администратором в указанном чате,
     учитывая как глобальных, так и локальных администраторов, а также реальные права в Telegram.
+
+    Если передан кэш администраторов, права проверяются по нему без запроса к Telegram.
     """
     if user.is_bot and user.username == "GroupAnonymousBot":
         return True
@@ -23,6 +33,9 @@ async def user_is_admin_in_chat(
     if user.id in settings.admin_user_ids:
         return True
 
+    if bot and chat_admins:
+        return await chat_admins.is_admin(bot, chat_id, user.id)
+
     if bot:
         try:
             chat_member = await bot.get_chat_member(chat_id, user.id)
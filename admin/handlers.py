@@ -9,6 +9,8 @@ from loguru import logger
 
 from bot.handlers.admin.core import user_is_admin_in_chat
 from bot.services.admin_service import AdminService
+from bot.services.bot_api_cache import BotApiCache
+from bot.services.chat_admin_cache import ChatAdminCache
 from config.settings import Settings
 
 # В начало файла добавляем новые импорты
@@ -22,7 +24,9 @@ from aiogram.enums import ChatMemberStatus
         member_status_changed=ChatMemberStatus.LEFT >> ChatMemberStatus.MEMBER
     )
 )
-async def on_new_member(event: ChatMemberUpdated, admin_service: AdminService, settings: Settings):
+async def on_new_member(
+    event: ChatMemberUpdated, admin_service: AdminService, settings: Settings, chat_admins: ChatAdminCache
+):
     """
     Обрабатывает вступление новых участников в группу.
     Отправляет им приветственное сообщение с просьбой пройти верификацию.
@@ -52,7 +56,7 @@ async def on_new_member(event: ChatMemberUpdated, admin_service: AdminService, s
             logger.warning(f"Не удалось отправить сообщение пользователю {event.new_chat_member.user.id}: {e}")
             # Если не получилось отправить в ЛС, пишем в группу (если бот имеет права)
             if await user_is_admin_in_chat(
-                await event.bot.me(), event.chat.id, admin_service, settings, event.bot
+                await event.bot.me(), event.chat.id, admin_service, settings, event.bot, chat_admins
             ):
                 msg = await event.chat.send_message(
                     f"{event.new_chat_member.user.mention_html()}, "
@@ -89,7 +93,11 @@ def get_admin_panel_keyboard(group_id: int) -> InlineKeyboardBuilder:
 
 @admin_handlers_router.message(Command("admin"), F.chat.type.in_(["group", "supergroup"]))
 async def admin_command_in_group(
-    message: Message, admin_service: AdminService, settings: Settings
+    message: Message,
+    admin_service: AdminService,
+    settings: Settings,
+    chat_admins: ChatAdminCache,
+    bot_api: BotApiCache,
 ):
     """
     Обрабатывает команду /admin в групповых чатах.
@@ -97,7 +105,7 @@ async def admin_command_in_group(
     """
     try:
         is_admin = await user_is_admin_in_chat(
-            message.from_user, message.chat.id, admin_service, settings, message.bot
+            message.from_user, message.chat.id, admin_service, settings, message.bot, chat_admins
         )
 
         if not is_admin:
@@ -111,7 +119,7 @@ async def admin_command_in_group(
 
         # Проверяем, не является ли отправитель анонимным администратором
         if message.from_user.is_bot and message.from_user.username == "GroupAnonymousBot":
-            bot_username = (await message.bot.get_me()).username
+            bot_username = (await bot_api.get_me()).username
             warning_msg = await message.reply(
                 f"🔧 **Админ-панель**\n\n"
                 f"👆 [Открыть панель управления](https://t.me/{bot_username}?start=admin_{message.chat.id})",
@@ -137,7 +145,7 @@ async def admin_command_in_group(
         except TelegramBadRequest as e:
             logger.warning(f"⚠️ Не удалось отправить личное сообщение пользователю {message.from_user.id}: {e}")
 
-            bot_username = (await message.bot.get_me()).username
+            bot_username = (await bot_api.get_me()).username
             warning_msg = await message.reply(
                 f"⚠️ @{message.from_user.username or message.from_user.first_name}, "
                 f"для доступа к админ-панели:\n\n"
@@ -194,7 +202,13 @@ async def admin_command_in_private(message: Message, settings: Settings, admin_s
 
 
 @admin_handlers_router.message(CommandStart(deep_link=True, magic=F.args.startswith("admin_")))
-async def admin_deep_link_handler(message: Message, admin_service: AdminService, settings: Settings):
+async def admin_deep_link_handler(
+    message: Message,
+    admin_service: AdminService,
+    settings: Settings,
+    chat_admins: ChatAdminCache,
+    bot_api: BotApiCache,
+):
     """
     Обрабатывает переходы по ссылке /start admin_group_id.
     Отправляет админ-панель для указанной группы.
@@ -205,7 +219,7 @@ async def admin_deep_link_handler(message: Message, admin_service: AdminService,
 
         # Проверяем права администратора
         is_admin = await user_is_admin_in_chat(
-            message.from_user, group_id, admin_service, settings, message.bot
+            message.from_user, group_id, admin_service, settings, message.bot, chat_admins
         )
 
         if not is_admin:
@@ -216,7 +230,7 @@ async def admin_deep_link_handler(message: Message, admin_service: AdminService,
 
         # Получаем информацию о группе
         try:
-            chat = await message.bot.get_chat(group_id)
+            chat = await bot_api.get_chat(group_id)
             group_name = chat.title
         except Exception:
             group_name = "Неизвестная группа"
@@ -244,13 +258,14 @@ async def admin_deep_link_handler(message: Message, admin_service: AdminService,
 async def cmd_report(
     message: Message,
     admin_service: AdminService,
-    settings: Settings
+    settings: Settings,
+    chat_admins: ChatAdminCache
 ):
     """Отправляет администратору отчет по верификации"""
     try:
         # Проверяем права админа
         is_admin = await user_is_admin_in_chat(
-            message.from_user, message.chat.id, admin_service, settings, message.bot
+            message.from_user, message.chat.id, admin_service, settings, message.bot, chat_admins
         )
         if not is_admin:
             return
@@ -1,13 +1,22 @@
 """Основной класс приложения для управления ботом."""
+import asyncio
+import contextlib
+
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from aiogram.fsm.strategy import FSMStrategy
 from aiogram.fsm.storage.memory import MemoryStorage
 from loguru import logger
+from openai import AsyncOpenAI
 
 from bot.database.manager import DatabaseManager
 from bot.dispatcher_setup import setup_dispatcher
+from bot.services.bot_api_cache import BotApiCache
+from bot.services.chat_admin_cache import ChatAdminCache
+from bot.services.openai_client import create_openai_client, warm_up_openai_client
+from bot.services.telegram_file_cache import get_telegram_file_cache
+from bot.services.verification_queue import VerificationQueue
 from bot.utils.commands import set_bot_commands
 from config.settings import Settings
 
@@ -17,6 +26,12 @@ class BotApp:
         self.bot: Bot = None
         self.dp: Dispatcher = None
         self.db_manager: DatabaseManager = None
+        self.chat_admins: ChatAdminCache = None
+        self.bot_api: BotApiCache = None
+        self.openai_client: AsyncOpenAI = None
+        self.verification_queue: VerificationQueue = None
+        self._admin_resync_task: asyncio.Task = None
+        self._openai_warm_up_task: asyncio.Task = None
 
     async def start_polling(self):
         """Альтернативное имя для метода run (для совместимости)"""
@@ -39,14 +54,59 @@ class BotApp:
             default=DefaultBotProperties(parse_mode=ParseMode.HTML)
         )
         self.dp = Dispatcher(storage=MemoryStorage(), fsm_strategy=FSMStrategy.GLOBAL_USER)
-        self.db_manager = DatabaseManager(self.settings.database_path)
+        self.db_manager = DatabaseManager.from_settings(self.settings)
         
         await self.db_manager.init_database()
-        setup_dispatcher(self.dp, self.db_manager, self.settings)
+        await asyncio.to_thread(get_telegram_file_cache().purge)
+        self.chat_admins = ChatAdminCache(self.db_manager)
+        self.bot_api = BotApiCache(self.bot)
+        self.openai_client = create_openai_client(self.settings)
+        if self.settings.openai_warm_up:
+            self._openai_warm_up_task = asyncio.create_task(warm_up_openai_client(self.openai_client))
+        self.verification_queue = VerificationQueue(
+            self.db_manager,
+            self.bot,
+            self.dp.storage,
+            self.openai_client,
+            workers=self.settings.verification_workers,
+            poll_interval=self.settings.verification_queue_poll_seconds,
+            lease_seconds=self.settings.verification_job_lease_seconds,
+            max_attempts=self.settings.verification_job_max_attempts,
+            retry_delay_seconds=self.settings.verification_job_retry_seconds,
+        )
+        setup_dispatcher(
+            self.dp,
+            self.db_manager,
+            self.settings,
+            self.chat_admins,
+            self.bot_api,
+            self.openai_client,
+            self.verification_queue,
+        )
         await set_bot_commands(self.bot)
+        self._admin_resync_task = asyncio.create_task(
+            self.chat_admins.run_resync(self.bot, self.settings.chat_admin_resync_seconds)
+        )
+        await self.verification_queue.start()
 
     async def _shutdown(self):
         """Корректное завершение работы."""
+        if self._admin_resync_task:
+            self._admin_resync_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._admin_resync_task
+        if self.verification_queue:
+            await self.verification_queue.stop()
+        if self._openai_warm_up_task:
+            self._openai_warm_up_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._openai_warm_up_task
+        if self.openai_client:
+            await self.openai_client.close()
+        if self.bot_api:
+            logger.info(f"Кэш Bot API: {self.bot_api.stats()}")
+        file_cache = get_telegram_file_cache()
+        logger.info(f"Кэш файлов Telegram: {file_cache.hits} попаданий, {file_cache.misses} загрузок")
         if hasattr(self, 'db_manager') and self.db_manager:
             await self.db_manager.close()
         if hasattr(self, 'bot') and self.bot:
@@ -17,7 +17,12 @@ from config.settings import Settings
 
 
 if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
     from bot.database.manager import DatabaseManager
+    from bot.services.bot_api_cache import BotApiCache
+    from bot.services.chat_admin_cache import ChatAdminCache
+    from bot.services.verification_queue import VerificationQueue
     from config.settings import Settings
 
 
@@ -25,6 +30,10 @@ def setup_dispatcher(
     dp: Dispatcher,
     db_manager: "DatabaseManager",
     settings: "Settings",
+    chat_admins: "ChatAdminCache",
+    bot_api: "BotApiCache",
+    openai_client: "AsyncOpenAI",
+    verification_queue: "VerificationQueue",
 ) -> None:
     """
     Настраивает диспетчер, регистрируя middleware и обработчики.
@@ -33,10 +42,18 @@ def setup_dispatcher(
         dp: Экземпляр Dispatcher.
         db_manager: Менеджер базы данных.
         settings: Конфигурация бота.
+        chat_admins: Кэш администраторов групп.
+        bot_api: Кэширующий прокси запросов к Bot API.
+        openai_client: Общий клиент OpenAI.
+        verification_queue: Очередь фоновых проверок.
     """
     service_middleware = ServiceMiddleware(
         db_manager=db_manager,
         settings=settings,
+        chat_admins=chat_admins,
+        bot_api=bot_api,
+        openai_client=openai_client,
+        verification_queue=verification_queue,
     )
     dp.update.middleware(service_middleware)
     
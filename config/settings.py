@@ -1,8 +1,36 @@
-from typing import List
-from pydantic import Field, SecretStr, field_validator
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field, SecretStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class SQLiteTuningProfile(BaseModel):
+    """Набор PRAGMA, применяемых к соединениям SQLite при подключении."""
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024
+    cache_size: int = -64 * 1024  # отрицательное значение - размер в КиБ
+    temp_store: str = "MEMORY"
+    busy_timeout: int = 5000  # мс
+    wal_checkpoint_interval_seconds: int = 300  # 0 - без периодического checkpoint
+
+
+SQLITE_TUNING_PROFILES: Dict[str, SQLiteTuningProfile] = {
+    # Значения SQLite по умолчанию: rollback journal и полный fsync
+    "default": SQLiteTuningProfile(
+        journal_mode="DELETE",
+        synchronous="FULL",
+        mmap_size=0,
+        cache_size=-2000,
+        temp_store="DEFAULT",
+        busy_timeout=5000,
+        wal_checkpoint_interval_seconds=0,
+    ),
+    # WAL: читатели не блокируются писателем, fsync только на checkpoint
+    "production": SQLiteTuningProfile(),
+}
+
+
 class Settings(BaseSettings):
     """Настройки приложения с валидацией."""
 
@@ -22,13 +50,38 @@ class Settings(BaseSettings):
     verification_complete_timeout_hours: int = Field(..., alias="VERIFICATION_COMPLETE_TIMEOUT_HOURS")
     check_interval_seconds: int = Field(3600, alias="CHECK_INTERVAL_SECONDS")
     max_verification_attempts: int = Field(..., alias="MAX_VERIFICATION_ATTEMPTS")
+    verification_workers: int = Field(2, alias="VERIFICATION_WORKERS")
+    verification_queue_poll_seconds: float = Field(5, alias="VERIFICATION_QUEUE_POLL_SECONDS")
+    verification_job_lease_seconds: int = Field(600, alias="VERIFICATION_JOB_LEASE_SECONDS")
+    verification_job_max_attempts: int = Field(3, alias="VERIFICATION_JOB_MAX_ATTEMPTS")
+    verification_job_retry_seconds: int = Field(30, alias="VERIFICATION_JOB_RETRY_SECONDS")
 
     # База данных
-    database_url: str = Field(..., alias="DATABASE_URL")
+    database_path: str = Field("./sqlite.db", alias="DATABASE_PATH")
+    database_url: Optional[str] = Field(None, alias="DATABASE_URL")
+    db_pool_min_size: int = Field(1, alias="DB_POOL_MIN_SIZE")
+    db_pool_max_size: int = Field(10, alias="DB_POOL_MAX_SIZE")
+    db_group_commit_window_ms: int = Field(0, alias="DB_GROUP_COMMIT_WINDOW_MS")
+    db_reader_pool_size: int = Field(4, alias="DB_READER_POOL_SIZE")
+    sqlite_tuning_profile: str = Field("production", alias="SQLITE_TUNING_PROFILE")
+    db_compact_schema: bool = Field(False, alias="DB_COMPACT_SCHEMA")
+
+    # Кэширование
+    verification_cache_size: int = Field(100_000, alias="VERIFICATION_CACHE_SIZE")
+    verification_cache_ttl_seconds: int = Field(600, alias="VERIFICATION_CACHE_TTL_SECONDS")
+    verification_negative_cache_size: int = Field(50_000, alias="VERIFICATION_NEGATIVE_CACHE_SIZE")
+    verification_negative_cache_ttl_seconds: int = Field(30, alias="VERIFICATION_NEGATIVE_CACHE_TTL_SECONDS")
+    verified_snapshot: bool = Field(True, alias="VERIFIED_SNAPSHOT")
+    group_cache_size: int = Field(10_000, alias="GROUP_CACHE_SIZE")
+    group_cache_ttl_seconds: int = Field(300, alias="GROUP_CACHE_TTL_SECONDS")
+    chat_admin_resync_seconds: int = Field(3600, alias="CHAT_ADMIN_RESYNC_SECONDS")
 
     # Файлы
     max_file_size_mb: int = Field(..., alias="MAX_FILE_SIZE_MB")
     allowed_file_types: List[str] = Field(..., alias="ALLOWED_FILE_TYPES")
+    telegram_file_cache_dir: str = Field("./cache/telegram_files", alias="TELEGRAM_FILE_CACHE_DIR")
+    telegram_file_cache_max_mb: int = Field(512, alias="TELEGRAM_FILE_CACHE_MAX_MB")
+    telegram_file_cache_ttl_hours: int = Field(72, alias="TELEGRAM_FILE_CACHE_TTL_HOURS")
 
     # Флаги
     auto_delete_unverified: bool = Field(..., alias="AUTO_DELETE_UNVERIFIED")
@@ -38,6 +91,41 @@ class Settings(BaseSettings):
     # OpenAI
     openai_api_key: str = Field(None, alias="OPENAI_API_KEY")
     openai_model: str = Field("gpt-4o", alias="OPENAI_MODEL")
+    openai_timeout_seconds: float = Field(120, alias="OPENAI_TIMEOUT_SECONDS")
+    openai_connect_timeout_seconds: float = Field(10, alias="OPENAI_CONNECT_TIMEOUT_SECONDS")
+    openai_max_retries: int = Field(2, alias="OPENAI_MAX_RETRIES")
+    openai_max_connections: int = Field(20, alias="OPENAI_MAX_CONNECTIONS")
+    openai_max_keepalive_connections: int = Field(10, alias="OPENAI_MAX_KEEPALIVE_CONNECTIONS")
+    openai_keepalive_expiry_seconds: float = Field(60, alias="OPENAI_KEEPALIVE_EXPIRY_SECONDS")
+    openai_warm_up: bool = Field(True, alias="OPENAI_WARM_UP")
+    openai_rpm_limit: int = Field(500, alias="OPENAI_RPM_LIMIT")
+    openai_tpm_limit: int = Field(30000, alias="OPENAI_TPM_LIMIT")
+    openai_model_rate_limits: Dict[str, Tuple[int, int]] = Field(default_factory=dict, alias="OPENAI_MODEL_RATE_LIMITS")
+    website_result_cache_ttl_hours: int = Field(168, alias="WEBSITE_RESULT_CACHE_TTL_HOURS")
+    website_result_cache_negative_ttl_hours: int = Field(24, alias="WEBSITE_RESULT_CACHE_NEGATIVE_TTL_HOURS")
+    document_result_cache_ttl_hours: int = Field(720, alias="DOCUMENT_RESULT_CACHE_TTL_HOURS")
+    document_result_cache_negative_ttl_hours: int = Field(24, alias="DOCUMENT_RESULT_CACHE_NEGATIVE_TTL_HOURS")
+    document_image_preprocessing: bool = Field(True, alias="DOCUMENT_IMAGE_PREPROCESSING")
+    document_image_max_edge: int = Field(1600, alias="DOCUMENT_IMAGE_MAX_EDGE")
+    document_image_grayscale: bool = Field(False, alias="DOCUMENT_IMAGE_GRAYSCALE")
+    document_image_format: str = Field("JPEG", alias="DOCUMENT_IMAGE_FORMAT")
+    document_image_quality: int = Field(85, alias="DOCUMENT_IMAGE_QUALITY")
+    pdf_max_pages: int = Field(3, alias="PDF_MAX_PAGES")
+    pdf_render_dpi: int = Field(150, alias="PDF_RENDER_DPI")
+    pdf_text_max_chars: int = Field(6000, alias="PDF_TEXT_MAX_CHARS")
+
+    @field_validator('sqlite_tuning_profile')
+    def validate_sqlite_tuning_profile(cls, v):
+        if v not in SQLITE_TUNING_PROFILES:
+            raise ValueError(f"SQLITE_TUNING_PROFILE должен быть одним из: {', '.join(SQLITE_TUNING_PROFILES)}")
+        return v
+
+    @field_validator('document_image_format')
+    def validate_document_image_format(cls, v):
+        v = v.upper()
+        if v not in ("JPEG", "WEBP"):
+            raise ValueError("DOCUMENT_IMAGE_FORMAT должен быть JPEG или WEBP")
+        return v
 
     @field_validator('admin_user_ids', mode='before')
     def parse_admin_ids(cls, v):
@@ -63,6 +151,10 @@ class Settings(BaseSettings):
     def get_telegram_bot_token(self) -> str:
         return self.telegram_bot_token.get_secret_value()
 
+    @property
+    def sqlite_tuning(self) -> SQLiteTuningProfile:
+        return SQLITE_TUNING_PROFILES[self.sqlite_tuning_profile]
+
     @property
     def max_file_size_bytes(self) -> int:
         return self.max_file_size_mb * 1024 * 1024
@@ -0,0 +1,7 @@
+"""Реализации хранилища для DatabaseManager."""
+
+from bot.database.backends.base import StorageBackend
+from bot.database.backends.postgres import PostgresBackend
+from bot.database.backends.sqlite import SQLiteBackend
+
+__all__ = ["StorageBackend", "SQLiteBackend", "PostgresBackend"]
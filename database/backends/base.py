@@ -0,0 +1,118 @@
+"""Интерфейс хранилища, общий для SQLite и PostgreSQL."""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional, Sequence, Set
+
+from loguru import logger
+
+
+def run_callbacks(callbacks: List[Callable[[], None]]) -> None:
+    """Вызов обработчиков коммита; ошибка одного не мешает остальным."""
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"❌ Ошибка обработчика после коммита: {e}")
+
+
+class StorageBackend(ABC):
+    """
+    Хранилище, через которое работают репозитории и миграции.
+
+    Запросы пишутся в общем подмножестве SQL с плейсхолдерами `?`:
+    CURRENT_TIMESTAMP вместо datetime('now'), TRUE/FALSE для булевых
+    значений, ON CONFLICT вместо INSERT OR IGNORE. Отличия диалектов
+    (плейсхолдеры, параметры времени) скрывает реализация.
+    """
+
+    #: Имя диалекта SQL, совпадает с каталогом миграций в sql/migrations
+    dialect: str = ""
+
+    @abstractmethod
+    async def connect(self) -> None:
+        """Открытие соединений."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Закрытие соединений с фиксацией незавершенных записей."""
+
+    @abstractmethod
+    async def execute(self, query: str, parameters: Sequence[Any] = ()) -> int:
+        """
+        Выполнение изменяющего запроса.
+
+        Внутри `transaction()` запрос присоединяется к транзакции,
+        иначе фиксируется сразу.
+
+        :return: Количество затронутых строк.
+        """
+
+    @abstractmethod
+    async def execute_returning(self, query: str, parameters: Sequence[Any] = ()) -> Optional[Any]:
+        """
+        Выполнение изменяющего запроса с RETURNING на соединении для записи.
+
+        :return: Первая возвращенная строка или None.
+        """
+
+    @abstractmethod
+    async def executemany(self, query: str, parameters: Iterable[Sequence[Any]]) -> None:
+        """
+        Выполнение изменяющего запроса для каждого набора параметров.
+
+        Все наборы применяются атомарно: внутри `transaction()` - в ее
+        составе, иначе - в собственной транзакции с одним коммитом.
+        """
+
+    @abstractmethod
+    async def fetchone(self, query: str, parameters: Sequence[Any] = ()) -> Optional[Any]:
+        """Выполнение запроса и получение одной строки (доступ по имени и индексу столбца)."""
+
+    @abstractmethod
+    async def fetchall(self, query: str, parameters: Sequence[Any] = ()) -> List[Any]:
+        """Выполнение запроса и получение всех строк."""
+
+    @abstractmethod
+    def transaction(self) -> AsyncIterator[None]:
+        """
+        Unit-of-work: все записи внутри блока фиксируются одним коммитом.
+
+        Вложенные вызовы присоединяются к внешней транзакции.
+        """
+
+    @property
+    @abstractmethod
+    def in_transaction(self) -> bool:
+        """Выполняется ли текущая задача внутри unit-of-work."""
+
+    @abstractmethod
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Вызов callback после коммита текущей транзакции.
+
+        Нужен для сброса кэшей: до коммита другие задачи читают старые
+        данные и могут снова сохранить их в кэш. Вне транзакции callback
+        вызывается сразу, при откате - не вызывается.
+        """
+
+    @abstractmethod
+    async def table_exists(self, name: str) -> bool:
+        """Проверка наличия таблицы."""
+
+    @abstractmethod
+    async def table_columns(self, name: str) -> Set[str]:
+        """Имена столбцов таблицы."""
+
+    async def lock_schema(self) -> None:
+        """
+        Блокировка миграций на время транзакции.
+
+        Нужна, когда несколько воркеров запускаются одновременно
+        с общей базой. По умолчанию ничего не делает.
+        """
+
+    def timestamp(self, value: datetime) -> Any:
+        """Значение времени (UTC, без часового пояса) в виде параметра запроса."""
+        return value
+
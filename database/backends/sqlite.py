@@ -0,0 +1,216 @@
+"""Хранилище на SQLite: одно соединение-писатель и пул читателей."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+import aiosqlite
+from loguru import logger
+
+from bot.database.backends.base import StorageBackend
+from bot.database.pool import ReaderPool
+from bot.database.transaction import TransactionManager
+
+if TYPE_CHECKING:
+    from config.settings import SQLiteTuningProfile
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Хранилище на одном файле SQLite.
+
+    Записи идут через единственное соединение под `TransactionManager`
+    (unit-of-work и групповой коммит), чтения - через пул read-only
+    соединений, если он включен.
+    """
+
+    dialect = "sqlite"
+
+    def __init__(
+        self,
+        db_path: str,
+        group_commit_window_ms: int = 0,
+        reader_pool_size: int = 4,
+        tuning: Optional["SQLiteTuningProfile"] = None,
+    ):
+        """
+        Инициализация хранилища.
+
+        :param db_path: Путь к файлу SQLite.
+        :param group_commit_window_ms: Окно группового коммита в мс (0 - коммит после каждой записи).
+        :param reader_pool_size: Количество соединений для чтения (0 - чтение через писателя).
+        :param tuning: Профиль PRAGMA из настроек (None - значения SQLite по умолчанию).
+        """
+        self.db_path = db_path
+        self.tuning = tuning
+        self.group_commit_window_ms = group_commit_window_ms
+        self.reader_pool_size = 0 if db_path == ":memory:" else reader_pool_size
+        self.conn: Optional[aiosqlite.Connection] = None
+        self.transactions: Optional[TransactionManager] = None
+        self.readers: Optional[ReaderPool] = None
+        self._checkpoint_task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        """Открытие писателя и пула читателей с применением профиля PRAGMA."""
+        self.conn = await aiosqlite.connect(self.db_path)
+        self.conn.row_factory = aiosqlite.Row
+        await self.conn.execute("PRAGMA foreign_keys = ON;")
+        await self._apply_tuning(self.conn, self._writer_pragmas())
+        self.transactions = TransactionManager(self.conn, self.group_commit_window_ms)
+
+        if self.reader_pool_size > 0:
+            self.readers = ReaderPool(self.db_path, self.reader_pool_size)
+            await self.readers.open(self._reader_pragmas())
+
+        await self._report_pragmas()
+
+        if self.tuning and self.tuning.wal_checkpoint_interval_seconds > 0:
+            self._checkpoint_task = asyncio.create_task(
+                self._wal_checkpoint_loop(self.tuning.wal_checkpoint_interval_seconds)
+            )
+
+    async def close(self) -> None:
+        """Закрытие соединений."""
+        if self._checkpoint_task:
+            self._checkpoint_task.cancel()
+            self._checkpoint_task = None
+        if self.readers:
+            await self.readers.close()
+        if self.conn:
+            if self.transactions:
+                await self.transactions.flush()
+            await self.conn.close()
+
+    async def execute(self, query: str, parameters: Sequence[Any] = ()) -> int:
+        """Выполнение изменяющего запроса через координатор транзакций."""
+        cursor = await self.transactions.execute(query, parameters)
+        return cursor.rowcount
+
+    async def execute_returning(self, query: str, parameters: Sequence[Any] = ()) -> Optional[aiosqlite.Row]:
+        """Выполнение запроса с RETURNING через координатор транзакций."""
+        rows = await self.transactions.execute_returning(query, parameters)
+        return rows[0] if rows else None
+
+    async def executemany(self, query: str, parameters: Iterable[Sequence[Any]]) -> None:
+        """Пакетное выполнение запроса в одной транзакции писателя."""
+        async with self.transactions.transaction():
+            await self.conn.executemany(query, parameters)
+
+    async def fetchone(self, query: str, parameters: Sequence[Any] = ()) -> Optional[aiosqlite.Row]:
+        """Выполнение SQL запроса и получение одной записи."""
+        if self._use_writer():
+            async with self.conn.execute(query, parameters) as cursor:
+                return await cursor.fetchone()
+        async with self.readers.acquire() as conn:
+            async with conn.execute(query, parameters) as cursor:
+                return await cursor.fetchone()
+
+    async def fetchall(self, query: str, parameters: Sequence[Any] = ()) -> List[aiosqlite.Row]:
+        """Выполнение SQL запроса и получение всех записей."""
+        if self._use_writer():
+            async with self.conn.execute(query, parameters) as cursor:
+                return await cursor.fetchall()
+        async with self.readers.acquire() as conn:
+            async with conn.execute(query, parameters) as cursor:
+                return await cursor.fetchall()
+
+    def _use_writer(self) -> bool:
+        """
+        Чтение через писателя: если пула нет или идет unit-of-work
+        (чтобы видеть собственные незафиксированные изменения).
+        """
+        return self.readers is None or self.transactions.in_transaction
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """Unit-of-work на соединении-писателе (BEGIN IMMEDIATE)."""
+        async with self.transactions.transaction():
+            yield
+
+    @property
+    def in_transaction(self) -> bool:
+        """Выполняется ли текущая задача внутри unit-of-work."""
+        return self.transactions is not None and self.transactions.in_transaction
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Вызов callback после коммита текущей транзакции (вне транзакции - сразу)."""
+        if self.transactions is None:
+            callback()
+        else:
+            self.transactions.after_commit(callback)
+
+    async def table_exists(self, name: str) -> bool:
+        """Проверка наличия таблицы."""
+        async with self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ) as cursor:
+            return await cursor.fetchone() is not None
+
+    async def table_columns(self, name: str) -> Set[str]:
+        """Имена столбцов таблицы."""
+        async with self.conn.execute(f"PRAGMA table_info({name})") as cursor:
+            return {row[1] for row in await cursor.fetchall()}
+
+    def timestamp(self, value: datetime) -> str:
+        """Время в формате CURRENT_TIMESTAMP, чтобы сравнение строк было корректным."""
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+
+    def _reader_pragmas(self) -> List[str]:
+        """PRAGMA для соединений чтения (действуют в пределах соединения)."""
+        if not self.tuning:
+            return []
+        return [
+            f"PRAGMA busy_timeout = {self.tuning.busy_timeout}",
+            f"PRAGMA mmap_size = {self.tuning.mmap_size}",
+            f"PRAGMA cache_size = {self.tuning.cache_size}",
+            f"PRAGMA temp_store = {self.tuning.temp_store}",
+        ]
+
+    def _writer_pragmas(self) -> List[str]:
+        """PRAGMA для соединения-писателя, включая режим журнала."""
+        if not self.tuning:
+            return []
+        return [
+            f"PRAGMA journal_mode = {self.tuning.journal_mode}",
+            f"PRAGMA synchronous = {self.tuning.synchronous}",
+            *self._reader_pragmas(),
+        ]
+
+    @staticmethod
+    async def _apply_tuning(conn: aiosqlite.Connection, pragmas: List[str]) -> None:
+        """Применение PRAGMA к соединению."""
+        for pragma in pragmas:
+            await conn.execute(pragma)
+
+    async def get_effective_pragmas(self) -> Dict[str, object]:
+        """Фактические значения PRAGMA соединения-писателя."""
+        result = {}
+        for name in ("journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store", "busy_timeout"):
+            async with self.conn.execute(f"PRAGMA {name}") as cursor:
+                row = await cursor.fetchone()
+                result[name] = row[0] if row else None
+        return result
+
+    async def _report_pragmas(self) -> None:
+        """Вывод фактических PRAGMA при старте."""
+        pragmas = await self.get_effective_pragmas()
+        formatted = ", ".join(f"{name}={value}" for name, value in pragmas.items())
+        logger.info(f"Параметры SQLite: {formatted}")
+
+        if self.tuning and pragmas["journal_mode"].lower() != self.tuning.journal_mode.lower():
+            logger.warning(
+                f"⚠️ Не удалось включить journal_mode={self.tuning.journal_mode}, "
+                f"используется {pragmas['journal_mode']}"
+            )
+
+    async def _wal_checkpoint_loop(self, interval_seconds: int) -> None:
+        """Периодический PASSIVE checkpoint, чтобы WAL-файл не разрастался."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                row = await self.transactions.checkpoint("PASSIVE")
+                if row:
+                    logger.debug(f"WAL checkpoint: busy={row[0]}, log={row[1]}, checkpointed={row[2]}")
+            except Exception as e:
+                logger.error(f"❌ Ошибка WAL checkpoint: {e}")
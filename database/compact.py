@@ -0,0 +1,223 @@
+"""
+Компактная схема v2 для SQLite (включается настройкой DB_COMPACT_SCHEMA).
+
+Таблицы user_group_verifications и message_count хранятся как WITHOUT ROWID
+с первичным ключом (user_id, group_id), состояние и тип верификации - как
+коды из `bot.states.codes`, временные метки - как Unix-время в секундах.
+Репозитории получают раскладку (`SchemaLayout`) и кодируют значения сами,
+поэтому их публичный API не зависит от схемы.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Optional, Tuple
+
+from loguru import logger
+
+from bot.database.backends.base import StorageBackend
+from bot.states.codes import (
+    CODE_BY_STATE,
+    CODE_BY_TYPE,
+    STATE_BY_CODE,
+    TYPE_BY_CODE,
+    encode_state,
+    encode_verification_type,
+)
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Текущее время в виде Unix-времени (аналог CURRENT_TIMESTAMP)
+_EPOCH_NOW_SQL = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+
+def to_epoch(value: Optional[datetime]) -> Optional[int]:
+    """Unix-время в секундах (время без часового пояса считается UTC)."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return int((value - _EPOCH).total_seconds())
+
+
+def from_epoch(value: int) -> datetime:
+    """Время UTC без часового пояса, как у CURRENT_TIMESTAMP в обычной схеме."""
+    return _EPOCH + timedelta(seconds=value)
+
+
+class SchemaLayout:
+    """Обычная схема: значения хранятся как есть."""
+
+    compact = False
+    #: SQL-выражение текущего времени для столбцов времени
+    now = "CURRENT_TIMESTAMP"
+    #: Декодеры столбцов для `hydrate(..., decoders=...)`
+    decoders: Tuple[Tuple[str, Callable[[Any], Any]], ...] = ()
+
+    def encode_state(self, state: Optional[str]) -> Any:
+        """Значение столбца state."""
+        return state
+
+    def encode_verification_type(self, verification_type: Optional[str]) -> Any:
+        """Значение столбца verification_type."""
+        return verification_type
+
+    def timestamp(self, backend: StorageBackend, value: Optional[datetime]) -> Any:
+        """Значение столбца времени (UTC без часового пояса)."""
+        return backend.timestamp(value) if value is not None else None
+
+
+class CompactSchemaLayout(SchemaLayout):
+    """Компактная схема v2: коды состояний и Unix-время."""
+
+    compact = True
+    now = _EPOCH_NOW_SQL
+    decoders = (
+        ("state", STATE_BY_CODE.__getitem__),
+        ("verification_type", TYPE_BY_CODE.__getitem__),
+        ("verified_at", from_epoch),
+        ("created_at", from_epoch),
+        ("updated_at", from_epoch),
+    )
+
+    def encode_state(self, state: Optional[str]) -> Optional[int]:
+        """Код состояния."""
+        return encode_state(state)
+
+    def encode_verification_type(self, verification_type: Optional[str]) -> Optional[int]:
+        """Код способа верификации."""
+        return encode_verification_type(verification_type)
+
+    def timestamp(self, backend: StorageBackend, value: Optional[datetime]) -> Optional[int]:
+        """Unix-время в секундах."""
+        return to_epoch(value)
+
+
+PLAIN_LAYOUT = SchemaLayout()
+COMPACT_LAYOUT = CompactSchemaLayout()
+
+
+async def detect_layout(backend: StorageBackend) -> SchemaLayout:
+    """Определение раскладки по фактической схеме таблицы user_group_verifications."""
+    if backend.dialect != "sqlite":
+        return PLAIN_LAYOUT
+    row = await backend.fetchone(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'user_group_verifications'"
+    )
+    if row and "WITHOUT ROWID" in row["sql"].upper():
+        return COMPACT_LAYOUT
+    return PLAIN_LAYOUT
+
+
+def _case(column: str, mapping: dict) -> Tuple[str, List[Any]]:
+    """CASE-выражение перекодировки столбца с параметрами."""
+    branches = " ".join("WHEN ? THEN ?" for _ in mapping)
+    params = [value for pair in mapping.items() for value in pair]
+    return f"CASE {column} {branches} END", params
+
+
+def _epoch_sql(column: str) -> str:
+    """Перевод текстовой временной метки в Unix-время."""
+    return f"CAST(strftime('%s', {column}) AS INTEGER)"
+
+
+async def _check_known_values(backend: StorageBackend, column: str, known: dict) -> None:
+    """Проверка, что все значения столбца можно закодировать."""
+    rows = await backend.fetchall(
+        f"SELECT DISTINCT {column} FROM user_group_verifications WHERE {column} IS NOT NULL"
+    )
+    unknown = [row[0] for row in rows if row[0] not in known]
+    if unknown:
+        raise ValueError(f"Нет кода для значений {column}: {', '.join(map(str, unknown))}")
+
+
+async def migrate_to_compact(backend: StorageBackend) -> None:
+    """
+    Однократный перевод таблиц на компактную схему v2.
+
+    Выполняется в одной транзакции: при ошибке (например, неизвестном
+    состоянии в данных) база остается в обычной схеме. Обратного
+    перевода нет.
+    """
+    if backend.dialect != "sqlite":
+        raise RuntimeError("Компактная схема поддерживается только для SQLite")
+
+    async with backend.transaction():
+        await _check_known_values(backend, "state", CODE_BY_STATE)
+        await _check_known_values(backend, "verification_type", CODE_BY_TYPE)
+
+        await backend.execute(
+            """
+            CREATE TABLE user_group_verifications_v2 (
+                user_id INTEGER NOT NULL,
+                group_id INTEGER NOT NULL,
+                verified BOOLEAN NOT NULL DEFAULT FALSE,
+                requires_verification BOOLEAN NOT NULL DEFAULT FALSE,
+                verification_type INTEGER,
+                verified_at INTEGER,
+                attempts_count INTEGER NOT NULL DEFAULT 0,
+                state INTEGER,
+                created_at INTEGER,
+                updated_at INTEGER,
+                PRIMARY KEY (user_id, group_id),
+                FOREIGN KEY (user_id) REFERENCES users (telegram_id),
+                FOREIGN KEY (group_id) REFERENCES groups (group_id)
+            ) WITHOUT ROWID
+            """
+        )
+        type_case, type_params = _case("verification_type", CODE_BY_TYPE)
+        state_case, state_params = _case("state", CODE_BY_STATE)
+        await backend.execute(
+            f"""
+            INSERT INTO user_group_verifications_v2
+            SELECT user_id, group_id, COALESCE(verified, FALSE), COALESCE(requires_verification, FALSE),
+                   {type_case}, {_epoch_sql('verified_at')}, COALESCE(attempts_count, 0),
+                   {state_case}, {_epoch_sql('created_at')}, {_epoch_sql('updated_at')}
+            FROM user_group_verifications
+            """,
+            (*type_params, *state_params)
+        )
+        await backend.execute("DROP TABLE user_group_verifications")
+        await backend.execute("ALTER TABLE user_group_verifications_v2 RENAME TO user_group_verifications")
+        await backend.execute(
+            "CREATE INDEX IF NOT EXISTS idx_user_group_verifications_group ON user_group_verifications(group_id)"
+        )
+        await backend.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_user_group_verifications_verified
+            ON user_group_verifications(group_id, user_id)
+            WHERE verified = TRUE
+            """
+        )
+
+        await backend.execute(
+            """
+            CREATE TABLE message_count_v2 (
+                user_id INTEGER NOT NULL,
+                group_id INTEGER NOT NULL,
+                count INTEGER NOT NULL DEFAULT 1,
+                first_message_at INTEGER,
+                last_message_at INTEGER,
+                PRIMARY KEY (user_id, group_id)
+            ) WITHOUT ROWID
+            """
+        )
+        await backend.execute(
+            f"""
+            INSERT INTO message_count_v2
+            SELECT user_id, group_id, COALESCE(count, 1),
+                   {_epoch_sql('first_message_at')}, {_epoch_sql('last_message_at')}
+            FROM message_count
+            """
+        )
+        await backend.execute("DROP TABLE message_count")
+        await backend.execute("ALTER TABLE message_count_v2 RENAME TO message_count")
+        await backend.execute(
+            "CREATE INDEX IF NOT EXISTS idx_message_count_last_message ON message_count(last_message_at)"
+        )
+
+    logger.info("Таблицы user_group_verifications и message_count переведены на компактную схему v2")
+
+    # Освобожденные страницы возвращаются файловой системе только после VACUUM
+    try:
+        await backend.execute("VACUUM")
+    except Exception as e:
+        logger.warning(f"⚠️ Не удалось выполнить VACUUM после перевода схемы: {e}")
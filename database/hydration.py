@@ -0,0 +1,209 @@
+"""Быстрое преобразование строк базы данных в pydantic-модели без валидации (для путей чтения)."""
+
+import sqlite3
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, TypeVar, Union, get_args, get_origin
+
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+Converter = Optional[Callable[[Any], Any]]
+
+# Декодеры столбцов, заданные вызывающим кодом: ((имя поля, функция), ...)
+Decoders = Tuple[Tuple[str, Callable[[Any], Any]], ...]
+
+
+# Конвертеры - встроенные функции, чтобы не тратить время на вызовы Python-кода.
+# Нестандартное значение (например, Unix-время вместо ISO-строки) приводит
+# к исключению, и строка собирается обычной валидацией.
+_parse_bool = {0: False, 1: True}.__getitem__
+_parse_datetime = datetime.fromisoformat
+
+# Драйверы с собственными типами (asyncpg) уже возвращают bool и datetime
+_SQLITE_ONLY_CONVERTERS = {_parse_bool, _parse_datetime}
+
+
+def _converter_for(annotation: Any) -> Tuple[Converter, bool]:
+    """
+    Конвертер значения столбца для аннотации поля.
+
+    :return: (конвертер или None, если значение передается как есть; допускает ли поле None)
+    """
+    nullable = False
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        nullable = len(args) != len(get_args(annotation))
+        annotation = args[0] if len(args) == 1 else Any
+
+    if annotation is bool:
+        return _parse_bool, nullable
+    if annotation is datetime:
+        return _parse_datetime, nullable
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return annotation, nullable
+    return None, nullable
+
+
+def _missing_required(name: str) -> Any:
+    """NULL в обязательном поле - строку нужно собирать валидацией."""
+    raise ValueError(f"NULL в обязательном поле {name}")
+
+
+class RowHydrator:
+    """
+    Сборка моделей из строк базы данных без валидации pydantic.
+
+    Для каждого набора столбцов (по `row.keys()`) один раз составляется
+    список полей с индексами столбцов и конвертерами, по которому функция
+    сборки заполняет словарь значений полей.
+    Экземпляр модели создается из него напрямую - так же, как это делает
+    `model_construct`, но без его накладных расходов на каждое поле.
+    Если значение не удалось привести, строка собирается обычной валидацией.
+    """
+
+    def __init__(self, model: Type[ModelT], decoders: Decoders = ()):
+        """
+        Инициализация гидратора.
+
+        :param model: Класс pydantic-модели.
+        :param decoders: Декодеры, заменяющие конвертеры полей (например, для компактной схемы).
+        """
+        self.model = model
+        self._decoders = decoders
+        self._fields: Dict[str, Tuple[Converter, bool, bool]] = {
+            name: (*_converter_for(field.annotation), field.is_required())
+            for name, field in model.model_fields.items()
+        }
+        for name, decoder in decoders:
+            if name in self._fields:
+                self._fields[name] = (decoder, *self._fields[name][1:])
+        self._defaults: Dict[str, Any] = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in model.model_fields.items()
+            if not field.is_required()
+        }
+        self._plans: Dict[Tuple[Tuple[str, ...], bool], Optional[Callable[[Any], Dict[str, Any]]]] = {}
+
+    def plan_for(self, row) -> Optional[Callable[[Any], Dict[str, Any]]]:
+        """Функция сборки для набора столбцов и типа строки."""
+        return self._plan(tuple(row.keys()), not isinstance(row, sqlite3.Row))
+
+    def _plan(self, keys: Tuple[str, ...], native: bool) -> Optional[Callable[[Any], Dict[str, Any]]]:
+        """
+        Функция сборки значений для набора столбцов строки.
+
+        :param keys: Имена столбцов выборки.
+        :param native: Драйвер возвращает bool/datetime сам (не SQLite).
+        :return: Функция row -> dict или None, если в выборке нет обязательных полей модели.
+        """
+        plan_key = (keys, native)
+        if plan_key in self._plans:
+            return self._plans[plan_key]
+
+        columns = {key: index for index, key in enumerate(keys)}
+        # (поле, индекс столбца или None, конвертер, значение вместо NULL, NULL недопустим)
+        fields: List[Tuple[str, Optional[int], Converter, Any, bool]] = []
+        # Порядок полей как в модели, чтобы repr и model_dump совпадали с валидированными экземплярами
+        for name, (convert, nullable, required) in self._fields.items():
+            index = columns.get(name)
+            if index is None:
+                if required:
+                    self._plans[plan_key] = None
+                    return None
+                fields.append((name, None, None, self._defaults[name], False))
+                continue
+            if native and convert in _SQLITE_ONLY_CONVERTERS:
+                convert = None
+            null_value = None if nullable else self._defaults.get(name)
+            fields.append((name, index, convert, null_value, required and not nullable))
+
+        def plan(row) -> Dict[str, Any]:
+            values = {}
+            for name, index, convert, null_value, null_required in fields:
+                if index is None:
+                    values[name] = null_value
+                elif (value := row[index]) is None:
+                    values[name] = _missing_required(name) if null_required else null_value
+                else:
+                    values[name] = value if convert is None else convert(value)
+            return values
+
+        self._plans[plan_key] = plan
+        return plan
+
+    def hydrate(self, row, plan: Optional[Callable[[Any], Dict[str, Any]]] = None) -> ModelT:
+        """
+        Преобразование одной строки в модель.
+
+        :param row: Строка aiosqlite.Row.
+        :param plan: Функция сборки, если она уже известна (для списков строк одного запроса).
+        """
+        if plan is None:
+            plan = self.plan_for(row)
+            if plan is None:
+                return self._validate(row)
+        try:
+            values = plan(row)
+        except (TypeError, ValueError, KeyError) as e:
+            logger.debug(f"Быстрая сборка {self.model.__name__} не удалась ({e}), используется валидация")
+            return self._validate(row)
+
+        instance = self.model.__new__(self.model)
+        object.__setattr__(instance, "__dict__", values)
+        object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+        return instance
+
+    def _validate(self, row) -> ModelT:
+        """Сборка модели с полной валидацией."""
+        data = dict(row)
+        for name, decoder in self._decoders:
+            if data.get(name) is not None:
+                data[name] = decoder(data[name])
+        try:
+            return self.model.model_validate(data)
+        except ValidationError:
+            logger.error(f"❌ Некорректная строка для модели {self.model.__name__}: {dict(row)}")
+            raise
+
+
+_hydrators: Dict[Tuple[type, Decoders], RowHydrator] = {}
+
+
+def _hydrator(model: Type[ModelT], decoders: Decoders = ()) -> RowHydrator:
+    """Гидратор модели (создается один раз на модель и набор декодеров)."""
+    key = (model, decoders)
+    hydrator = _hydrators.get(key)
+    if hydrator is None:
+        hydrator = _hydrators[key] = RowHydrator(model, decoders)
+    return hydrator
+
+
+def hydrate(model: Type[ModelT], row, decoders: Decoders = ()) -> Optional[ModelT]:
+    """
+    Преобразование строки в модель без валидации.
+
+    :param model: Класс pydantic-модели.
+    :param row: Строка aiosqlite.Row или None.
+    :param decoders: Декодеры столбцов, хранящихся в закодированном виде.
+    :return: Модель или None, если строки нет.
+    """
+    if row is None:
+        return None
+    return _hydrator(model, decoders).hydrate(row)
+
+
+def hydrate_all(model: Type[ModelT], rows: Iterable, decoders: Decoders = ()) -> List[ModelT]:
+    """Преобразование списка строк в модели без валидации."""
+    rows = list(rows)
+    if not rows:
+        return []
+    hydrator = _hydrator(model, decoders)
+    plan = hydrator.plan_for(rows[0])
+    if plan is None:
+        return [hydrator._validate(row) for row in rows]
+    return [hydrator.hydrate(row, plan) for row in rows]
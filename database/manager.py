@@ -1,9 +1,7 @@
-from pathlib import Path
-from typing import Optional
-import os
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional
 
 from loguru import logger
-import aiosqlite
 
 from bot.database.repositories.user_repository import UserRepository
 from bot.database.repositories.group_repository import GroupRepository
@@ -12,20 +10,77 @@ from bot.database.repositories.whitelist_repository import WhitelistRepository
 from bot.database.repositories.log_repository import LogRepository
 from bot.database.repositories.user_group_verification_repository import UserGroupVerificationRepository
 from bot.database.repositories.message_count_repository import MessageCountRepository
+from bot.database.repositories.verification_result_repository import VerificationResultRepository
+from bot.database.repositories.verification_job_repository import VerificationJobRepository
+from bot.database.backends.base import StorageBackend
+from bot.database.backends.postgres import PostgresBackend
+from bot.database.backends.sqlite import SQLiteBackend
+from bot.database.migrations import MigrationRunner
+from bot.database.compact import PLAIN_LAYOUT, detect_layout, migrate_to_compact
+from bot.utils.cache import LRUCache
+
+if TYPE_CHECKING:
+    from config.settings import Settings, SQLiteTuningProfile
 
 
 class DatabaseManager:
     """
-    Управление базой данных SQLite и репозиториями.
+    Управление хранилищем и репозиториями.
 
-    Отвечает за инициализацию соединения и создание таблиц,
-    а также предоставляет доступ к репозиториям для работы с данными.
+    Отвечает за подключение к хранилищу (SQLite или PostgreSQL) и применение
+    миграций схемы, а также предоставляет доступ к репозиториям для работы с данными.
     """
 
-    def __init__(self, db_path: str):
-        """Инициализация менеджера базы данных."""
-        self.db_path = db_path
-        self.conn: Optional[aiosqlite.Connection] = None
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        group_commit_window_ms: int = 0,
+        reader_pool_size: int = 4,
+        tuning: Optional["SQLiteTuningProfile"] = None,
+        backend: Optional[StorageBackend] = None,
+        compact_schema: bool = False,
+        verification_cache_size: int = 100_000,
+        verification_cache_ttl: float = 600,
+        verification_negative_cache_size: int = 50_000,
+        verification_negative_cache_ttl: float = 30,
+        group_cache_size: int = 10_000,
+        group_cache_ttl: float = 300,
+        verified_snapshot: bool = True,
+    ):
+        """
+        Инициализация менеджера базы данных.
+
+        :param db_path: Путь к файлу SQLite (если не передан backend).
+        :param group_commit_window_ms: Окно группового коммита в мс (0 - коммит после каждой записи).
+        :param reader_pool_size: Количество соединений для чтения (0 - чтение через писателя).
+        :param tuning: Профиль PRAGMA из настроек (None - значения SQLite по умолчанию).
+        :param backend: Готовое хранилище (например, PostgresBackend); параметры SQLite тогда не используются.
+        :param compact_schema: Перевести базу SQLite на компактную схему v2 (однократно, без возврата).
+        :param verification_cache_size: Размер кэша статусов верификации (0 - без кэша).
+        :param verification_cache_ttl: Время жизни записи кэша статусов верификации в секундах.
+        :param verification_negative_cache_size: Размер кэша неверифицированных участников (0 - без кэша).
+        :param verification_negative_cache_ttl: Время жизни записи кэша неверифицированных участников в секундах.
+        :param group_cache_size: Размер кэшей групп, их администраторов и whitelist (0 - без кэша).
+        :param group_cache_ttl: Время жизни записи кэшей групп, их администраторов и whitelist в секундах.
+        :param verified_snapshot: Загружать при старте снимок всех верифицированных участников групп.
+        """
+        if backend is None:
+            backend = SQLiteBackend(db_path, group_commit_window_ms, reader_pool_size, tuning)
+        self.backend = backend
+        self.compact_schema = compact_schema
+        self.verified_snapshot = verified_snapshot
+        self.schema_version: int = 0
+        self.layout = PLAIN_LAYOUT
+        self.verification_cache = (
+            LRUCache(verification_cache_size, verification_cache_ttl) if verification_cache_size > 0 else None
+        )
+        self.verification_negative_cache = (
+            LRUCache(verification_negative_cache_size, verification_negative_cache_ttl)
+            if verification_negative_cache_size > 0 else None
+        )
+        self.group_cache = LRUCache(group_cache_size, group_cache_ttl) if group_cache_size > 0 else None
+        self.admin_cache = LRUCache(group_cache_size, group_cache_ttl) if group_cache_size > 0 else None
+        self.whitelist_cache = LRUCache(group_cache_size, group_cache_ttl) if group_cache_size > 0 else None
         self.users: Optional[UserRepository] = None
         self.groups: Optional[GroupRepository] = None
         self.admins: Optional[AdminRepository] = None
@@ -33,157 +88,120 @@ class DatabaseManager:
         self.logs: Optional[LogRepository] = None
         self.user_group_verifications: Optional[UserGroupVerificationRepository] = None
         self.message_counts: Optional[MessageCountRepository] = None
+        self.verification_results: Optional[VerificationResultRepository] = None
+        self.verification_jobs: Optional[VerificationJobRepository] = None
 
-    async def init_database(self) -> None:
-        """Инициализация соединения с базой данных и создание таблиц."""
-        self.conn = await aiosqlite.connect(self.db_path)
-        self.conn.row_factory = aiosqlite.Row
-        await self.conn.execute("PRAGMA foreign_keys = ON;")
-        await self._run_sql_scripts()
+    @classmethod
+    def from_settings(cls, settings: "Settings") -> "DatabaseManager":
+        """
+        Создание менеджера по настройкам.
 
-        # Миграция: добавляем поле requires_verification если его нет
-        await self._migrate_add_requires_verification_field()
-        await self._migrate_add_checkin_mode_field()
-        await self._migrate_add_username_index()
+        PostgreSQL используется, если DATABASE_URL указывает на него,
+        иначе - файл SQLite из DATABASE_PATH.
+        """
+        caches = dict(
+            verification_cache_size=settings.verification_cache_size,
+            verification_cache_ttl=settings.verification_cache_ttl_seconds,
+            verification_negative_cache_size=settings.verification_negative_cache_size,
+            verification_negative_cache_ttl=settings.verification_negative_cache_ttl_seconds,
+            group_cache_size=settings.group_cache_size,
+            group_cache_ttl=settings.group_cache_ttl_seconds,
+            verified_snapshot=settings.verified_snapshot,
+        )
+        if settings.database_url and settings.database_url.startswith(("postgres://", "postgresql://")):
+            return cls(backend=PostgresBackend(
+                settings.database_url,
+                min_size=settings.db_pool_min_size,
+                max_size=settings.db_pool_max_size,
+            ), **caches)
+        return cls(
+            settings.database_path,
+            group_commit_window_ms=settings.db_group_commit_window_ms,
+            reader_pool_size=settings.db_reader_pool_size,
+            tuning=settings.sqlite_tuning,
+            compact_schema=settings.db_compact_schema,
+            **caches,
+        )
 
+    async def init_database(self) -> None:
+        """Подключение к хранилищу и применение миграций."""
+        await self.backend.connect()
+        self.schema_version = await MigrationRunner(self.backend).run()
+        await self._init_layout()
         await self._init_repositories()
-        logger.info("База данных и репозитории успешно инициализированы")
+        await self._warm_caches()
+        logger.info(f"База данных ({self.backend.dialect}) и репозитории успешно инициализированы")
+
+    async def _init_layout(self) -> None:
+        """Определение раскладки схемы и перевод на компактную схему, если она включена."""
+        self.layout = await detect_layout(self.backend)
+        if self.compact_schema and not self.layout.compact:
+            if self.backend.dialect != "sqlite":
+                logger.warning("⚠️ DB_COMPACT_SCHEMA поддерживается только для SQLite, настройка проигнорирована")
+                return
+            await migrate_to_compact(self.backend)
+            self.layout = await detect_layout(self.backend)
+        elif self.layout.compact and not self.compact_schema:
+            logger.warning("⚠️ База уже переведена на компактную схему v2, DB_COMPACT_SCHEMA=false не отменяет перевод")
 
     async def _init_repositories(self) -> None:
         """Инициализация всех репозиториев."""
-        self.users = UserRepository(self.conn)
-        self.groups = GroupRepository(self.conn)
-        self.admins = AdminRepository(self.conn)
-        self.whitelist = WhitelistRepository(self.conn)
-        self.logs = LogRepository(self.conn)
-        self.user_group_verifications = UserGroupVerificationRepository(self.conn)
-        self.message_counts = MessageCountRepository(self.conn)
-
-    async def _run_sql_scripts(self) -> None:
+        self.users = UserRepository(self.backend)
+        self.groups = GroupRepository(self.backend, cache=self.group_cache)
+        self.admins = AdminRepository(self.backend, cache=self.admin_cache)
+        self.whitelist = WhitelistRepository(self.backend, cache=self.whitelist_cache)
+        self.logs = LogRepository(self.backend)
+        self.user_group_verifications = UserGroupVerificationRepository(
+            self.backend, self.layout, cache=self.verification_cache,
+            negative_cache=self.verification_negative_cache,
+        )
+        self.message_counts = MessageCountRepository(self.backend, self.layout)
+        self.verification_results = VerificationResultRepository(self.backend)
+        self.verification_jobs = VerificationJobRepository(self.backend)
+
+    async def _warm_caches(self) -> None:
+        """Предварительное заполнение кэшей и удаление устаревших записей при старте."""
+        groups = await self.groups.warm_cache()
+        if groups:
+            logger.info(f"В кэш загружено активных групп: {groups}")
+        if self.verified_snapshot:
+            members = await self.user_group_verifications.load_verified_members()
+            usage = members.memory_usage()
+            logger.info(
+                f"Загружен снимок верифицированных участников: {len(members)} в {len(usage)} группах, "
+                f"{sum(size for _, size in usage.values()) / 1024:.1f} КиБ"
+            )
+            for group_id, (count, size) in sorted(usage.items(), key=lambda item: -item[1][1]):
+                logger.debug(f"Снимок верифицированных участников группы {group_id}: {count}, {size / 1024:.1f} КиБ")
+        expired = await self.verification_results.delete_expired()
+        if expired:
+            logger.info(f"Удалено устаревших результатов проверок: {expired}")
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
         """
-        Выполнение SQL-скриптов для создания таблиц.
+        Unit-of-work для нескольких операций репозиториев.
 
-        Скрипты читаются из директории bot/database/sql
-        и выполняются в алфавитном порядке.
+        Все записи внутри блока фиксируются одним коммитом,
+        при исключении - откатываются.
+
+        Пример:
+            async with db_manager.transaction():
+                await db_manager.users.verify_user(user_id)
+                await db_manager.logs.update_verification_result(user_id, "success")
         """
-        sql_dir = Path(__file__).parent / "sql"
-        scripts = sorted(sql_dir.glob("*.sql"))
-
-        async with self.conn.cursor() as cursor:
-            for script_path in scripts:
-                try:
-                    with open(script_path, "r", encoding="utf-8") as f:
-                        sql_query = f.read().strip()
-                        await cursor.execute(sql_query)
-                except Exception as e:
-                    logger.error(f"❌ Ошибка выполнения SQL-скрипта {script_path.name}: {e}")
-                    raise
-
-        await self.conn.commit()
-        logger.info(f"Инициализация БД завершена: выполнено {len(scripts)} SQL-скриптов")
+        async with self.backend.transaction():
+            yield
 
     async def close(self) -> None:
-        """Закрытие соединения с базой данных."""
-        if self.conn:
-            await self.conn.close()
-            logger.info("Соединение с базой данных закрыто")
+        """Закрытие соединений с базой данных."""
+        await self.backend.close()
+        logger.info("Соединение с базой данных закрыто")
 
     async def initialize(self):
-        """Инициализирует базу данных и создает все необходимые таблицы."""
-        sql_files = [
-            "create_users_table.sql",
-            "create_groups_table.sql",
-            "create_admins_table.sql",
-            "create_verification_logs_table.sql",
-            "create_whitelist_table.sql",
-            "z_create_user_group_verifications_table.sql",
-            "z_create_whitelist_index.sql"
-        ]
-
-        for sql_file in sql_files:
-            file_path = os.path.join(os.path.dirname(__file__), "sql", sql_file)
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    sql = f.read()
-                await self.execute(sql)
-                logger.info(f"Выполнен SQL файл: {sql_file}")
-            else:
-                logger.warning(f"SQL файл не найден: {sql_file}")
-
-        # Миграция: добавляем поле requires_verification если его нет
-        await self._migrate_add_requires_verification_field()
-
-        logger.info("База данных инициализирована")
-
-    async def _migrate_add_requires_verification_field(self):
-        """Миграция: добавляет поля requires_verification и verification_type если их нет."""
-        try:
-            # Проверяем, существуют ли уже поля
-            cursor = await self.conn.execute("PRAGMA table_info(user_group_verifications)")
-            columns = await cursor.fetchall()
-            column_names = [column[1] for column in columns]
-
-            # Добавляем requires_verification если его нет
-            if 'requires_verification' not in column_names:
-                await self.conn.execute(
-                    "ALTER TABLE user_group_verifications ADD COLUMN requires_verification BOOLEAN DEFAULT FALSE"
-                )
-                await self.conn.commit()
-                logger.info("Добавлено поле requires_verification в таблицу user_group_verifications")
-            else:
-                logger.debug("Поле requires_verification уже существует")
-
-            # Добавляем verification_type если его нет
-            if 'verification_type' not in column_names:
-                await self.conn.execute(
-                    "ALTER TABLE user_group_verifications ADD COLUMN verification_type TEXT"
-                )
-                await self.conn.commit()
-                logger.info("Добавлено поле verification_type в таблицу user_group_verifications")
-            else:
-                logger.debug("Поле verification_type уже существует")
-
-        except Exception as e:
-            logger.error(f"Ошибка при миграции полей user_group_verifications: {e}")
-            raise
-
-    async def _migrate_add_checkin_mode_field(self):
-        """Миграция: добавляет поле checkin_mode в таблицу groups если его нет."""
-        try:
-            cursor = await self.conn.execute("PRAGMA table_info(groups)")
-            columns = await cursor.fetchall()
-            column_names = [column[1] for column in columns]
-
-            if 'checkin_mode' not in column_names:
-                await self.conn.execute(
-                    "ALTER TABLE groups ADD COLUMN checkin_mode BOOLEAN DEFAULT FALSE"
-                )
-                await self.conn.commit()
-                logger.info("Добавлено поле checkin_mode в таблицу groups")
-            else:
-                logger.debug("Поле checkin_mode уже существует")
-
-        except Exception as e:
-            logger.error(f"Ошибка при миграции поля checkin_mode: {e}")
-            raise
-
-    async def _migrate_add_username_index(self):
-        """Миграция: добавляет индекс для поиска пользователей по username."""
-        try:
-            await self.conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_users_username ON users(username COLLATE NOCASE)"
-            )
-            await self.conn.commit()
-            logger.info("Добавлен индекс idx_users_username для таблицы users")
-        except Exception as e:
-            logger.error(f"Ошибка при добавлении индекса username: {e}")
-            raise
+        """Устаревший псевдоним для `init_database()`."""
+        await self.init_database()
 
     async def execute(self, query: str, params=None):
         """Выполняет SQL запрос."""
-        async with self.conn.cursor() as cursor:
-            if params:
-                await cursor.execute(query, params)
-            else:
-                await cursor.execute(query)
-            await self.conn.commit()
+        await self.backend.execute(query, params or ())
@@ -0,0 +1,156 @@
+"""Версионированные миграции схемы базы данных."""
+
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from bot.database.backends.base import StorageBackend
+
+MIGRATIONS_DIR = Path(__file__).parent / "sql" / "migrations"
+
+_MIGRATION_FILE_RE = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+# Столбцы, которые старые версии бота добавляли через ALTER TABLE при каждом запуске.
+# Нужны только для перевода базы без schema_version на базовую миграцию.
+LEGACY_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    "user_group_verifications": [
+        ("requires_verification", "BOOLEAN DEFAULT FALSE"),
+        ("verification_type", "TEXT"),
+    ],
+    "groups": [
+        ("checkin_mode", "BOOLEAN DEFAULT FALSE"),
+    ],
+}
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Файл миграции вида `0001_name.sql`."""
+
+    version: int
+    name: str
+    path: Path
+
+    def statements(self) -> List[str]:
+        """Разбиение скрипта на отдельные SQL-выражения."""
+        statements = []
+        buffer = ""
+        for line in self.path.read_text(encoding="utf-8").splitlines(keepends=True):
+            if not buffer and (not line.strip() or line.lstrip().startswith("--")):
+                continue
+            buffer += line
+            if sqlite3.complete_statement(buffer):
+                statements.append(buffer.strip())
+                buffer = ""
+        if buffer.strip():
+            raise ValueError(f"Незавершенное SQL-выражение в миграции {self.path.name}")
+        return statements
+
+
+def discover_migrations(dialect: str = "sqlite") -> List[Migration]:
+    """Поиск файлов миграций диалекта в порядке возрастания версии."""
+    directory = MIGRATIONS_DIR / dialect
+    migrations = []
+    for path in directory.glob("*.sql"):
+        match = _MIGRATION_FILE_RE.match(path.name)
+        if not match:
+            logger.warning(f"⚠️ Пропущен файл с некорректным именем миграции: {path.name}")
+            continue
+        migrations.append(Migration(int(match.group(1)), match.group(2), path))
+
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Дублирующиеся версии миграций в {directory}")
+    return migrations
+
+
+class MigrationRunner:
+    """
+    Применение миграций схемы с учетом таблицы `schema_version`.
+
+    Все ожидающие миграции выполняются в одной транзакции: при ошибке
+    база остается на прежней версии. Если схема актуальна, запуск
+    ограничивается одним чтением `schema_version`.
+    """
+
+    def __init__(self, backend: StorageBackend, migrations: Optional[List[Migration]] = None):
+        """
+        Инициализация раннера.
+
+        :param backend: Хранилище, к которому применяются миграции.
+        :param migrations: Список миграций (по умолчанию - из sql/migrations/<диалект>).
+        """
+        self.backend = backend
+        self.migrations = migrations if migrations is not None else discover_migrations(backend.dialect)
+
+    @property
+    def latest_version(self) -> int:
+        """Версия последней известной миграции."""
+        return self.migrations[-1].version if self.migrations else 0
+
+    async def current_version(self) -> int:
+        """Текущая версия схемы (0 - таблица schema_version отсутствует)."""
+        if not await self.backend.table_exists("schema_version"):
+            return 0
+        row = await self.backend.fetchone("SELECT MAX(version) AS version FROM schema_version")
+        return row["version"] or 0
+
+    async def run(self) -> int:
+        """
+        Применение ожидающих миграций.
+
+        :return: Версия схемы после выполнения.
+        """
+        current = await self.current_version()
+        if current >= self.latest_version:
+            if current > self.latest_version:
+                logger.warning(
+                    f"⚠️ Версия схемы БД ({current}) новее известных миграций ({self.latest_version})"
+                )
+            logger.debug(f"Схема БД актуальна (версия {current})")
+            return current
+
+        async with self.backend.transaction():
+            # Другой воркер мог применить миграции, пока мы ждали блокировку
+            await self.backend.lock_schema()
+            current = await self.current_version()
+            legacy = current == 0 and await self.backend.table_exists("users")
+            pending = [m for m in self.migrations if m.version > current]
+
+            await self.backend.execute(
+                """
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            for migration in pending:
+                for statement in migration.statements():
+                    await self.backend.execute(statement)
+                if legacy and migration.version == 1:
+                    await self._add_legacy_columns()
+                await self.backend.execute(
+                    "INSERT INTO schema_version (version, name) VALUES (?, ?)",
+                    (migration.version, migration.name)
+                )
+                logger.info(f"Применена миграция {migration.version:04d}_{migration.name}")
+
+        if pending:
+            logger.info(f"Схема БД обновлена с версии {current} до {self.latest_version}")
+        return max(current, self.latest_version)
+
+    async def _add_legacy_columns(self) -> None:
+        """Добавление столбцов, отсутствующих в базе, созданной до schema_version."""
+        for table, columns in LEGACY_COLUMNS.items():
+            existing = await self.backend.table_columns(table)
+            for column, definition in columns:
+                if column not in existing:
+                    await self.backend.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                    logger.info(f"Добавлено поле {column} в таблицу {table}")
@@ -0,0 +1,63 @@
+"""Пул соединений SQLite только для чтения."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, List, Sequence
+
+import aiosqlite
+from loguru import logger
+
+
+class ReaderPool:
+    """
+    Пул read-only соединений для `fetchone`/`fetchall`.
+
+    Каждое соединение aiosqlite работает в собственном потоке, поэтому
+    чтения выполняются параллельно и не ждут в очереди за записью,
+    которая идет через единственное соединение-писатель.
+    """
+
+    def __init__(self, db_path: str, size: int):
+        """
+        Инициализация пула.
+
+        :param db_path: Путь к файлу SQLite.
+        :param size: Количество соединений для чтения.
+        """
+        self.db_path = db_path
+        self.size = size
+        self._connections: List[aiosqlite.Connection] = []
+        self._idle: asyncio.Queue = asyncio.Queue()
+
+    async def open(self, pragmas: Sequence[str] = ()) -> None:
+        """
+        Открытие соединений пула.
+
+        :param pragmas: PRAGMA-запросы, выполняемые на каждом соединении.
+        """
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        for _ in range(self.size):
+            conn = await aiosqlite.connect(uri, uri=True)
+            conn.row_factory = aiosqlite.Row
+            for pragma in pragmas:
+                await conn.execute(pragma)
+            self._connections.append(conn)
+            self._idle.put_nowait(conn)
+        logger.info(f"Открыт пул из {self.size} соединений SQLite для чтения")
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Получение свободного соединения для чтения."""
+        conn = await self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put_nowait(conn)
+
+    async def close(self) -> None:
+        """Закрытие всех соединений пула."""
+        for conn in self._connections:
+            await conn.close()
+        self._connections.clear()
+        self._idle = asyncio.Queue()
@@ -0,0 +1,169 @@
+"""Управление транзакциями и групповым коммитом для SQLite."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+import aiosqlite
+from loguru import logger
+
+from bot.database.backends.base import run_callbacks
+
+
+class TransactionManager:
+    """
+    Координатор записи в единое соединение SQLite.
+
+    Предоставляет unit-of-work (`transaction()`), к которому присоединяются
+    репозитории, и режим группового коммита: коммиты от конкурентных
+    обработчиков в пределах окна `group_commit_window_ms` объединяются
+    в один fsync.
+    """
+
+    def __init__(self, conn: aiosqlite.Connection, group_commit_window_ms: int = 0):
+        """
+        Инициализация координатора.
+
+        :param conn: Соединение для записи.
+        :param group_commit_window_ms: Окно группового коммита в мс (0 - отключено).
+        """
+        self.conn = conn
+        self.group_commit_window = max(group_commit_window_ms, 0) / 1000
+        self._lock = asyncio.Lock()
+        self._active: ContextVar[bool] = ContextVar(f"transaction_{id(self)}", default=False)
+        self._after_commit: ContextVar[Optional[List[Callable[[], None]]]] = ContextVar(
+            f"transaction_after_commit_{id(self)}", default=None
+        )
+        self._pending_commit: Optional[asyncio.Future] = None
+
+    @property
+    def in_transaction(self) -> bool:
+        """Выполняется ли текущая задача внутри unit-of-work."""
+        return self._active.get()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Вызов callback после коммита текущей транзакции.
+
+        Вне транзакции callback вызывается сразу, при откате - не вызывается.
+        """
+        callbacks = self._after_commit.get()
+        if callbacks is None:
+            run_callbacks([callback])
+        else:
+            callbacks.append(callback)
+
+    async def execute(self, query: str, parameters=()) -> aiosqlite.Cursor:
+        """
+        Выполнение изменяющего запроса.
+
+        Внутри unit-of-work запрос присоединяется к транзакции, иначе
+        выполняется в режиме автокоммита (возможно, группового).
+        """
+        cursor, _ = await self._write(query, parameters, fetch=False)
+        return cursor
+
+    async def execute_returning(self, query: str, parameters=()) -> List[aiosqlite.Row]:
+        """
+        Выполнение изменяющего запроса с RETURNING.
+
+        Строки читаются до коммита, поэтому отражают записанные значения
+        даже при групповом коммите.
+        """
+        _, rows = await self._write(query, parameters, fetch=True)
+        return rows
+
+    async def _write(self, query: str, parameters, fetch: bool) -> Tuple[aiosqlite.Cursor, List[aiosqlite.Row]]:
+        """Выполнение записи с учетом unit-of-work и группового коммита."""
+        rows = []
+        if self.in_transaction:
+            async with self.conn.execute(query, parameters) as cursor:
+                if fetch:
+                    rows = await cursor.fetchall()
+            return cursor, rows
+
+        async with self._lock:
+            async with self.conn.execute(query, parameters) as cursor:
+                if fetch:
+                    rows = await cursor.fetchall()
+            if self.group_commit_window <= 0:
+                await self.conn.commit()
+                return cursor, rows
+
+        await self._wait_group_commit()
+        return cursor, rows
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """
+        Unit-of-work: все записи внутри блока фиксируются одним коммитом.
+
+        Вложенные вызовы присоединяются к внешней транзакции.
+        При исключении транзакция откатывается. После коммита вызываются
+        обработчики, зарегистрированные через `after_commit`.
+        """
+        if self.in_transaction:
+            yield
+            return
+
+        callbacks: List[Callable[[], None]] = []
+        async with self._lock:
+            await self._flush_pending()
+            token = self._active.set(True)
+            callbacks_token = self._after_commit.set(callbacks)
+            try:
+                await self.conn.execute("BEGIN IMMEDIATE")
+                yield
+            except BaseException:
+                await self.conn.rollback()
+                raise
+            else:
+                await self.conn.commit()
+            finally:
+                self._after_commit.reset(callbacks_token)
+                self._active.reset(token)
+        run_callbacks(callbacks)
+
+    async def flush(self) -> None:
+        """Немедленная фиксация накопленных записей группового коммита."""
+        async with self._lock:
+            await self._flush_pending()
+
+    async def checkpoint(self, mode: str = "PASSIVE") -> Optional[aiosqlite.Row]:
+        """
+        Выполнение WAL checkpoint вне транзакции.
+
+        :return: Строка (busy, log, checkpointed) от PRAGMA wal_checkpoint.
+        """
+        async with self._lock:
+            await self._flush_pending()
+            async with self.conn.execute(f"PRAGMA wal_checkpoint({mode})") as cursor:
+                return await cursor.fetchone()
+
+    async def _wait_group_commit(self) -> None:
+        """Ожидание группового коммита, в который попала последняя запись."""
+        if self._pending_commit is None:
+            self._pending_commit = asyncio.get_running_loop().create_future()
+            asyncio.create_task(self._flush_after_window())
+        await asyncio.shield(self._pending_commit)
+
+    async def _flush_after_window(self) -> None:
+        """Ожидание окна группового коммита и фиксация накопленных записей."""
+        await asyncio.sleep(self.group_commit_window)
+        async with self._lock:
+            await self._flush_pending()
+
+    async def _flush_pending(self) -> None:
+        """Фиксация ожидающего группового коммита. Вызывается под блокировкой."""
+        pending, self._pending_commit = self._pending_commit, None
+        if pending is None:
+            return
+
+        try:
+            await self.conn.commit()
+        except Exception as e:
+            logger.error(f"❌ Ошибка группового коммита: {e}")
+            pending.set_exception(e)
+        else:
+            pending.set_result(None)
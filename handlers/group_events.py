@@ -7,6 +7,8 @@ from loguru import logger
 from bot.states.verification import VerificationStates
 from bot.services.verification_service import VerificationService
 from bot.database.manager import DatabaseManager
+from bot.services.bot_api_cache import BotApiCache
+from bot.services.chat_admin_cache import ChatAdminCache
 from config.settings import settings
 
 group_events_router = Router(name="group_events_router")
@@ -14,7 +16,9 @@ group_events_router.message.filter(F.chat.type.in_(["group", "supergroup"]))
 
 
 @group_events_router.message()
-async def moderate_unverified_messages(message: Message, db_manager: DatabaseManager):
+async def moderate_unverified_messages(
+    message: Message, db_manager: DatabaseManager, chat_admins: ChatAdminCache, bot_api: BotApiCache
+):
     """
     Модерирует сообщения в группе с дифференцированной обработкой участников.
     
@@ -36,12 +40,14 @@ async def moderate_unverified_messages(message: Message, db_manager: DatabaseMan
         return
     
     try:
-        chat_member = await message.bot.get_chat_member(message.chat.id, message.from_user.id)
-        
-        if chat_member.status in ["administrator", "creator"]:
+        if await chat_admins.is_admin(message.bot, message.chat.id, message.from_user.id):
             logger.debug(f"👑 Админ {message.from_user.id} ({username}) может писать без верификации")
             return
 
+        if await db_manager.user_group_verifications.is_user_verified_in_group(message.from_user.id, message.chat.id):
+            logger.debug(f"✅ Сообщение от {username} НЕ удалено - пользователь верифицирован")
+            return
+
         from bot.services.whitelist_service import WhitelistService
         whitelist_service = WhitelistService(db_manager)
         if await whitelist_service.check_user_in_whitelist(message.from_user.id, message.from_user.username, message.chat.id):
@@ -109,7 +115,7 @@ async def moderate_unverified_messages(message: Message, db_manager: DatabaseMan
             elif message_count >= 3:
                 logger.debug(f"⚠️ Пользователь {username} написал {message_count} сообщений, но спам-защита отключена")
             
-            await _send_verification_reminder(message, db_manager)
+            await _send_verification_reminder(message, db_manager, bot_api)
         else:
             if verification.verified:
                 logger.debug(f"✅ Сообщение от {username} НЕ удалено - пользователь верифицирован")
@@ -120,7 +126,7 @@ async def moderate_unverified_messages(message: Message, db_manager: DatabaseMan
         logger.error(f"Ошибка при проверке статуса пользователя {message.from_user.id} в группе {message.chat.id}: {e}")
 
 
-async def _send_verification_reminder(message: Message, db_manager: DatabaseManager):
+async def _send_verification_reminder(message: Message, db_manager: DatabaseManager, bot_api: BotApiCache):
     """Отправляет напоминание о необходимости верификации."""
     try:
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -148,7 +154,7 @@ async def _send_verification_reminder(message: Message, db_manager: DatabaseMana
         
     except Exception as e:
         try:
-            bot_username = (await message.bot.get_me()).username
+            bot_username = (await bot_api.get_me()).username
             username = f"@{message.from_user.username}" if message.from_user.username else message.from_user.first_name
             
             fallback_keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -13,7 +13,8 @@ import asyncio
 
 from bot.middleware.services import DatabaseManager
 from bot.database.models.user import User
-from bot.services.admin_service import AdminService
+from bot.services.bot_api_cache import BotApiCache
+from bot.services.chat_admin_cache import ChatAdminCache
 from bot.services.group_service import GroupService
 from bot.services.verification_service import VerificationService
 from bot.services.whitelist_service import WhitelistService
@@ -24,7 +25,9 @@ group_monitor_router = Router(name="group_monitor_router")
 
 
 @group_monitor_router.chat_member()
-async def on_chat_member_updated(event: ChatMemberUpdated, db_manager: DatabaseManager):
+async def on_chat_member_updated(
+    event: ChatMemberUpdated, db_manager: DatabaseManager, chat_admins: ChatAdminCache, bot_api: BotApiCache
+):
     """
     Обрабатывает изменения статуса участников группы, включая назначение/удаление администраторов.
     """
@@ -32,6 +35,8 @@ async def on_chat_member_updated(event: ChatMemberUpdated, db_manager: DatabaseM
 
     logger.debug(f"🔍 DEBUG: chat_member событие получено для пользователя {user.id} в группе {event.chat.id}")
 
+    bot_api.invalidate_member(event.chat.id, user.id)
+
     if user.is_bot:
         logger.debug(f"🤖 Пропускаем бота {user.username}")
         return
@@ -53,26 +58,22 @@ async def on_chat_member_updated(event: ChatMemberUpdated, db_manager: DatabaseM
         if new_status in ["administrator", "creator"] and old_status not in ["administrator", "creator"]:
             logger.info(
                 f"👑 Пользователь {user.full_name} (@{user.username}) назначен администратором в группе {event.chat.id}")
-            admin_service = AdminService(db_manager)
-            chat_admins = await event.bot.get_chat_administrators(event.chat.id)
-            await admin_service.update_group_admins(event.chat.id, chat_admins)
+            await chat_admins.on_status_changed(event.bot, event.chat.id, user.id, old_status, new_status)
 
         elif old_status in ["administrator", "creator"] and new_status not in ["administrator", "creator"]:
             logger.info(
                 f"👤 Пользователь {user.full_name} (@{user.username}) лишен администраторских прав в группе {event.chat.id}")
-            admin_service = AdminService(db_manager)
-            chat_admins = await event.bot.get_chat_administrators(event.chat.id)
-            await admin_service.update_group_admins(event.chat.id, chat_admins)
+            await chat_admins.on_status_changed(event.bot, event.chat.id, user.id, old_status, new_status)
 
     # Обработка случая добавления администратором (не через обычную ссылку)
     if old_status in ["restricted", "kicked"] and new_status == "member":
         logger.info(f"👥 Участник добавлен администратором: {user.full_name} (@{user.username}), ID: {user.id}")
-        await _handle_new_member(event, user, db_manager)
+        await _handle_new_member(event, user, db_manager, bot_api)
         return
 
 
 @group_monitor_router.chat_member(ChatMemberUpdatedFilter(IS_NOT_MEMBER >> IS_MEMBER))
-async def on_user_joined(event: ChatMemberUpdated, db_manager: DatabaseManager):
+async def on_user_joined(event: ChatMemberUpdated, db_manager: DatabaseManager, bot_api: BotApiCache):
     """
     Обрабатывает вступление нового пользователя в группу через ссылку или поиск.
     """
@@ -87,7 +88,7 @@ async def on_user_joined(event: ChatMemberUpdated, db_manager: DatabaseManager):
         f"Новый участник: {user.full_name} (@{user.username}), ID: {user.id}"
     )
 
-    await _handle_new_member(event, user, db_manager)
+    await _handle_new_member(event, user, db_manager, bot_api)
 
 
 
@@ -106,15 +107,12 @@ async def on_user_left(event: ChatMemberUpdated, db_manager: DatabaseManager):
     )
 
 
-async def _handle_new_member(event: ChatMemberUpdated, user, db_manager: DatabaseManager):
+async def _handle_new_member(event: ChatMemberUpdated, user, db_manager: DatabaseManager, bot_api: BotApiCache):
     """Обрабатывает вступление нового пользователя в группу."""
-    try:
-        chat_member = await event.bot.get_chat_member(event.chat.id, user.id)
-        if chat_member.status in ["administrator", "creator"]:
-            logger.info(f"Администратор {user.full_name} присоединился. Верификация не требуется.")
-            return
-    except Exception as e:
-        logger.warning(f"Не удалось проверить статус администратора для {user.id}: {e}")
+    # Статус участника уже есть в событии, запрос get_chat_member не нужен
+    if event.new_chat_member.status in ["administrator", "creator"]:
+        logger.info(f"Администратор {user.full_name} присоединился. Верификация не требуется.")
+        return
 
     whitelist_service = WhitelistService(db_manager)
     if await whitelist_service.check_user_in_whitelist(user.id, user.username, event.chat.id):
@@ -126,11 +124,11 @@ async def _handle_new_member(event: ChatMemberUpdated, user, db_manager: Databas
 
     logger.info(f"Новый пользователь {user.id} добавлен, требует верификации")
 
-    await _send_welcome_and_verification(event, user, db_manager)
+    await _send_welcome_and_verification(event, user, db_manager, bot_api)
 
 
 async def _send_welcome_and_verification(
-    event: ChatMemberUpdated, user, db_manager: DatabaseManager
+    event: ChatMemberUpdated, user, db_manager: DatabaseManager, bot_api: BotApiCache
 ):
     """Отправляет приветствие и запускает процесс верификации."""
     verification = await db_manager.user_group_verifications.get_by_user_and_group(user.id, event.chat.id)
@@ -161,7 +159,7 @@ async def _send_welcome_and_verification(
     )
 
     try:
-        bot_username = (await event.bot.get_me()).username
+        bot_username = (await bot_api.get_me()).username
         welcome_keyboard = InlineKeyboardMarkup(
             inline_keyboard=[
                 [
@@ -223,7 +221,7 @@ async def _send_welcome_and_verification(
         logger.error(f"Не удалось отправить сообщение пользователю {user.id}: {e}")
 
         try:
-            bot_username = (await event.bot.get_me()).username
+            bot_username = (await bot_api.get_me()).username
             warning_msg = await event.bot.send_message(
                 event.chat.id,
                 f"⚠️ @{user.username or user.first_name}, для прохождения верификации:\n\n"
@@ -200,16 +200,7 @@ async def start_verification_command(
 ):
     """Команда /start без параметров."""
     if message.chat.type in ['group', 'supergroup']:
-        if message.from_user.id in settings.admin_user_ids:
-            return
-
-        try:
-            chat_member = await message.bot.get_chat_member(message.chat.id, message.from_user.id)
-            if chat_member.status in ['administrator', 'creator']:
-                return
-        except Exception:
-            pass
-
+        # В группах команда игнорируется для всех, в том числе для администраторов
         return
 
     if message.from_user.id in settings.admin_user_ids:
@@ -528,7 +519,9 @@ async def choose_document_method(callback: CallbackQuery, state: FSMContext, db_
 
 
 @router.message(VerificationStates.entering_website_url)
-async def process_website_url(message: Message, state: FSMContext, db_manager: DatabaseManager):
+async def process_website_url(
+    message: Message, state: FSMContext, db_manager: DatabaseManager, verification_service: VerificationService
+):
     """Обработка ввода URL сайта."""
 
     # Проверяем тип чата - верификация должна происходить только в личных сообщениях
@@ -578,12 +571,13 @@ async def process_website_url(message: Message, state: FSMContext, db_manager: D
     await state.update_data(website_url=validated_url_or_error)
     await db_manager.users.update_step(message.from_user.id, VerificationStates.processing_verification.state)
 
-    verification_service = VerificationService(db_manager)
     await verification_service.start_verification_process(message, state)
 
 
 @router.message(VerificationStates.uploading_document, F.photo)
-async def process_document_photo(message: Message, state: FSMContext, db_manager: DatabaseManager):
+async def process_document_photo(
+    message: Message, state: FSMContext, db_manager: DatabaseManager, verification_service: VerificationService
+):
     """Обработка загруженной фотографии документа."""
 
     # Проверяем тип чата - верификация должна происходить только в личных сообщениях
@@ -621,16 +615,18 @@ async def process_document_photo(message: Message, state: FSMContext, db_manager
 
     await state.update_data(
         document_file_id=photo.file_id,
+        document_file_unique_id=photo.file_unique_id,
         document_type="photo"
     )
     await db_manager.users.update_step(message.from_user.id, VerificationStates.processing_verification.state)
 
-    verification_service = VerificationService(db_manager)
     await verification_service.start_verification_process(message, state)
 
 
 @router.message(VerificationStates.uploading_document, F.document)
-async def process_document_file(message: Message, state: FSMContext, db_manager: DatabaseManager):
+async def process_document_file(
+    message: Message, state: FSMContext, db_manager: DatabaseManager, verification_service: VerificationService
+):
     """Обработка загруженного файла документа."""
 
     # Проверяем тип чата - верификация должна происходить только в личных сообщениях
@@ -681,12 +677,12 @@ async def process_document_file(message: Message, state: FSMContext, db_manager:
 
     await state.update_data(
         document_file_id=document.file_id,
+        document_file_unique_id=document.file_unique_id,
         document_type="document",
         document_mime_type=document.mime_type
     )
     await db_manager.users.update_step(message.from_user.id, VerificationStates.processing_verification.state)
 
-    verification_service = VerificationService(db_manager)
     await verification_service.start_verification_process(message, state)
 
 
@@ -725,11 +721,10 @@ async def process_invalid_document(message: Message):
 
 
 @router.callback_query(F.data == "view_profile")
-async def view_profile_callback(callback: CallbackQuery, db_manager: DatabaseManager):
+async def view_profile_callback(callback: CallbackQuery, verification_service: VerificationService):
     """Просмотр профиля пользователя."""
     await callback.answer()
 
-    verification_service = VerificationService(db_manager)
     profile_text = await verification_service.get_user_profile_text(callback.from_user.id)
 
     await callback.message.edit_text(profile_text)
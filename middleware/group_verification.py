@@ -1,6 +1,6 @@
 """Middleware для блокировки сообщений неверифицированных пользователей в группе."""
 
-from typing import Callable, Dict, Any, Awaitable, Set, Union
+from typing import Callable, Dict, Any, Awaitable, Set
 from datetime import datetime, timedelta
 
 from aiogram import BaseMiddleware
@@ -27,7 +27,6 @@ class GroupVerificationMiddleware(BaseMiddleware):
         self.settings = settings
         self.whitelist_service = WhitelistService(db_manager)
 
-        self._verified_users_cache: Set[Union[int, str]] = set()
         self._whitelist_cache: Set[int] = set()
         self._cache_ttl = 300
         self._last_cache_update = datetime.now()
@@ -75,8 +74,8 @@ class GroupVerificationMiddleware(BaseMiddleware):
             return await handler(event, data)
 
         try:
-            chat_member = await event.bot.get_chat_member(event.chat.id, user_id)
-            if chat_member.status in ['administrator', 'creator']:
+            chat_admins = data.get("chat_admins")
+            if chat_admins and await chat_admins.is_admin(event.bot, event.chat.id, user_id):
                 logger.debug(f"👑 Админ группы {user_id} (@{event.from_user.username}) пропущен")
                 return await handler(event, data)
         except Exception as e:
@@ -89,7 +88,6 @@ class GroupVerificationMiddleware(BaseMiddleware):
         is_in_whitelist = await self._check_user_whitelist(user_id, username, event.chat.id)
         if is_in_whitelist:
             await self.whitelist_service.auto_verify_whitelist_user(user_id, username=username)
-            self.add_verified_user_to_cache(user_id)
             logger.info(f"✅ Пользователь {user_id} (@{username or 'N/A'}) из whitelist автоматически верифицирован")
             return await handler(event, data)
 
@@ -122,6 +120,7 @@ class GroupVerificationMiddleware(BaseMiddleware):
         """
         if datetime.now() - self._last_cache_update > timedelta(seconds=self._cache_ttl):
             self._whitelist_cache.clear()
+            self._last_cache_update = datetime.now()
 
         if user_id in self._whitelist_cache:
             return True
@@ -141,7 +140,9 @@ class GroupVerificationMiddleware(BaseMiddleware):
 
     async def _check_user_verification(self, user_id: int, group_id: int = None) -> bool:
         """
-        Проверяет верификацию пользователя в конкретной группе с использованием кэша.
+        Проверяет верификацию пользователя в конкретной группе.
+
+        Верифицированные участники кэшируются в репозитории.
 
         Args:
             user_id: ID пользователя
@@ -153,23 +154,8 @@ class GroupVerificationMiddleware(BaseMiddleware):
         if not group_id:
             return False
 
-        cache_key = f"{user_id}_{group_id}"
-
-        if datetime.now() - self._last_cache_update > timedelta(seconds=self._cache_ttl):
-            self._verified_users_cache.clear()
-            self._last_cache_update = datetime.now()
-
-        if cache_key in self._verified_users_cache:
-            return True
-
         try:
-            verification = await self.db_manager.user_group_verifications.get_by_user_and_group(user_id, group_id)
-
-            if verification and verification.verified:
-                self._verified_users_cache.add(cache_key)
-                return True
-
-            return False
+            return await self.db_manager.user_group_verifications.is_user_verified_in_group(user_id, group_id)
 
         except Exception as e:
             logger.error(f"❌ Ошибка проверки верификации пользователя {user_id} в группе {group_id}: {e}")
@@ -223,41 +209,18 @@ class GroupVerificationMiddleware(BaseMiddleware):
         except Exception as e:
             logger.error(f"❌ Ошибка при обработке сообщения неверифицированного пользователя {user_id}: {e}")
 
-    def invalidate_user_cache(self, user_id: int, group_id: int = None):
+    def invalidate_user_cache(self, user_id: int, group_id: int):
         """
-        Принудительно очищает кэш для конкретного пользователя в группе.
+        Принудительно очищает кэш верификации пользователя в группе.
 
-        Используется когда пользователь проходит верификацию.
+        Методы записи репозитория делают это сами; нужен для изменений в обход репозитория.
 
         Args:
             user_id: ID пользователя
-            group_id: ID группы (если None, очищает для всех групп)
-        """
-        if group_id:
-            cache_key = f"{user_id}_{group_id}"
-            self._verified_users_cache.discard(cache_key)
-            logger.debug(f"🔄 Очищен кэш для пользователя {user_id} в группе {group_id}")
-        else:
-            to_remove = [key for key in self._verified_users_cache if key.startswith(f"{user_id}_")]
-            for key in to_remove:
-                self._verified_users_cache.discard(key)
-            logger.debug(f"🔄 Очищен кэш для пользователя {user_id} во всех группах")
-
-    def add_verified_user_to_cache(self, user_id: int, group_id: int = None):
-        """
-        Добавляет пользователя в кэш верифицированных для конкретной группы.
-
-        Args:
-            user_id: ID пользователя
-            group_id: ID группы (если None, добавляет только user_id для обратной совместимости)
+            group_id: ID группы
         """
-        if group_id:
-            cache_key = f"{user_id}_{group_id}"
-            self._verified_users_cache.add(cache_key)
-            logger.debug(f"✅ Пользователь {user_id} добавлен в кэш верифицированных для группы {group_id}")
-        else:
-            self._verified_users_cache.add(user_id)
-            logger.debug(f"✅ Пользователь {user_id} добавлен в кэш верифицированных (глобально)")
+        self.db_manager.user_group_verifications.invalidate(user_id, group_id)
+        logger.debug(f"🔄 Очищен кэш для пользователя {user_id} в группе {group_id}")
 
     def invalidate_whitelist_cache(self, user_id: int):
         """
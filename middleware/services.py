@@ -5,11 +5,15 @@ from typing import Callable, Dict, Any, Awaitable
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
 from loguru import logger
+from openai import AsyncOpenAI
 
 from bot.database.manager import DatabaseManager
 from bot.services.admin_service import AdminService
+from bot.services.bot_api_cache import BotApiCache
+from bot.services.chat_admin_cache import ChatAdminCache
 from bot.services.group_service import GroupService
 from bot.services.whitelist_service import WhitelistService
+from bot.services.verification_queue import VerificationQueue
 from bot.services.verification_service import VerificationService
 from config.settings import Settings
 
@@ -20,11 +24,23 @@ class ServiceMiddleware(BaseMiddleware):
     Создает сервисы "на лету" для каждого события.
     """
 
-    def __init__(self, db_manager: DatabaseManager, settings: Settings):
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        settings: Settings,
+        chat_admins: ChatAdminCache,
+        bot_api: BotApiCache,
+        openai_client: AsyncOpenAI,
+        verification_queue: VerificationQueue,
+    ):
         """Инициализация middleware."""
         super().__init__()
         self.db_manager = db_manager
         self.settings = settings
+        self.chat_admins = chat_admins
+        self.bot_api = bot_api
+        self.openai_client = openai_client
+        self.verification_queue = verification_queue
 
     async def __call__(
         self,
@@ -40,9 +56,12 @@ class ServiceMiddleware(BaseMiddleware):
         data["db_manager"] = self.db_manager
         data["settings"] = self.settings
         data["admin_service"] = AdminService(self.db_manager)
-        bot = data.get("bot")
-        data["group_service"] = GroupService(self.db_manager, bot)
+        data["chat_admins"] = self.chat_admins
+        data["bot_api"] = self.bot_api
+        data["group_service"] = GroupService(self.db_manager, self.bot_api)
         data["whitelist_service"] = WhitelistService(self.db_manager)
-        data["verification_service"] = VerificationService(self.db_manager)
+        data["verification_service"] = VerificationService(
+            self.db_manager, self.openai_client, self.verification_queue
+        )
 
         return await handler(event, data)
@@ -0,0 +1,39 @@
+"""Модель задачи фоновой верификации."""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+
+class VerificationJobStatus(str, Enum):
+    """Статус задачи в очереди верификации."""
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class VerificationJobOutcome(str, Enum):
+    """Итог выполненной задачи."""
+    VERIFIED = "verified"
+    REJECTED = "rejected"
+    ERROR = "error"
+
+
+class VerificationJob(BaseModel):
+    """Задача проверки данных пользователя через OpenAI."""
+
+    id: int
+    user_id: int
+    group_id: Optional[int] = None
+    payload: Dict[str, Any]  # данные FSM на момент постановки в очередь
+    status: VerificationJobStatus = VerificationJobStatus.PENDING
+    attempts: int = 0  # номер текущей попытки, он же токен аренды
+    available_at: Optional[datetime] = None
+    error: Optional[str] = None
+    outcome: Optional[str] = None  # итог, записанный вместе с изменениями верификации
+    notified: bool = False  # итог отправлен пользователю
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
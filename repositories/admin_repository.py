@@ -1,37 +1,78 @@
 """Репозиторий для работы с таблицей admins."""
 
-from typing import List, Optional
+from typing import FrozenSet, Iterable, List, Optional
 
+from bot.utils.cache import LRUCache
+from ..backends.base import StorageBackend
 from ..models.admin import Admin
 from .base import BaseRepository
+from ..hydration import hydrate, hydrate_all
 
 
 class AdminRepository(BaseRepository):
-    """Репозиторий для управления администраторами."""
+    """
+    Репозиторий для управления администраторами.
+
+    Если передан кэш, набор ID администраторов группы хранится в памяти:
+    `exists` и `get_admin_ids` отвечают без запроса к базе,
+    `replace_for_group` обновляет набор, остальные записи его сбрасывают.
+    """
+
+    def __init__(self, backend: StorageBackend, cache: Optional[LRUCache[int, FrozenSet[int]]] = None):
+        """
+        Инициализация репозитория.
+
+        :param backend: Хранилище, общее для всех репозиториев.
+        :param cache: Кэш наборов ID администраторов по group_id (None - без кэширования).
+        """
+        super().__init__(backend)
+        self.cache = cache
+
+    def _invalidate(self, group_id: int) -> None:
+        """Сброс кэша администраторов группы (внутри транзакции - также после коммита)."""
+        if self.cache is not None:
+            self.cache.invalidate(group_id)
+            if self.backend.in_transaction:
+                self.backend.after_commit(lambda: self.cache.invalidate(group_id))
 
     async def add(self, admin: Admin) -> None:
         """Добавление администратора."""
         query = """
             INSERT INTO admins (user_id, group_id, role, added_at)
-            VALUES (?, ?, ?, datetime('now'))
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
             ON CONFLICT(user_id, group_id) DO UPDATE SET
                 role = excluded.role
         """
         await self.execute(query, (admin.user_id, admin.group_id, admin.role))
+        self._invalidate(admin.group_id)
 
     async def remove(self, user_id: int, group_id: int) -> None:
         """Удаление администратора из группы."""
         query = "DELETE FROM admins WHERE user_id = ? AND group_id = ?"
         await self.execute(query, (user_id, group_id))
+        self._invalidate(group_id)
 
     async def get_by_group(self, group_id: int) -> List[Admin]:
         """Получение списка администраторов для конкретной группы."""
         query = "SELECT * FROM admins WHERE group_id = ?"
         rows = await self.fetchall(query, (group_id,))
-        return [Admin(**row) for row in rows]
+        return hydrate_all(Admin, rows)
+
+    async def get_admin_ids(self, group_id: int) -> FrozenSet[int]:
+        """Набор ID администраторов группы."""
+        if self.cache is None or self.backend.in_transaction:
+            return await self._fetch_admin_ids(group_id)
+        return await self.cache.get_or_load(group_id, lambda: self._fetch_admin_ids(group_id))
+
+    async def _fetch_admin_ids(self, group_id: int) -> FrozenSet[int]:
+        """Чтение набора ID администраторов группы из базы."""
+        rows = await self.fetchall("SELECT user_id FROM admins WHERE group_id = ?", (group_id,))
+        return frozenset(row['user_id'] for row in rows)
 
     async def exists(self, user_id: int, group_id: int) -> bool:
         """Проверка, является ли пользователь админом конкретной группы."""
+        if self.cache is not None:
+            return user_id in await self.get_admin_ids(group_id)
         query = "SELECT 1 FROM admins WHERE user_id = ? AND group_id = ?"
         row = await self.fetchone(query, (user_id, group_id))
         return row is not None
@@ -46,6 +87,30 @@ class AdminRepository(BaseRepository):
         """Удаление всех администраторов для указанной группы."""
         query = "DELETE FROM admins WHERE group_id = ?"
         await self.execute(query, (group_id,))
+        self._invalidate(group_id)
+
+    async def replace_for_group(self, group_id: int, admins: Iterable[Admin]) -> None:
+        """
+        Замена списка администраторов группы одной транзакцией.
+
+        :param group_id: ID группы.
+        :param admins: Новые администраторы (group_id записей игнорируется).
+        """
+        query = """
+            INSERT INTO admins (user_id, group_id, role, added_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(user_id, group_id) DO UPDATE SET
+                role = excluded.role
+        """
+        rows = [(admin.user_id, group_id, admin.role) for admin in admins]
+        async with self.backend.transaction():
+            await self.execute("DELETE FROM admins WHERE group_id = ?", (group_id,))
+            if rows:
+                await self.executemany(query, rows)
+        if self.cache is not None and not self.backend.in_transaction:
+            self.cache.set(group_id, frozenset(user_id for user_id, _, _ in rows))
+        else:
+            self._invalidate(group_id)
 
     async def get_user_groups(self, user_id: int) -> List[int]:
         """Получение списка ID групп, где пользователь является админом."""
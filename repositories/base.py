@@ -1,37 +1,79 @@
 """Базовый класс для всех репозиториев."""
 
-import aiosqlite
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Sequence
+
+from ..backends.base import StorageBackend
+from ..compact import PLAIN_LAYOUT, SchemaLayout
 
 
 class BaseRepository:
     """Базовый класс репозитория."""
 
-    def __init__(self, conn: aiosqlite.Connection):
+    def __init__(self, backend: StorageBackend, layout: SchemaLayout = PLAIN_LAYOUT):
         """
         Инициализация репозитория.
 
-        :param conn: Соединение с базой данных.
+        :param backend: Хранилище, общее для всех репозиториев.
+        :param layout: Раскладка схемы (обычная или компактная v2).
+        """
+        self.backend = backend
+        self.dialect = backend.dialect
+        self.layout = layout
+
+    async def execute(self, query: str, parameters=None) -> int:
+        """
+        Выполнение SQL запроса.
+
+        Внутри `DatabaseManager.transaction()` запрос присоединяется
+        к общей транзакции, иначе фиксируется сразу.
+
+        :return: Количество затронутых строк.
+        """
+        if parameters is None:
+            parameters = ()
+        return await self.backend.execute(query, parameters)
+
+    async def execute_returning(self, query: str, parameters=None):
         """
-        self.conn = conn
+        Выполнение изменяющего SQL запроса с RETURNING.
 
-    async def execute(self, query: str, parameters=None):
-        """Выполнение SQL запроса."""
+        :return: Первая возвращенная строка или None.
+        """
         if parameters is None:
             parameters = ()
-        async with self.conn.execute(query, parameters) as cursor:
-            await self.conn.commit()
-            return cursor
+        return await self.backend.execute_returning(query, parameters)
+
+    async def executemany(self, query: str, parameters: Iterable[Sequence[Any]]) -> None:
+        """
+        Выполнение SQL запроса для каждого набора параметров.
+
+        Все наборы фиксируются одним коммитом (или в составе
+        внешней транзакции).
+        """
+        await self.backend.executemany(query, parameters)
 
     async def fetchone(self, query: str, parameters=None):
         """Выполнение SQL запроса и получение одной записи."""
         if parameters is None:
             parameters = ()
-        async with self.conn.execute(query, parameters) as cursor:
-            return await cursor.fetchone()
+        return await self.backend.fetchone(query, parameters)
 
     async def fetchall(self, query: str, parameters=None):
         """Выполнение SQL запроса и получение всех записей."""
         if parameters is None:
             parameters = ()
-        async with self.conn.execute(query, parameters) as cursor:
-            return await cursor.fetchall()
+        return await self.backend.fetchall(query, parameters)
+
+    @staticmethod
+    def utcnow() -> datetime:
+        """Текущее время UTC без часового пояса, как у CURRENT_TIMESTAMP."""
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def cutoff(self, **delta: float) -> Any:
+        """
+        Граница по времени «сейчас минус delta» для сравнения с CURRENT_TIMESTAMP.
+
+        :param delta: Аргументы timedelta (days=..., hours=...).
+        """
+        return self.layout.timestamp(self.backend, self.utcnow() - timedelta(**delta))
@@ -3,17 +3,59 @@
 from datetime import datetime
 from typing import Optional
 
-import aiosqlite
+from bot.utils.cache import LRUCache
 from .base import BaseRepository
+from ..backends.base import StorageBackend
+from ..hydration import hydrate, hydrate_all
 from ..models.group import Group
 
+# Строки, созданные до регистрации группы (без названия), читаются с пустым названием
+_COLUMNS = "group_id, COALESCE(group_name, '') AS group_name, is_active, checkin_mode, added_at, updated_at"
+
 
 class GroupRepository(BaseRepository):
-    """Репозиторий для управления группами."""
+    """
+    Репозиторий для управления группами.
+
+    Если передан кэш, `get_by_id` отвечает из памяти. Методы записи
+    получают сохраненную строку через RETURNING и обновляют кэш,
+    `warm_cache` заполняет его активными группами при старте. Внутри
+    транзакции кэш не заполняется, а сбрасывается сейчас и после коммита,
+    чтобы при откате в нем не осталось незафиксированных строк.
+    """
 
-    def __init__(self, conn: aiosqlite.Connection):
-        """Инициализация репозитория."""
-        super().__init__(conn)
+    def __init__(self, backend: StorageBackend, cache: Optional[LRUCache[int, Group]] = None):
+        """
+        Инициализация репозитория.
+
+        :param backend: Хранилище, общее для всех репозиториев.
+        :param cache: Кэш групп по group_id (None - без кэширования).
+        """
+        super().__init__(backend)
+        self.cache = cache
+
+    def _remember(self, row) -> Optional[Group]:
+        """Сборка группы из строки и обновление кэша (внутри транзакции - сброс)."""
+        group = hydrate(Group, row)
+        if group is None or self.cache is None:
+            return group
+        if self.backend.in_transaction:
+            group_id = group.group_id
+            self.cache.invalidate(group_id)
+            self.backend.after_commit(lambda: self.cache.invalidate(group_id))
+        else:
+            self.cache.set(group.group_id, group)
+        return group
+
+    async def warm_cache(self) -> int:
+        """
+        Загрузка активных групп в кэш.
+
+        :return: Количество загруженных групп.
+        """
+        if self.cache is None:
+            return 0
+        return len(await self.get_active())
 
     async def add_or_update(self, group: Group) -> None:
         """Добавление или обновление информации о группе."""
@@ -21,7 +63,7 @@ class GroupRepository(BaseRepository):
         added_at = group.added_at or now
         updated_at = now
 
-        query = """
+        query = f"""
             INSERT INTO groups (group_id, group_name, is_active, added_at, updated_at)
             VALUES (?, ?, ?, ?, ?)
             ON CONFLICT(group_id) DO UPDATE SET
@@ -29,57 +71,64 @@ class GroupRepository(BaseRepository):
                 is_active = excluded.is_active,
                 added_at = COALESCE(groups.added_at, excluded.added_at),
                 updated_at = excluded.updated_at
+            RETURNING {_COLUMNS}
         """
-        async with self.conn.cursor() as cursor:
-            await cursor.execute(query, (
-                group.group_id, group.group_name, int(group.is_active),
-                added_at, updated_at
-            ))
-            await self.conn.commit()
+        row = await self.execute_returning(query, (
+            group.group_id, group.group_name, bool(group.is_active),
+            added_at, updated_at
+        ))
+        self._remember(row)
 
     async def get_by_id(self, group_id: int) -> Optional[Group]:
-        """Получение информации о группе по ID."""
-        query = "SELECT * FROM groups WHERE group_id = ?"
-        async with self.conn.cursor() as cursor:
-            await cursor.execute(query, (group_id,))
-            row = await cursor.fetchone()
-            return Group(**dict(row)) if row else None
+        """
+        Получение информации о группе по ID.
+
+        Отсутствие группы не кэшируется: ее могут создать в обход репозитория.
+        """
+        if self.cache is None or self.backend.in_transaction:
+            return await self._fetch_by_id(group_id)
+        return await self.cache.get_or_load(
+            group_id,
+            lambda: self._fetch_by_id(group_id),
+            cache_if=lambda group: group is not None,
+        )
+
+    async def _fetch_by_id(self, group_id: int) -> Optional[Group]:
+        """Чтение группы из базы."""
+        query = f"SELECT {_COLUMNS} FROM groups WHERE group_id = ?"
+        row = await self.fetchone(query, (group_id,))
+        return hydrate(Group, row)
 
     async def get_active(self) -> list[Group]:
         """Получение списка всех активных групп."""
-        query = "SELECT * FROM groups WHERE is_active = 1"
-        async with self.conn.cursor() as cursor:
-            await cursor.execute(query)
-            rows = await cursor.fetchall()
-            return [Group(**dict(row)) for row in rows]
+        query = f"SELECT {_COLUMNS} FROM groups WHERE is_active = TRUE"
+        rows = await self.fetchall(query)
+        groups = hydrate_all(Group, rows)
+        if self.cache is not None and not self.backend.in_transaction:
+            for group in groups:
+                self.cache.set(group.group_id, group)
+        return groups
 
     async def set_active_status(self, group_id: int, is_active: bool) -> None:
         """Установка статуса активности для группы."""
-        query = "UPDATE groups SET is_active = ?, updated_at = ? WHERE group_id = ?"
+        query = f"UPDATE groups SET is_active = ?, updated_at = ? WHERE group_id = ? RETURNING {_COLUMNS}"
         now = datetime.now()
-        async with self.conn.cursor() as cursor:
-            await cursor.execute(query, (int(is_active), now, group_id))
-            await self.conn.commit()
+        row = await self.execute_returning(query, (bool(is_active), now, group_id))
+        self._remember(row)
 
     async def toggle_checkin_mode(self, group_id: int) -> bool:
         """Переключение режима checkin для группы. Возвращает новое значение."""
-        query = """
+        query = f"""
             UPDATE groups 
-            SET checkin_mode = NOT checkin_mode, updated_at = ? 
+            SET checkin_mode = NOT COALESCE(checkin_mode, FALSE), updated_at = ? 
             WHERE group_id = ?
+            RETURNING {_COLUMNS}
         """
         now = datetime.now()
-        async with self.conn.cursor() as cursor:
-            await cursor.execute(query, (now, group_id))
-            await self.conn.commit()
-            
-        group = await self.get_by_id(group_id)
+        group = self._remember(await self.execute_returning(query, (now, group_id)))
         return group.checkin_mode if group else False
 
     async def is_checkin_mode_enabled(self, group_id: int) -> bool:
         """Проверка, включен ли режим checkin для группы."""
-        query = "SELECT checkin_mode FROM groups WHERE group_id = ?"
-        async with self.conn.cursor() as cursor:
-            await cursor.execute(query, (group_id,))
-            row = await cursor.fetchone()
-            return bool(row['checkin_mode']) if row else False
+        group = await self.get_by_id(group_id)
+        return group.checkin_mode if group else False
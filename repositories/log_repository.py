@@ -1,5 +1,7 @@
 """Репозиторий для работы с таблицей verification_logs."""
 
+from typing import Iterable
+
 from .base import BaseRepository
 from ..models.verification_log import VerificationLog
 
@@ -7,32 +9,39 @@ from ..models.verification_log import VerificationLog
 class LogRepository(BaseRepository):
     """Репозиторий для управления логами верификации."""
 
+    _INSERT_QUERY = """
+        INSERT INTO verification_logs (user_id, method, full_name, workplace, website_url, details, openai_response, result, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    """
+
+    @staticmethod
+    def _params(log: VerificationLog) -> tuple:
+        """Параметры INSERT для лога."""
+        return (
+            log.user_id,
+            log.method.value if log.method else None,
+            log.full_name,
+            log.workplace,
+            log.website_url,
+            log.details,
+            log.openai_response,
+            log.result,
+        )
+
     async def add(self, log: VerificationLog) -> None:
         """Добавление лога верификации в базу данных."""
-        query = """
-            INSERT INTO verification_logs (user_id, method, full_name, workplace, website_url, details, openai_response, result, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-        """
-        await self.execute(
-            query,
-            (
-                log.user_id,
-                log.method.value if log.method else None,
-                log.full_name,
-                log.workplace,
-                log.website_url,
-                log.details,
-                log.openai_response,
-                log.result,
-            ),
-        )
+        await self.execute(self._INSERT_QUERY, self._params(log))
+
+    async def add_many(self, logs: Iterable[VerificationLog]) -> None:
+        """Добавление пакета логов верификации одним коммитом."""
+        rows = [self._params(log) for log in logs]
+        if rows:
+            await self.executemany(self._INSERT_QUERY, rows)
 
     async def cleanup_old(self, days: int) -> int:
         """Удаление старых логов верификации."""
-        query = "DELETE FROM verification_logs WHERE created_at < datetime('now', ?)"
-        params = (f'-{days} days',)
-        cursor = await self.execute(query, params)
-        return cursor.rowcount if cursor else 0
+        query = "DELETE FROM verification_logs WHERE created_at < ?"
+        return await self.execute(query, (self.cutoff(days=days),))
 
     async def update_verification_result(self, user_id: int, result: str) -> None:
         """Обновление результата верификации для последнего лога пользователя."""
@@ -9,18 +9,16 @@ class MessageCountRepository(BaseRepository):
 
     async def increment_count(self, user_id: int, group_id: int) -> int:
         """Увеличивает счетчик сообщений для пользователя в группе. Возвращает новое значение."""
-        query = """
+        now = self.layout.now
+        query = f"""
             INSERT INTO message_count (user_id, group_id, count, first_message_at, last_message_at)
-            VALUES (?, ?, 1, datetime('now'), datetime('now'))
+            VALUES (?, ?, 1, {now}, {now})
             ON CONFLICT(user_id, group_id) DO UPDATE SET
-                count = count + 1,
-                last_message_at = datetime('now')
+                count = message_count.count + 1,
+                last_message_at = {now}
+            RETURNING count
         """
-        await self.execute(query, (user_id, group_id))
-        
-        # Получаем текущее значение счетчика
-        count_query = "SELECT count FROM message_count WHERE user_id = ? AND group_id = ?"
-        row = await self.fetchone(count_query, (user_id, group_id))
+        row = await self.execute_returning(query, (user_id, group_id))
         return row['count'] if row else 1
 
     async def get_count(self, user_id: int, group_id: int) -> int:
@@ -38,7 +36,6 @@ class MessageCountRepository(BaseRepository):
         """Удаляет старые записи счетчиков (старше указанного количества дней)."""
         query = """
             DELETE FROM message_count 
-            WHERE last_message_at < datetime('now', ?)
+            WHERE last_message_at < ?
         """
-        cursor = await self.execute(query, (f'-{days} days',))
-        return cursor.rowcount if cursor else 0
+        return await self.execute(query, (self.cutoff(days=days),))
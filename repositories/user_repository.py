@@ -1,9 +1,10 @@
 """
 Репозиторий для управления пользователями в базе данных.
 """
-from typing import Optional
+from typing import Iterable, List, Optional
 
 from .base import BaseRepository
+from ..hydration import hydrate, hydrate_all
 from ..models.user import User
 
 
@@ -18,8 +19,9 @@ class UserRepository(BaseRepository):
         Если пользователь уже существует, ничего не делает.
         """
         sql = """
-            INSERT OR IGNORE INTO users (telegram_id, username, first_name, last_name, language_code, is_premium)
+            INSERT INTO users (telegram_id, username, first_name, last_name, language_code, is_premium)
             VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT DO NOTHING
         """
         await self.execute(
             sql,
@@ -29,10 +31,40 @@ class UserRepository(BaseRepository):
                 user.first_name,
                 user.last_name,
                 user.language_code,
-                int(user.is_premium) if user.is_premium is not None else 0,
+                bool(user.is_premium),
             ),
         )
 
+    async def upsert_many(self, users: Iterable[User]) -> None:
+        """
+        Добавляет пользователей пакетом или обновляет данные профиля существующих.
+
+        Статус верификации, состояние и счетчик попыток не затрагиваются.
+        """
+        sql = """
+            INSERT INTO users (telegram_id, username, first_name, last_name, language_code, is_premium)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(telegram_id) DO UPDATE SET
+                username = excluded.username,
+                first_name = excluded.first_name,
+                last_name = excluded.last_name,
+                language_code = excluded.language_code,
+                is_premium = excluded.is_premium
+        """
+        rows = [
+            (
+                user.telegram_id,
+                user.username,
+                user.first_name,
+                user.last_name,
+                user.language_code,
+                bool(user.is_premium),
+            )
+            for user in users
+        ]
+        if rows:
+            await self.executemany(sql, rows)
+
     async def get_user_by_telegram_id(self, telegram_id: int) -> Optional[User]:
         """
         Получает пользователя по его telegram_id.
@@ -41,7 +73,7 @@ class UserRepository(BaseRepository):
         """
         sql = "SELECT * FROM users WHERE telegram_id = ?"
         row = await self.fetchone(sql, (telegram_id,))
-        return User(**row) if row else None
+        return hydrate(User, row)
 
     async def update_user_verification(
         self, telegram_id: int, verified: bool
@@ -50,7 +82,7 @@ class UserRepository(BaseRepository):
         Обновляет статус верификации пользователя.
         """
         sql = "UPDATE users SET verified = ?, verified_at = CURRENT_TIMESTAMP WHERE telegram_id = ?"
-        await self.execute(sql, (int(verified), telegram_id))
+        await self.execute(sql, (bool(verified), telegram_id))
 
     async def update_user_state(self, state: str, telegram_id: int) -> None:
         """
@@ -87,6 +119,18 @@ class UserRepository(BaseRepository):
             return None
             
         username = username.lstrip('@')
-        sql = "SELECT * FROM users WHERE username = ? COLLATE NOCASE"
+        sql = "SELECT * FROM users WHERE lower(username) = lower(?)"
         row = await self.fetchone(sql, (username,))
-        return User(**row) if row else None
+        return hydrate(User, row)
+
+    async def get_unverified_older_than(self, hours: int) -> List[int]:
+        """
+        Получает telegram_id пользователей, не прошедших верификацию
+        дольше указанного количества часов.
+        """
+        sql = """
+            SELECT telegram_id FROM users
+            WHERE verified = FALSE AND created_at <= ?
+        """
+        rows = await self.fetchall(sql, (self.cutoff(hours=hours),))
+        return [row['telegram_id'] for row in rows]
@@ -0,0 +1,167 @@
+"""Репозиторий для работы с таблицей verification_jobs."""
+
+import json
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from .base import BaseRepository
+from ..models.verification_job import VerificationJob, VerificationJobOutcome, VerificationJobStatus
+
+
+class VerificationJobRepository(BaseRepository):
+    """
+    Очередь задач верификации с доставкой «хотя бы один раз».
+
+    Обработчик берет задачу в аренду (`claim`): статус running, счетчик
+    попыток увеличивается, available_at переносится на конец аренды. Если
+    обработчик не завершил задачу до конца аренды, ее заберет другой.
+    Запись итога, завершение и возврат в очередь проверяют номер попытки,
+    поэтому обработчик с истекшей арендой не перезапишет результат нового.
+    Отправка итога пользователю отмечается отдельно (`mark_notified`).
+    """
+
+    @staticmethod
+    def _job(row) -> Optional[VerificationJob]:
+        """Сборка задачи из строки с разбором payload."""
+        if row is None:
+            return None
+        values = dict(row)
+        values["payload"] = json.loads(values["payload"])
+        return VerificationJob(**values)
+
+    async def enqueue(self, user_id: int, group_id: Optional[int], payload: Dict[str, Any]) -> int:
+        """
+        Постановка задачи в очередь.
+
+        :param user_id: ID пользователя.
+        :param group_id: ID группы, для которой проходит верификация.
+        :param payload: Данные FSM (сериализуются в JSON).
+        :return: ID задачи.
+        """
+        now = self.backend.timestamp(self.utcnow())
+        query = """
+            INSERT INTO verification_jobs (user_id, group_id, payload, status, attempts, available_at, created_at, updated_at)
+            VALUES (?, ?, ?, 'pending', 0, ?, ?, ?)
+            RETURNING id
+        """
+        row = await self.execute_returning(
+            query, (user_id, group_id, json.dumps(payload, ensure_ascii=False, default=str), now, now, now)
+        )
+        return row["id"]
+
+    async def count_active(self) -> int:
+        """Количество задач, ожидающих выполнения или выполняемых сейчас."""
+        query = "SELECT COUNT(*) AS count FROM verification_jobs WHERE status IN ('pending', 'running')"
+        row = await self.fetchone(query)
+        return row["count"] if row else 0
+
+    async def claim(self, lease: timedelta) -> Optional[VerificationJob]:
+        """
+        Взятие следующей задачи в аренду.
+
+        Подходят ожидающие задачи, время которых наступило, и задачи
+        с истекшей арендой.
+
+        :param lease: Срок аренды.
+        :return: Задача или None, если очередь пуста.
+        """
+        now = self.utcnow()
+        query = """
+            UPDATE verification_jobs
+            SET status = 'running', attempts = attempts + 1, available_at = ?, updated_at = ?
+            WHERE id = (
+                SELECT id FROM verification_jobs
+                WHERE status IN ('pending', 'running') AND available_at <= ?
+                ORDER BY available_at, id
+                LIMIT 1
+            )
+            RETURNING *
+        """
+        if self.dialect == "postgresql":
+            # Несколько воркеров не должны ждать друг друга на одной строке
+            query = query.replace("LIMIT 1", "LIMIT 1 FOR UPDATE SKIP LOCKED")
+        row = await self.execute_returning(query, (
+            self.backend.timestamp(now + lease),
+            self.backend.timestamp(now),
+            self.backend.timestamp(now),
+        ))
+        return self._job(row)
+
+    async def record_outcome(self, job: VerificationJob, outcome: VerificationJobOutcome) -> bool:
+        """
+        Запись итога задачи.
+
+        Вызывается в одной транзакции с изменениями верификации пользователя.
+
+        :return: False, если итог уже записан (повторная доставка) или аренда истекла.
+        """
+        query = """
+            UPDATE verification_jobs
+            SET outcome = ?, updated_at = ?
+            WHERE id = ? AND attempts = ? AND status = 'running' AND outcome IS NULL
+        """
+        updated = await self.execute(
+            query, (outcome.value, self.backend.timestamp(self.utcnow()), job.id, job.attempts)
+        )
+        return updated > 0
+
+    async def mark_notified(self, job: VerificationJob) -> None:
+        """Отметка, что итог задачи отправлен пользователю."""
+        query = "UPDATE verification_jobs SET notified = TRUE, updated_at = ? WHERE id = ?"
+        await self.execute(query, (self.backend.timestamp(self.utcnow()), job.id))
+
+    async def finish(
+        self, job: VerificationJob, status: VerificationJobStatus, error: Optional[str] = None
+    ) -> bool:
+        """
+        Завершение задачи (done / failed).
+
+        :return: False, если аренда истекла и задачу уже забрал другой обработчик.
+        """
+        query = """
+            UPDATE verification_jobs
+            SET status = ?, error = ?, updated_at = ?
+            WHERE id = ? AND attempts = ? AND status = 'running'
+        """
+        updated = await self.execute(
+            query, (status.value, error, self.backend.timestamp(self.utcnow()), job.id, job.attempts)
+        )
+        return updated > 0
+
+    async def retry(self, job: VerificationJob, delay: timedelta, error: str) -> bool:
+        """
+        Возврат задачи в очередь после ошибки.
+
+        :param delay: Через сколько задачу можно брать снова.
+        :return: False, если аренда истекла и задачу уже забрал другой обработчик.
+        """
+        now = self.utcnow()
+        query = """
+            UPDATE verification_jobs
+            SET status = 'pending', available_at = ?, error = ?, updated_at = ?
+            WHERE id = ? AND attempts = ? AND status = 'running'
+        """
+        updated = await self.execute(query, (
+            self.backend.timestamp(now + delay), error, self.backend.timestamp(now), job.id, job.attempts
+        ))
+        return updated > 0
+
+    async def requeue_running(self) -> int:
+        """
+        Возврат в очередь всех задач в работе, не дожидаясь конца аренды.
+
+        Только для запуска единственного процесса: его прошлые задачи
+        прерваны остановкой. Возвращает количество задач.
+        """
+        now = self.backend.timestamp(self.utcnow())
+        query = """
+            UPDATE verification_jobs
+            SET status = 'pending', available_at = ?, updated_at = ?
+            WHERE status = 'running'
+        """
+        return await self.execute(query, (now, now))
+
+    async def delete_finished(self, older_than: timedelta) -> int:
+        """Удаление завершенных задач старше older_than. Возвращает количество удаленных."""
+        query = "DELETE FROM verification_jobs WHERE status IN ('done', 'failed') AND updated_at <= ?"
+        return await self.execute(query, (self.backend.timestamp(self.utcnow() - older_than),))
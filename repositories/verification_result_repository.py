@@ -0,0 +1,54 @@
+"""Репозиторий для работы с таблицей verification_result_cache."""
+
+import json
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from .base import BaseRepository
+
+
+class VerificationResultRepository(BaseRepository):
+    """
+    Постоянный кэш результатов проверок через OpenAI.
+
+    Хранит ответ модели по ключу нормализованных входных данных
+    (см. `bot.utils.normalization`) до истечения срока записи.
+    """
+
+    async def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Сохраненный результат проверки или None, если записи нет или она устарела."""
+        query = "SELECT result FROM verification_result_cache WHERE cache_key = ? AND expires_at > ?"
+        row = await self.fetchone(query, (cache_key, self.backend.timestamp(self.utcnow())))
+        return json.loads(row["result"]) if row else None
+
+    async def put(self, cache_key: str, method: str, result: Dict[str, Any], ttl: timedelta) -> None:
+        """
+        Сохранение результата проверки.
+
+        :param cache_key: Ключ нормализованных входных данных.
+        :param method: Метод проверки (website / document).
+        :param result: Ответ модели.
+        :param ttl: Срок хранения записи.
+        """
+        query = """
+            INSERT INTO verification_result_cache (cache_key, method, found, result, created_at, expires_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, ?)
+            ON CONFLICT(cache_key) DO UPDATE SET
+                method = excluded.method,
+                found = excluded.found,
+                result = excluded.result,
+                created_at = CURRENT_TIMESTAMP,
+                expires_at = excluded.expires_at
+        """
+        await self.execute(query, (
+            cache_key,
+            method,
+            bool(result.get("found")),
+            json.dumps(result, ensure_ascii=False),
+            self.backend.timestamp(self.utcnow() + ttl),
+        ))
+
+    async def delete_expired(self) -> int:
+        """Удаление устаревших записей. Возвращает количество удаленных."""
+        query = "DELETE FROM verification_result_cache WHERE expires_at <= ?"
+        return await self.execute(query, (self.backend.timestamp(self.utcnow()),))
@@ -1,59 +1,183 @@
 """Репозиторий для работы с белым списком."""
 
-from typing import Optional, List
+from typing import Callable, Dict, Iterable, Optional, List, Set
+
+from bot.utils.cache import LRUCache
 from .base import BaseRepository
+from ..backends.base import StorageBackend
+from ..hydration import hydrate, hydrate_all
 from ..models.whitelist_entry import WhitelistEntry
 
 
+class WhitelistIndex:
+    """
+    Whitelist одной группы в памяти: множество user_id и username без учета регистра.
+
+    Один username может встречаться в нескольких записях (по ID и по username),
+    поэтому для него хранится количество записей.
+    """
+
+    __slots__ = ("user_ids", "usernames")
+
+    def __init__(self, rows: Iterable = ()):
+        """
+        Построение индекса.
+
+        :param rows: Строки со столбцами user_id и username.
+        """
+        self.user_ids: Set[int] = set()
+        self.usernames: Dict[str, int] = {}
+        for row in rows:
+            self.add(row["user_id"], row["username"])
+
+    def add(self, user_id: Optional[int], username: Optional[str]) -> None:
+        """Учет добавленной записи."""
+        if user_id is not None:
+            self.user_ids.add(user_id)
+        if username:
+            key = username.casefold()
+            self.usernames[key] = self.usernames.get(key, 0) + 1
+
+    def discard(self, user_id: Optional[int], username: Optional[str]) -> None:
+        """Учет удаленной записи."""
+        if user_id is not None:
+            self.user_ids.discard(user_id)
+        if username:
+            key = username.casefold()
+            count = self.usernames.get(key, 0) - 1
+            if count > 0:
+                self.usernames[key] = count
+            else:
+                self.usernames.pop(key, None)
+
+    def contains(self, user_id: int, username: Optional[str] = None) -> bool:
+        """Есть ли пользователь в whitelist по ID или username."""
+        return user_id in self.user_ids or bool(username) and username.casefold() in self.usernames
+
+
 class WhitelistRepository(BaseRepository):
-    """Репозиторий для управления белым списком пользователей."""
+    """
+    Репозиторий для управления белым списком пользователей.
+
+    Если передан кэш, `contains` проверяет пользователя по индексу группы
+    (`WhitelistIndex`), загружаемому при первом обращении. Методы записи
+    обновляют загруженный индекс на месте, вне транзакции; внутри
+    транзакции и при пакетных изменениях индекс сбрасывается сразу и еще
+    раз после коммита. Чтения внутри транзакции кэш не используют.
+    """
+
+    def __init__(self, backend: StorageBackend, cache: Optional[LRUCache[int, WhitelistIndex]] = None):
+        """
+        Инициализация репозитория.
+
+        :param backend: Хранилище, общее для всех репозиториев.
+        :param cache: Кэш индексов whitelist по group_id (None - без кэширования).
+        """
+        super().__init__(backend)
+        self.cache = cache
+
+    def _update_index(self, group_id: int, apply: Callable[[WhitelistIndex], None]) -> None:
+        """Применение изменения к загруженному индексу группы или его сброс."""
+        if self.cache is None:
+            return
+        index = self.cache.get(group_id)
+        if index is None or self.backend.in_transaction:
+            self._invalidate(group_id)
+        else:
+            apply(index)
+
+    def _invalidate(self, group_id: int) -> None:
+        """
+        Сброс индекса группы; внутри транзакции - также после коммита.
+
+        Сброс отменяет загрузку индекса, начатую до записи. Повтор после
+        коммита нужен, потому что до коммита другие задачи читают старые
+        строки и могут снова загрузить индекс без изменения.
+        """
+        self.cache.invalidate(group_id)
+        if self.backend.in_transaction:
+            self.backend.after_commit(lambda: self.cache.invalidate(group_id))
 
-    async def add_by_user_id(self, user_id: int, group_id: int, username: Optional[str] = None, full_name: Optional[str] = None) -> None:
-        """Добавляет пользователя в белый список по user_id."""
-        existing = await self.get_by_user_id(user_id, group_id)
+    async def get_index(self, group_id: int) -> WhitelistIndex:
+        """Индекс whitelist группы (из кэша или из базы)."""
+        if self.cache is None or self.backend.in_transaction:
+            return await self._fetch_index(group_id)
+        return await self.cache.get_or_load(group_id, lambda: self._fetch_index(group_id))
+
+    async def _fetch_index(self, group_id: int) -> WhitelistIndex:
+        """Построение индекса whitelist группы по данным из базы."""
+        rows = await self.fetchall("SELECT user_id, username FROM whitelist WHERE group_id = ?", (group_id,))
+        return WhitelistIndex(rows)
+
+    async def contains(self, group_id: int, user_id: int, username: Optional[str] = None) -> bool:
+        """
+        Проверка, есть ли пользователь в whitelist группы по ID или username.
+
+        Username сравнивается без учета регистра.
+        """
+        if self.cache is not None:
+            return (await self.get_index(group_id)).contains(user_id, username)
+        if await self.is_whitelisted(user_id, group_id):
+            return True
+        return bool(username) and await self.is_username_whitelisted(username, group_id)
+
+    async def is_whitelisted_anywhere(self, user_id: int, username: Optional[str] = None) -> bool:
+        """Проверка, есть ли пользователь в whitelist хотя бы одной группы (username без учета регистра)."""
+        query = "SELECT 1 FROM whitelist WHERE user_id = ? OR lower(username) = lower(?) LIMIT 1"
+        row = await self.fetchone(query, (user_id, username))
+        return row is not None
+
+    async def add_by_user_id(
+        self,
+        user_id: int,
+        group_id: int,
+        username: Optional[str] = None,
+        full_name: Optional[str] = None,
+        added_by: int = 0,
+    ) -> None:
+        """Добавляет пользователя в белый список по user_id (ФИО сохраняется в notes, added_by=0 - системой)."""
+        existing = await self.get(group_id, user_id)
         if existing:
-            await self.connection.execute(
-                """UPDATE whitelist SET username = $1, full_name = $2, updated_at = NOW()
-                   WHERE user_id = $3 AND group_id = $4""",
-                username, full_name, user_id, group_id
+            await self.execute(
+                """UPDATE whitelist SET username = ?, notes = COALESCE(?, notes), added_at = CURRENT_TIMESTAMP
+                   WHERE user_id = ? AND group_id = ?""",
+                (username, full_name, user_id, group_id)
             )
+            self._update_index(group_id, lambda index: index.discard(None, existing.username))
         else:
-            await self.connection.execute(
-                """INSERT INTO whitelist (user_id, group_id, username, full_name, created_at, updated_at)
-                   VALUES ($1, $2, $3, $4, NOW(), NOW())""",
-                user_id, group_id, username, full_name
+            await self.execute(
+                """INSERT INTO whitelist (group_id, user_id, added_by, added_at, notes, username, input_type)
+                   VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?, ?, 'id')""",
+                (group_id, user_id, added_by, full_name, username)
             )
+        self._update_index(group_id, lambda index: index.add(user_id, username))
 
-    async def add_by_username(self, username: str, group_id: int) -> None:
-        """Добавляет пользователя в белый список по username."""
-        existing = await self.get_by_username(username, group_id)
-        if existing:
+    async def add_by_username(self, username: str, group_id: int, added_by: int = 0) -> None:
+        """Добавляет пользователя в белый список по username (added_by=0 - системой)."""
+        if await self.is_username_whitelisted(username, group_id):
             return
 
-        await self.connection.execute(
-            """INSERT INTO whitelist (username, group_id, created_at, updated_at)
-               VALUES ($1, $2, NOW(), NOW())""",
-            username, group_id
+        await self.execute(
+            """INSERT INTO whitelist (group_id, user_id, added_by, added_at, username, input_type)
+               VALUES (?, NULL, ?, CURRENT_TIMESTAMP, ?, 'username')""",
+            (group_id, added_by, username)
         )
+        self._update_index(group_id, lambda index: index.add(None, username))
 
     async def remove_by_user_id(self, user_id: int, group_id: int) -> bool:
         """Удаляет пользователя из белого списка по user_id."""
-        result = await self.connection.execute(
-            "DELETE FROM whitelist WHERE user_id = $1 AND group_id = $2",
-            user_id, group_id
-        )
-        return result != "DELETE 0"
+        return await self.remove(user_id, group_id)
 
     async def add(self, entry: WhitelistEntry) -> None:
         """Добавление пользователя в whitelist."""
         if entry.user_id:
-            existing_query = "SELECT 1 FROM whitelist WHERE user_id = ? AND group_id = ?"
+            existing_query = "SELECT username FROM whitelist WHERE user_id = ? AND group_id = ?"
             existing = await self.fetchone(existing_query, (entry.user_id, entry.group_id))
 
             if existing:
                 update_query = """
                     UPDATE whitelist
-                    SET added_by = ?, notes = ?, username = ?, input_type = ?, added_at = datetime('now')
+                    SET added_by = ?, notes = ?, username = ?, input_type = ?, added_at = CURRENT_TIMESTAMP
                     WHERE user_id = ? AND group_id = ?
                 """
                 await self.execute(
@@ -67,10 +191,11 @@ class WhitelistRepository(BaseRepository):
                         entry.group_id,
                     ),
                 )
+                self._update_index(entry.group_id, lambda index: index.discard(None, existing["username"]))
             else:
                 insert_query = """
                     INSERT INTO whitelist (group_id, user_id, added_by, added_at, notes, username, input_type)
-                    VALUES (?, ?, ?, datetime('now'), ?, ?, ?)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?, ?, ?)
                 """
                 await self.execute(
                     insert_query,
@@ -83,14 +208,15 @@ class WhitelistRepository(BaseRepository):
                         entry.input_type,
                     ),
                 )
+            self._update_index(entry.group_id, lambda index: index.add(entry.user_id, entry.username))
         elif entry.username:
-            existing_query = "SELECT 1 FROM whitelist WHERE username = ? AND group_id = ?"
+            existing_query = "SELECT 1 FROM whitelist WHERE lower(username) = lower(?) AND group_id = ?"
             existing = await self.fetchone(existing_query, (entry.username, entry.group_id))
 
             if not existing:
                 insert_query = """
                     INSERT INTO whitelist (group_id, user_id, added_by, added_at, notes, username, input_type)
-                    VALUES (?, NULL, ?, datetime('now'), ?, ?, 'username')
+                    VALUES (?, NULL, ?, CURRENT_TIMESTAMP, ?, ?, 'username')
                 """
                 await self.execute(
                     insert_query,
@@ -101,14 +227,82 @@ class WhitelistRepository(BaseRepository):
                         entry.username,
                     ),
                 )
+                self._update_index(entry.group_id, lambda index: index.add(None, entry.username))
         else:
             raise ValueError("Необходимо указать user_id или username")
 
+    async def add_many(self, entries: Iterable[WhitelistEntry]) -> None:
+        """
+        Пакетное добавление в whitelist с той же семантикой, что и `add`.
+
+        Записи с user_id добавляются или обновляются, записи только
+        с username добавляются, если такого username в группе еще нет.
+        Весь пакет фиксируется одной транзакцией.
+        """
+        by_id = []
+        by_username = []
+        group_ids = set()
+        for entry in entries:
+            group_ids.add(entry.group_id)
+            if entry.user_id:
+                by_id.append((
+                    entry.group_id,
+                    entry.user_id,
+                    entry.added_by,
+                    entry.notes,
+                    entry.username,
+                    entry.input_type,
+                ))
+            elif entry.username:
+                by_username.append((
+                    entry.group_id,
+                    entry.added_by,
+                    entry.notes,
+                    entry.username,
+                    entry.group_id,
+                    entry.username,
+                ))
+            else:
+                raise ValueError("Необходимо указать user_id или username")
+
+        async with self.backend.transaction():
+            if by_id:
+                await self.executemany(
+                    """
+                    INSERT INTO whitelist (group_id, user_id, added_by, added_at, notes, username, input_type)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?, ?, ?)
+                    ON CONFLICT(user_id, group_id) WHERE user_id IS NOT NULL DO UPDATE SET
+                        added_by = excluded.added_by,
+                        notes = excluded.notes,
+                        username = excluded.username,
+                        input_type = excluded.input_type,
+                        added_at = CURRENT_TIMESTAMP
+                    """,
+                    by_id
+                )
+            if by_username:
+                await self.executemany(
+                    """
+                    INSERT INTO whitelist (group_id, user_id, added_by, added_at, notes, username, input_type)
+                    SELECT ?, NULL, ?, CURRENT_TIMESTAMP, ?, ?, 'username'
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM whitelist WHERE group_id = ? AND lower(username) = lower(?)
+                    )
+                    """,
+                    by_username
+                )
+        if self.cache is not None:
+            for group_id in group_ids:
+                self._invalidate(group_id)
+
     async def remove(self, user_id: int, group_id: int) -> bool:
         """Удаление пользователя из whitelist."""
-        query = "DELETE FROM whitelist WHERE user_id = ? AND group_id = ?"
-        cursor = await self.execute(query, (user_id, group_id))
-        return cursor.rowcount > 0
+        query = "DELETE FROM whitelist WHERE user_id = ? AND group_id = ? RETURNING username"
+        row = await self.execute_returning(query, (user_id, group_id))
+        if row is None:
+            return False
+        self._update_index(group_id, lambda index: index.discard(user_id, row["username"]))
+        return True
 
     async def is_whitelisted(self, user_id: int, group_id: int) -> bool:
         """Проверка, находится ли пользователь в whitelist."""
@@ -116,25 +310,39 @@ class WhitelistRepository(BaseRepository):
         row = await self.fetchone(query, (user_id, group_id))
         return row is not None
 
+    async def is_username_whitelisted(self, username: str, group_id: int) -> bool:
+        """Проверка, находится ли username в whitelist группы (без учета регистра)."""
+        query = "SELECT 1 FROM whitelist WHERE group_id = ? AND lower(username) = lower(?)"
+        row = await self.fetchone(query, (group_id, username))
+        return row is not None
+
     async def get(self, group_id: int, user_id: int) -> WhitelistEntry:
         """Получение записи whitelist по group_id и user_id."""
         query = "SELECT * FROM whitelist WHERE group_id = ? AND user_id = ?"
         row = await self.fetchone(query, (group_id, user_id))
-        return WhitelistEntry(**row) if row else None
+        return hydrate(WhitelistEntry, row)
 
     async def get_by_group(self, group_id: int) -> List[WhitelistEntry]:
         """Получение списка whitelist для группы."""
         query = "SELECT * FROM whitelist WHERE group_id = ?"
         rows = await self.fetchall(query, (group_id,))
-        return [WhitelistEntry(**row) for row in rows]
+        return hydrate_all(WhitelistEntry, rows)
+
+    async def remove_by_id(self, entry_id: int) -> bool:
+        """
+        Удаление записи whitelist по ID записи.
 
-    async def remove_by_id(self, entry_id: int) -> None:
-        """Удаление записи whitelist по ID записи."""
-        query = "DELETE FROM whitelist WHERE id = ?"
-        await self.execute(query, (entry_id,))
+        :return: True, если запись существовала.
+        """
+        query = "DELETE FROM whitelist WHERE id = ? RETURNING group_id, user_id, username"
+        row = await self.execute_returning(query, (entry_id,))
+        if row is None:
+            return False
+        self._update_index(row["group_id"], lambda index: index.discard(row["user_id"], row["username"]))
+        return True
 
     async def get_all(self) -> List[WhitelistEntry]:
         """Получение всех записей whitelist."""
         query = "SELECT * FROM whitelist"
         rows = await self.fetchall(query)
-        return [WhitelistEntry(**row) for row in rows]
+        return hydrate_all(WhitelistEntry, rows)
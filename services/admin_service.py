@@ -110,23 +110,22 @@ class AdminService:
         """
         Обновляет список администраторов для группы.
 
-        - Удаляет старых администраторов.
-        - Добавляет новых администраторов.
+        Старый список заменяется новым одной транзакцией, поэтому
+        проверки прав не видят группу без администраторов.
 
         :param group_id: ID группы.
         :param chat_admins: Список администраторов из Telegram API.
         """
-        await self.db.admins.remove_all_for_group(group_id)
-
-        for admin_member in chat_admins:
-            if not admin_member.user.is_bot or admin_member.user.id == 1087968824:
-                admin = Admin(
-                    user_id=admin_member.user.id,
-                    group_id=group_id,
-                    role=admin_member.status
-                )
-                await self.db.admins.add(admin)
-
+        admins = [
+            Admin(
+                user_id=admin_member.user.id,
+                group_id=group_id,
+                role=admin_member.status
+            )
+            for admin_member in chat_admins
+            if not admin_member.user.is_bot or admin_member.user.id == 1087968824
+        ]
+        await self.db.admins.replace_for_group(group_id, admins)
 
     async def is_admin(self, user_id: int, group_id: int) -> bool:
         """
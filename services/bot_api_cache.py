@@ -0,0 +1,99 @@
+"""Кэширующий прокси для запросов к Bot API только на чтение."""
+
+from typing import Dict, List, Tuple, Union
+
+from aiogram import Bot
+from aiogram.types import ChatFullInfo, ChatMember, User
+
+from bot.utils.cache import LRUCache
+
+ChatId = Union[int, str]
+
+
+class BotApiCache:
+    """
+    Обертка над `Bot` с кэшем для идемпотентных запросов.
+
+    `get_me`, `get_chat`, `get_chat_member` и `get_chat_administrators`
+    кэшируются с отдельным TTL для каждого метода, одновременные одинаковые
+    запросы выполняют один HTTP-запрос. Ошибки Telegram не кэшируются.
+    Остальные методы и атрибуты берутся у исходного бота, поэтому прокси
+    можно передавать туда, где ожидается `Bot`.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        me_ttl: float = 3600,
+        chat_ttl: float = 300,
+        member_ttl: float = 60,
+        admins_ttl: float = 300,
+        maxsize: int = 10_000,
+    ):
+        """
+        Инициализация прокси.
+
+        :param bot: Экземпляр бота.
+        :param me_ttl: Время жизни ответа get_me в секундах.
+        :param chat_ttl: Время жизни ответа get_chat в секундах.
+        :param member_ttl: Время жизни ответа get_chat_member в секундах.
+        :param admins_ttl: Время жизни ответа get_chat_administrators в секундах.
+        :param maxsize: Максимальное количество записей в кэше каждого метода.
+        """
+        self.bot = bot
+        self._caches: Dict[str, LRUCache] = {
+            "get_me": LRUCache(1, me_ttl),
+            "get_chat": LRUCache(maxsize, chat_ttl),
+            "get_chat_member": LRUCache(maxsize, member_ttl),
+            "get_chat_administrators": LRUCache(maxsize, admins_ttl),
+        }
+
+    def __getattr__(self, name: str):
+        return getattr(self.bot, name)
+
+    async def __call__(self, method, request_timeout=None):
+        return await self.bot(method, request_timeout=request_timeout)
+
+    async def get_me(self) -> User:
+        """Информация о боте."""
+        return await self._caches["get_me"].get_or_load("me", self.bot.get_me)
+
+    async def get_chat(self, chat_id: ChatId) -> ChatFullInfo:
+        """Информация о чате."""
+        return await self._caches["get_chat"].get_or_load(chat_id, lambda: self.bot.get_chat(chat_id))
+
+    async def get_chat_member(self, chat_id: ChatId, user_id: int) -> ChatMember:
+        """Статус участника чата."""
+        return await self._caches["get_chat_member"].get_or_load(
+            (chat_id, user_id), lambda: self.bot.get_chat_member(chat_id, user_id)
+        )
+
+    async def get_chat_administrators(self, chat_id: ChatId) -> List[ChatMember]:
+        """Администраторы чата."""
+        return await self._caches["get_chat_administrators"].get_or_load(
+            chat_id, lambda: self.bot.get_chat_administrators(chat_id)
+        )
+
+    def invalidate_member(self, chat_id: ChatId, user_id: int) -> None:
+        """Сброс кэша после изменения статуса участника (в том числе списка администраторов)."""
+        self._caches["get_chat_member"].invalidate((chat_id, user_id))
+        self._caches["get_chat_administrators"].invalidate(chat_id)
+
+    def invalidate_chat(self, chat_id: ChatId) -> None:
+        """Сброс кэша информации о чате и его администраторах."""
+        self._caches["get_chat"].invalidate(chat_id)
+        self._caches["get_chat_administrators"].invalidate(chat_id)
+
+    def stats(self) -> Dict[str, Tuple[int, int]]:
+        """Количество попаданий и промахов кэша по методам: {метод: (hits, misses)}."""
+        return {name: (cache.hits, cache.misses) for name, cache in self._caches.items()}
+
+    @property
+    def hits(self) -> int:
+        """Общее количество попаданий в кэш."""
+        return sum(cache.hits for cache in self._caches.values())
+
+    @property
+    def misses(self) -> int:
+        """Общее количество промахов кэша."""
+        return sum(cache.misses for cache in self._caches.values())
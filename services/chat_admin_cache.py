@@ -0,0 +1,137 @@
+"""Кэш администраторов групп вместо запроса get_chat_member на каждое сообщение."""
+
+import asyncio
+import time
+from typing import Dict
+
+from aiogram import Bot
+from loguru import logger
+
+from bot.database.manager import DatabaseManager
+from bot.database.models.admin import Admin
+from bot.services.admin_service import AdminService
+
+ADMIN_STATUSES = ("administrator", "creator")
+
+
+class ChatAdminCache:
+    """
+    Проверка прав администратора группы по набору ID администраторов.
+
+    Набор хранится в таблице admins и кэшируется в `AdminRepository`,
+    поэтому проверка - это поиск в множестве. Актуальность поддерживают
+    события chat_member (назначение и снятие администраторов) и
+    периодическая сверка с `get_chat_administrators`. Если для группы
+    администраторов в базе нет, список запрашивается у Telegram один раз.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, retry_seconds: float = 300):
+        """
+        Инициализация кэша.
+
+        :param db_manager: Менеджер базы данных.
+        :param retry_seconds: Пауза перед повторным запросом к Telegram после неудачи.
+        """
+        self.db = db_manager
+        self.retry_seconds = retry_seconds
+        self._refreshing: Dict[int, asyncio.Task] = {}
+        self._last_attempt: Dict[int, float] = {}
+
+    async def is_admin(self, bot: Bot, chat_id: int, user_id: int) -> bool:
+        """
+        Является ли пользователь администратором группы.
+
+        :param bot: Экземпляр бота (для первичной загрузки списка).
+        :param chat_id: ID группы.
+        :param user_id: ID пользователя.
+        """
+        admin_ids = await self.db.admins.get_admin_ids(chat_id)
+        if not admin_ids:
+            if chat_id in self._refreshing or self._may_refresh(chat_id):
+                await self.refresh(bot, chat_id)
+            # Список мог обновиться, пока читался пустой набор
+            admin_ids = await self.db.admins.get_admin_ids(chat_id)
+        return user_id in admin_ids
+
+    def _may_refresh(self, chat_id: int) -> bool:
+        """Можно ли запросить список у Telegram (не чаще retry_seconds для группы)."""
+        last = self._last_attempt.get(chat_id)
+        return last is None or time.monotonic() - last >= self.retry_seconds
+
+    async def refresh(self, bot: Bot, chat_id: int) -> bool:
+        """
+        Загрузка администраторов группы из Telegram в базу и кэш.
+
+        Конкурентные вызовы для одной группы выполняют один запрос.
+
+        :return: True, если список обновлен.
+        """
+        task = self._refreshing.get(chat_id)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(bot, chat_id))
+            self._refreshing[chat_id] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(chat_id, None))
+        return await asyncio.shield(task)
+
+    async def _refresh(self, bot: Bot, chat_id: int) -> bool:
+        """Запрос get_chat_administrators и замена списка в базе."""
+        self._last_attempt[chat_id] = time.monotonic()
+        try:
+            chat_admins = await bot.get_chat_administrators(chat_id)
+        except Exception as e:
+            logger.warning(f"⚠️ Не удалось получить администраторов группы {chat_id}: {e}")
+            return False
+        await AdminService(self.db).update_group_admins(chat_id, chat_admins)
+        logger.debug(f"🔄 Обновлен список администраторов группы {chat_id}: {len(chat_admins)}")
+        return True
+
+    async def on_status_changed(
+        self, bot: Bot, chat_id: int, user_id: int, old_status: str, new_status: str
+    ) -> None:
+        """
+        Учет назначения или снятия администратора из события chat_member.
+
+        Изменение применяется к базе без запроса к Telegram: событие уже
+        содержит новый статус, а расхождения исправляет `run_resync`. Список
+        запрашивается, только если администраторов группы в базе еще не было
+        (иначе назначенный стал бы единственным известным администратором).
+        """
+        was_admin = old_status in ADMIN_STATUSES
+        is_admin = new_status in ADMIN_STATUSES
+        if was_admin == is_admin:
+            return
+
+        if is_admin:
+            known = await self.db.admins.get_admin_ids(chat_id)
+            await self.db.admins.add(Admin(user_id=user_id, group_id=chat_id, role=new_status))
+            if not known and self._may_refresh(chat_id):
+                await self.refresh(bot, chat_id)
+        else:
+            await self.db.admins.remove(user_id, chat_id)
+
+    async def run_resync(self, bot: Bot, interval_seconds: int, pause_seconds: float = 1.0) -> None:
+        """
+        Периодическая сверка администраторов всех активных групп.
+
+        Первая сверка выполняется сразу: события, пропущенные во время
+        остановки бота, не доходят. Между группами делается пауза, чтобы
+        не упираться в ограничения Bot API.
+
+        :param bot: Экземпляр бота.
+        :param interval_seconds: Интервал между сверками (0 - только первая сверка).
+        :param pause_seconds: Пауза между запросами для разных групп.
+        """
+        while True:
+            try:
+                groups = await self.db.groups.get_active()
+                refreshed = 0
+                for group in groups:
+                    if await self.refresh(bot, group.group_id):
+                        refreshed += 1
+                    await asyncio.sleep(pause_seconds)
+                logger.info(f"Сверка администраторов: обновлено групп {refreshed} из {len(groups)}")
+            except Exception as e:
+                logger.error(f"❌ Ошибка сверки администраторов групп: {e}")
+            if interval_seconds <= 0:
+                return
+            await asyncio.sleep(interval_seconds)
@@ -72,23 +72,16 @@ class GroupMonitorService:
         """
         unverified_users = []
         try:
-            import aiosqlite
-            async with aiosqlite.connect(self.db_manager.db_path) as db:
-                async with db.execute("""
-                    SELECT user_id FROM users
-                    WHERE verified = 0
-                    AND created_at <= datetime('now', ?)
-                """, (f'-{timeout_hours} hours',)) as cursor:
-                    async for row in cursor:
-                        user_id = row[0]
-                        try:
-                            member = await self.bot.get_chat_member(
-                                self.settings.telegram_group_id, user_id
-                            )
-                            if member.status not in ['left', 'kicked']:
-                                unverified_users.append(user_id)
-                        except (TelegramBadRequest, TelegramForbiddenError):
-                            await self.db_manager.users.update_user_state(user_id, "left_group")
+            candidates = await self.db_manager.users.get_unverified_older_than(timeout_hours)
+            for user_id in candidates:
+                try:
+                    member = await self.bot.get_chat_member(
+                        self.settings.telegram_group_id, user_id
+                    )
+                    if member.status not in ['left', 'kicked']:
+                        unverified_users.append(user_id)
+                except (TelegramBadRequest, TelegramForbiddenError):
+                    await self.db_manager.users.update_user_state("left_group", user_id)
 
         except Exception as e:
             logger.error(f"Ошибка при получении списка не верифицированных пользователей: {e}")
@@ -106,7 +99,7 @@ class GroupMonitorService:
             logger.info(
                 f"Пользователь {user_id} удален из группы {group_id} за неактивность."
             )
-            await self.db_manager.users.update_user_state(user_id, "removed_timeout")
+            await self.db_manager.users.update_user_state("removed_timeout", user_id)
 
             try:
                 await self.bot.send_message(
@@ -118,6 +111,6 @@ class GroupMonitorService:
 
         except (TelegramBadRequest, TelegramForbiddenError) as e:
             logger.warning(f"Не удалось удалить пользователя {user_id}: {e}")
-            await self.db_manager.users.update_user_state(user_id, "removal_failed")
+            await self.db_manager.users.update_user_state("removal_failed", user_id)
         except Exception as e:
             logger.error(f"Ошибка при удалении пользователя {user_id}: {e}")
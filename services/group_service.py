@@ -16,7 +16,7 @@ class GroupService:
         Инициализация сервиса.
 
         :param db_manager: Менеджер базы данных.
-        :param bot: Экземпляр бота.
+        :param bot: Экземпляр бота (или кэширующий прокси `BotApiCache`).
         """
         self.db = db_manager
         self.bot = bot
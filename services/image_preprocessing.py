@@ -0,0 +1,111 @@
+"""Подготовка изображений документов перед отправкой в OpenAI."""
+
+import io
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Форматы, которые модель принимает как есть (без анимации)
+_SUPPORTED_MIME_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
+OUTPUT_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+_EXIF_ORIENTATION = 0x0112
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    """Изображение для запроса к модели и размеры до и после обработки."""
+
+    data: bytes
+    mime_type: str
+    original_size: int
+    original_mime_type: Optional[str]
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+def flatten_image(image: Image.Image, grayscale: bool) -> Image.Image:
+    """Перевод в RGB или оттенки серого, прозрачный фон заменяется белым."""
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGBA", rgba.size, (255, 255, 255, 255))
+        image = Image.alpha_composite(background, rgba)
+    return image.convert("L" if grayscale else "RGB")
+
+
+def encode_image(image: Image.Image, output_format: str = "JPEG", quality: int = 85) -> bytes:
+    """Сжатие изображения в RGB или оттенках серого в JPEG или WebP."""
+    output = io.BytesIO()
+    if output_format == "WEBP":
+        image.save(output, "WEBP", quality=quality, method=4)
+    else:
+        image.save(output, "JPEG", quality=quality, optimize=True, progressive=True)
+    return output.getvalue()
+
+
+def prepare_image(
+    data: bytes,
+    declared_mime_type: Optional[str] = None,
+    max_edge: int = 1600,
+    grayscale: bool = False,
+    output_format: str = "JPEG",
+    quality: int = 85,
+) -> PreparedImage:
+    """
+    Подготовка фотографии документа: поворот по EXIF, уменьшение и сжатие.
+
+    Формат определяется по содержимому, а не по заявленному MIME-типу.
+    Изображение поворачивается по тегу EXIF Orientation, уменьшается так,
+    чтобы большая сторона не превышала `max_edge`, и кодируется в JPEG или
+    WebP. Если изображение не пришлось поворачивать или уменьшать и
+    результат не меньше исходного, отправляется исходный файл. Данные,
+    которые Pillow не распознает (например, PDF), возвращаются без изменений.
+
+    Функция синхронная и нагружает процессор - вызывать через asyncio.to_thread.
+
+    :param data: Содержимое файла.
+    :param declared_mime_type: MIME-тип из Telegram, используется для нераспознанных данных.
+    :param max_edge: Максимальный размер большей стороны в пикселях.
+    :param grayscale: Перевести в оттенки серого.
+    :param output_format: Формат результата: JPEG или WEBP.
+    :param quality: Качество сжатия (1-100).
+    :return: Подготовленное изображение.
+    """
+    try:
+        image = Image.open(io.BytesIO(data))
+    except (UnidentifiedImageError, OSError):
+        return PreparedImage(data, declared_mime_type or "application/octet-stream", len(data), None)
+
+    with image:
+        original_mime_type = Image.MIME.get(image.format)
+        original_width, original_height = image.size
+        animated = getattr(image, "is_animated", False)
+        rotated = image.getexif().get(_EXIF_ORIENTATION, 1) != 1
+        if image.format == "JPEG":
+            # Декодирование JPEG сразу в уменьшенном масштабе (1/2, 1/4, 1/8) быстрее полного
+            image.draft(image.mode, (max_edge, max_edge))
+
+        result = ImageOps.exif_transpose(image)
+        result.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+        resized = max(result.size) < max(original_width, original_height)
+        result = flatten_image(result, grayscale)
+
+    encoded = encode_image(result, output_format, quality)
+
+    keep_original = (
+        not (rotated or resized or grayscale)
+        and original_mime_type in _SUPPORTED_MIME_TYPES
+        and len(encoded) >= len(data)
+        and not animated
+    )
+    if keep_original:
+        return PreparedImage(
+            data, original_mime_type, len(data), original_mime_type, original_width, original_height
+        )
+    return PreparedImage(
+        encoded, OUTPUT_MIME_TYPES[output_format], len(data), original_mime_type, *result.size
+    )
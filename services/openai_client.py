@@ -0,0 +1,48 @@
+"""Общий для процесса клиент OpenAI с пулом соединений."""
+
+import httpx
+from loguru import logger
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, Timeout
+
+from config.settings import Settings
+
+
+def create_openai_client(settings: Settings) -> AsyncOpenAI:
+    """
+    Клиент OpenAI с настраиваемым пулом keep-alive соединений и таймаутами.
+
+    Клиент создается один раз при запуске и передается всем сервисам:
+    запросы переиспользуют открытые TLS-соединения вместо нового рукопожатия.
+
+    :param settings: Настройки приложения.
+    :return: Клиент, который нужно закрыть через `close()` при остановке.
+    """
+    timeout = Timeout(settings.openai_timeout_seconds, connect=settings.openai_connect_timeout_seconds)
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry_seconds,
+        ),
+        timeout=timeout,
+    )
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        timeout=timeout,
+        max_retries=settings.openai_max_retries,
+        http_client=http_client,
+    )
+
+
+async def warm_up_openai_client(client: AsyncOpenAI) -> None:
+    """
+    Прогрев соединения при запуске: легкий запрос списка моделей.
+
+    Открывает TLS-соединение в пуле до первой верификации и заодно проверяет
+    ключ API. Ошибка только записывается в лог.
+    """
+    try:
+        await client.with_options(max_retries=0).models.list()
+        logger.info("🔥 Соединение с OpenAI установлено")
+    except Exception as e:
+        logger.warning(f"⚠️ Не удалось прогреть соединение с OpenAI: {e}")
@@ -0,0 +1,196 @@
+"""Ограничение частоты запросов и расхода токенов OpenAI по моделям."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from config.settings import settings
+
+_WINDOW_SECONDS = 60.0
+
+
+class RateLimitReservation:
+    """Место в минутном окне, занятое запросом."""
+
+    def __init__(self, limiter: "_ModelLimiter", entry: List[float]):
+        self._limiter = limiter
+        self._entry = entry
+
+    def commit(self, tokens: Optional[int]) -> None:
+        """
+        Замена оценки токенов фактическим расходом из ответа модели.
+
+        :param tokens: usage.total_tokens ответа (None - оценка остается).
+        """
+        if tokens is not None:
+            self._limiter.adjust(self._entry, tokens)
+
+
+class _ModelLimiter:
+    """
+    Скользящее минутное окно для одной модели.
+
+    Запросы ждут в порядке поступления: следующий отправляется, когда
+    в окне хватает и запросов, и токенов. Запрос больше лимита токенов
+    целиком ждет пустого окна.
+    """
+
+    def __init__(self, model: str, rpm: int, tpm: int):
+        self.model = model
+        self.rpm = rpm
+        self.tpm = tpm
+        self.avg_tokens: Optional[float] = None
+        self._window: Deque[List[float]] = deque()  # [время отправки, токены]
+        self._used = 0
+        self._waiters: Deque[asyncio.Event] = deque()
+
+    def _expire(self, now: float) -> None:
+        while self._window and self._window[0][0] <= now - _WINDOW_SECONDS:
+            _, tokens = self._window.popleft()
+            self._used -= tokens
+
+    def _delay(self, tokens: int, now: float) -> float:
+        """Через сколько секунд в окне освободится место для запроса."""
+        self._expire(now)
+        delay = 0.0
+        if self.rpm > 0 and len(self._window) >= self.rpm:
+            delay = self._window[len(self._window) - self.rpm][0] + _WINDOW_SECONDS - now
+        if self.tpm > 0:
+            excess = self._used + min(tokens, self.tpm) - self.tpm
+            for sent_at, used in self._window:
+                if excess <= 0:
+                    break
+                excess -= used
+                delay = max(delay, sent_at + _WINDOW_SECONDS - now)
+        return delay
+
+    def _wake_next(self) -> None:
+        if self._waiters:
+            self._waiters[0].set()
+
+    def adjust(self, entry: List[float], tokens: int) -> None:
+        """Фактический расход токенов запроса и обновление средней оценки."""
+        self.avg_tokens = tokens if self.avg_tokens is None else 0.8 * self.avg_tokens + 0.2 * tokens
+        if any(sent is entry for sent in self._window):
+            self._used += tokens - entry[1]
+        entry[1] = tokens
+        self._wake_next()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def interval(self, tokens: int) -> float:
+        """Минимальный интервал между запросами такого размера при полной загрузке."""
+        interval = 0.0
+        if self.rpm > 0:
+            interval = _WINDOW_SECONDS / self.rpm
+        if self.tpm > 0:
+            interval = max(interval, _WINDOW_SECONDS * min(tokens, self.tpm) / self.tpm)
+        return interval
+
+    async def acquire(self, tokens: int) -> RateLimitReservation:
+        event = asyncio.Event()
+        self._waiters.append(event)
+        waited = False
+        try:
+            while True:
+                if self._waiters[0] is event:
+                    now = time.monotonic()
+                    delay = self._delay(tokens, now)
+                    if delay <= 0:
+                        break
+                    try:
+                        await asyncio.wait_for(event.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await event.wait()
+                waited = True
+                event.clear()
+        except BaseException:
+            is_head = self._waiters[0] is event
+            self._waiters.remove(event)
+            if is_head:
+                self._wake_next()
+            raise
+
+        self._waiters.popleft()
+        entry = [now, tokens]
+        self._window.append(entry)
+        self._used += tokens
+        self._wake_next()
+        if waited:
+            logger.debug(f"⏱️ Запрос к {self.model} отправлен после ожидания лимита, в очереди {self.waiting}")
+        return RateLimitReservation(self, entry)
+
+
+class OpenAIRateLimiter:
+    """
+    Лимиты запросов (RPM) и токенов (TPM) в минуту для каждой модели.
+
+    Перед запросом вызывается `acquire` с оценкой токенов (вход и ответ);
+    если лимит модели исчерпан, вызов ждет своей очереди. После ответа
+    оценка заменяется фактическим расходом через `commit`. Лимит считается
+    в пределах процесса: несколько процессов с одним ключом делят лимит
+    организации, для них значения нужно уменьшать.
+    """
+
+    def __init__(self, default_limits: Tuple[int, int], model_limits: Optional[Dict[str, Tuple[int, int]]] = None):
+        """
+        Инициализация ограничителя.
+
+        :param default_limits: (RPM, TPM) для моделей без отдельных лимитов, 0 - без ограничения.
+        :param model_limits: (RPM, TPM) по названию модели.
+        """
+        self.default_limits = default_limits
+        self.model_limits = model_limits or {}
+        self._models: Dict[str, _ModelLimiter] = {}
+
+    def _limiter(self, model: str) -> _ModelLimiter:
+        limiter = self._models.get(model)
+        if limiter is None:
+            rpm, tpm = self.model_limits.get(model, self.default_limits)
+            limiter = self._models[model] = _ModelLimiter(model, rpm, tpm)
+        return limiter
+
+    async def acquire(self, model: str, tokens: int) -> RateLimitReservation:
+        """
+        Ожидание места в лимитах модели.
+
+        :param model: Название модели.
+        :param tokens: Оценка токенов запроса (вход и ответ).
+        :return: Резервация для уточнения расхода после ответа.
+        """
+        return await self._limiter(model).acquire(tokens)
+
+    def waiting(self, model: str) -> int:
+        """Количество запросов, ожидающих лимита модели."""
+        return self._limiter(model).waiting
+
+    def request_interval(self, model: str, default_tokens: int) -> float:
+        """
+        Средний интервал между запросами к модели при упоре в лимиты, в секундах.
+
+        :param default_tokens: Размер запроса, пока нет фактических данных о расходе.
+        """
+        limiter = self._limiter(model)
+        tokens = default_tokens if limiter.avg_tokens is None else int(limiter.avg_tokens)
+        return limiter.interval(tokens)
+
+
+_rate_limiter: Optional[OpenAIRateLimiter] = None
+
+
+def get_openai_rate_limiter() -> OpenAIRateLimiter:
+    """Общий для процесса ограничитель с лимитами из настроек."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = OpenAIRateLimiter(
+            (settings.openai_rpm_limit, settings.openai_tpm_limit),
+            settings.openai_model_rate_limits,
+        )
+    return _rate_limiter
@@ -1,19 +1,83 @@
 """Сервис интеграции с OpenAI для верификации врачей."""
+import asyncio
 import base64
 import json
-from typing import Optional, Tuple, Dict, Any
+import time
+from typing import Optional, Tuple, Dict, Any, List
+from aiogram import Bot
 from openai import AsyncOpenAI
 from loguru import logger
 
+from bot.services.image_preprocessing import PreparedImage, prepare_image
+from bot.services.openai_rate_limiter import get_openai_rate_limiter
+from bot.services.pdf_processing import (
+    PdfRasterizer, compact_text, contains_full_name, extract_pdf_text, find_medical_keywords, is_pdf
+)
+from bot.services.telegram_file_cache import get_telegram_file_cache
 from config.settings import settings
 
+# Оценка токенов до отправки (с запасом, фактический расход уточняется по ответу)
+_CHARS_PER_TOKEN = 3  # для кириллицы токенов больше, чем для латиницы
+_IMAGE_TOKENS = 1105  # изображение в detail=auto: не больше 85 + 170 * 6 фрагментов
+_WEB_SEARCH_TOKENS = 4000  # найденные страницы добавляются во вход модели
+_OUTPUT_TOKENS = 500
+_DEFAULT_REQUEST_TOKENS = 4000  # размер запроса для оценки ожидания, пока нет фактических данных
+
+_CONFIDENCE_RANK = {"high": 2, "medium": 1}
+
 
 class OpenAIService:
     """Сервис для взаимодействия с OpenAI API."""
 
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        """
+        Инициализация сервиса.
+
+        Args:
+            client: Общий клиент OpenAI (см. create_openai_client); без него создается отдельный
+        """
+        self.client = client if client is not None else AsyncOpenAI(api_key=settings.openai_api_key)
         self.model = settings.openai_model
+        self.rate_limiter = get_openai_rate_limiter()
+
+    @staticmethod
+    def _estimate_tokens(request: Dict[str, Any]) -> int:
+        """Оценка токенов запроса до отправки: текст, изображения, веб-поиск и ответ."""
+        chars = 0
+        tokens = _OUTPUT_TOKENS
+        stack = [request.get("text"), request.get("input")]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, dict):
+                if value.get("type") == "input_image":
+                    tokens += _IMAGE_TOKENS
+                else:
+                    stack.extend(value.values())
+            elif isinstance(value, list):
+                stack.extend(value)
+            elif isinstance(value, str):
+                chars += len(value)
+        if any(tool["type"].startswith("web_search") for tool in request.get("tools", [])):
+            tokens += _WEB_SEARCH_TOKENS
+        return tokens + chars // _CHARS_PER_TOKEN
+
+    async def _create_response(self, request: Dict[str, Any]):
+        """
+        Запрос к Responses API в пределах лимитов модели.
+
+        Если лимиты запросов или токенов в минуту исчерпаны, запрос ждет
+        своей очереди в ограничителе, после ответа оценка токенов
+        заменяется фактическим расходом.
+        """
+        reservation = await self.rate_limiter.acquire(request["model"], self._estimate_tokens(request))
+        response = await self.client.responses.create(**request)
+        usage = getattr(response, "usage", None)
+        reservation.commit(usage.total_tokens if usage is not None else None)
+        return response
+
+    def request_interval(self) -> float:
+        """Средний интервал между запросами к модели при упоре в лимиты, в секундах."""
+        return self.rate_limiter.request_interval(self.model, _DEFAULT_REQUEST_TOKENS)
 
     async def verify_website(self, full_name: str, workplace: str, website_url: str) -> Dict[str, Any]:
         """
@@ -36,7 +100,7 @@ class OpenAIService:
 
             logger.info(f"Проверка через web search: {full_name} в {workplace} на {website_url}")
 
-            response = await self.client.responses.create(
+            response = await self._create_response(dict(
                 model=self.model,
                 tools=[{"type": "web_search_preview"}],
                 text={
@@ -97,7 +161,7 @@ class OpenAIService:
                         "content": prompt
                     }
                 ]
-            )
+            ))
 
             result = json.loads(response.output_text)
 
@@ -121,7 +185,8 @@ class OpenAIService:
                 "confidence": "low",
                 "explanation": f"Ошибка при проверке: {str(e)}",
                 "sources": [],
-                "found_name": ""
+                "found_name": "",
+                "error": True
             }
 
     async def verify_document(self, full_name: str, workplace: str, file_id: str) -> Dict[str, Any]:
@@ -137,16 +202,8 @@ class OpenAIService:
             Словарь с результатами верификации
         """
         try:
-            from aiogram import Bot
-            from config.settings import settings
-
-            bot = Bot(token=settings.get_telegram_bot_token())
-            file = await bot.get_file(file_id)
-            file_data = await bot.download_file(file.file_path)
-
-            await bot.session.close()
-
-            return await self.verify_diploma_document(full_name, file_data.read(), "image/jpeg", workplace)
+            content = await self.download_document(file_id)
+            return await self.verify_diploma_document(full_name, content, "image/jpeg", workplace)
 
         except Exception as e:
             logger.error(f"Ошибка при получении файла {file_id}: {e}")
@@ -161,25 +218,314 @@ class OpenAIService:
                 "issuing_organization": ""
             }
 
+    async def download_document(
+        self, file_id: str, file_unique_id: Optional[str] = None, bot: Optional[Bot] = None
+    ) -> bytes:
+        """
+        Загрузка файла документа из Telegram через дисковый кэш файлов.
+
+        Args:
+            file_id: ID файла документа
+            file_unique_id: Постоянный ID файла (ключ кэша)
+            bot: Бот для загрузки; если не передан, создается временный
+
+        Returns:
+            Содержимое файла
+        """
+        file_cache = get_telegram_file_cache()
+        if bot is not None:
+            return await file_cache.read(bot, file_id, file_unique_id)
+
+        bot = Bot(token=settings.get_telegram_bot_token())
+        try:
+            return await file_cache.read(bot, file_id, file_unique_id)
+        finally:
+            await bot.session.close()
+
+    async def _prepare_image(self, image_data: bytes, file_type: str) -> PreparedImage:
+        """
+        Подготовка изображения документа в отдельном потоке (см. prepare_image).
+
+        Args:
+            image_data: Данные файла
+            file_type: MIME тип из Telegram (для данных, которые не удалось распознать)
+
+        Returns:
+            Изображение для запроса и размеры до и после обработки
+        """
+        if not settings.document_image_preprocessing:
+            return PreparedImage(image_data, file_type, len(image_data), file_type)
+
+        started = time.perf_counter()
+        image = await asyncio.to_thread(
+            prepare_image,
+            image_data,
+            file_type,
+            settings.document_image_max_edge,
+            settings.document_image_grayscale,
+            settings.document_image_format,
+            settings.document_image_quality,
+        )
+        logger.info(
+            f"🖼️ Подготовка документа: {image.original_mime_type or file_type} {image.original_size} байт → "
+            f"{image.mime_type} {image.size} байт ({image.width}x{image.height}) "
+            f"за {(time.perf_counter() - started) * 1000:.0f} мс"
+        )
+        return image
+
     async def verify_diploma_document(self, full_name: str, image_data: bytes, file_type: str, workplace: str = "") -> Dict[str, Any]:
         """
         Проверить, содержит ли документ диплома указанное имя врача.
 
+        PDF проверяется по изображениям первых страниц, текстовый слой
+        локально выбирает страницу для проверки в первую очередь
+        (см. _verify_pdf_document).
+
         Args:
             full_name: Полное имя врача для проверки
-            image_data: Данные файла изображения
-            file_type: MIME тип файла
+            image_data: Данные файла изображения или PDF
+            file_type: Заявленный MIME тип файла (формат определяется по содержимому)
             workplace: Место работы врача (необязательно)
 
         Returns:
             Словарь с результатами анализа документа
         """
         try:
-            base64_image = base64.b64encode(image_data).decode('utf-8')
+            if is_pdf(image_data):
+                return await self._verify_pdf_document(full_name, image_data, workplace)
+            image = await self._prepare_image(image_data, file_type)
+        except Exception as e:
+            logger.error(f"Ошибка при анализе документа: {e}")
+            return self.document_error(e)
+
+        source = f"{image.original_mime_type or file_type} → {image.mime_type}, {image.original_size} → {image.size} bytes"
+        return await self._analyze_document(full_name, workplace, source, image=image)
+
+    @staticmethod
+    def _is_confident(result: Dict[str, Any]) -> bool:
+        """Достаточно ли результата одной страницы: ФИО найдено уверенно в медицинском документе."""
+        return bool(
+            result.get("found")
+            and result.get("confidence") in _CONFIDENCE_RANK
+            and result.get("is_medical_document")
+        )
+
+    @staticmethod
+    def _best_result(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Лучший из результатов по страницам, если уверенного нет."""
+        return max(results, key=lambda result: (
+            not result.get("error"),
+            bool(result.get("found")),
+            bool(result.get("is_medical_document")),
+            _CONFIDENCE_RANK.get(result.get("confidence"), 0),
+        ))
+
+    async def _verify_pdf_document(self, full_name: str, data: bytes, workplace: str) -> Dict[str, Any]:
+        """
+        Проверка PDF по изображениям страниц; текстовый слой выбирает первую страницу.
 
-            logger.info(f"Анализ документа для врача {full_name}")
+        Текст первых страниц проверяется локально, без запросов к модели:
+        первой анализируется страница с точным совпадением ФИО, а без нее -
+        с медицинскими терминами. Решение принимается только по изображениям,
+        потому что печати и подписи в тексте не видны. Если PDF не удалось
+        растеризовать, к модели по очереди отправляется сжатый текст тех же
+        страниц. Проверка останавливается на первой странице с уверенным
+        результатом.
 
-            response = await self.client.responses.create(
+        Args:
+            full_name: Полное имя врача для проверки
+            data: Содержимое PDF
+            workplace: Место работы врача
+
+        Returns:
+            Словарь с результатами анализа документа
+        """
+        pages = await asyncio.to_thread(extract_pdf_text, data, settings.pdf_max_pages)
+        candidates = []
+        for index, text in enumerate(pages):
+            has_name = contains_full_name(text, full_name)
+            if has_name or find_medical_keywords(text):
+                candidates.append((not has_name, index, text))
+        candidates.sort(key=lambda candidate: candidate[:2])
+        first_page = candidates[0][1] if candidates else None
+
+        results: List[Dict[str, Any]] = []
+        try:
+            result = await self._verify_pdf_pages(full_name, data, workplace, results, first_page)
+        except Exception as e:
+            if not candidates:
+                raise
+            logger.warning(f"⚠️ Не удалось растеризовать PDF, документ проверяется по тексту: {e}")
+            result = await self._verify_pdf_text(full_name, workplace, candidates, results)
+        if result is not None:
+            return result
+        if not results:
+            return {
+                "found": False,
+                "confidence": "low",
+                "explanation": "В PDF не найдено страниц для анализа",
+                "document_type": "unknown",
+                "found_name": "",
+                "is_medical_document": False,
+                "medical_indicators": [],
+                "issuing_organization": ""
+            }
+        return self._best_result(results)
+
+    async def _verify_pdf_text(
+        self,
+        full_name: str,
+        workplace: str,
+        candidates: List[Tuple[bool, int, str]],
+        results: List[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Последовательный анализ текста страниц PDF (если изображения недоступны).
+
+        Args:
+            full_name: Полное имя врача для проверки
+            workplace: Место работы врача
+            candidates: Страницы для анализа по порядку: (без ФИО, номер, текст)
+            results: Список, в который добавляются неуверенные результаты
+
+        Returns:
+            Уверенный результат или None
+        """
+        for _, index, text in candidates:
+            text = compact_text(text, settings.pdf_text_max_chars)
+            source = f"PDF, страница {index + 1}, текст {len(text)} символов"
+            result = await self._analyze_document(full_name, workplace, source, text=text)
+            if self._is_confident(result):
+                return result
+            results.append(result)
+        return None
+
+    async def _verify_pdf_pages(
+        self,
+        full_name: str,
+        data: bytes,
+        workplace: str,
+        results: List[Dict[str, Any]],
+        first_page: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Параллельный анализ изображений первых страниц PDF.
+
+        Страница first_page (выбранная по тексту) анализируется первой
+        и отдельно. Остальные страницы растеризуются по очереди,
+        запрос по каждой отправляется сразу после ее растеризации. При
+        первом уверенном результате остальные запросы отменяются.
+
+        Args:
+            full_name: Полное имя врача для проверки
+            data: Содержимое PDF
+            workplace: Место работы врача
+            results: Список, в который добавляются неуверенные результаты
+            first_page: Номер страницы (с нуля) для проверки в первую очередь
+
+        Returns:
+            Уверенный результат или None
+        """
+        rasterizer = await asyncio.to_thread(
+            PdfRasterizer,
+            data,
+            settings.pdf_render_dpi,
+            settings.document_image_max_edge,
+            settings.document_image_grayscale,
+            settings.document_image_format,
+            settings.document_image_quality,
+        )
+        tasks: List[asyncio.Task] = []
+        try:
+            page_count = min(rasterizer.page_count, settings.pdf_max_pages)
+            if first_page is not None and first_page < page_count:
+                image = await asyncio.to_thread(rasterizer.render, first_page)
+                result = await self._analyze_document(
+                    full_name, workplace, self._page_source(first_page, image), image=image
+                )
+                if self._is_confident(result):
+                    return result
+                results.append(result)
+
+            for index in range(page_count):
+                if index == first_page:
+                    continue
+                image = await asyncio.to_thread(rasterizer.render, index)
+                source = self._page_source(index, image)
+                tasks.append(asyncio.create_task(self._analyze_document(full_name, workplace, source, image=image)))
+                for task in tasks:
+                    if task.done() and self._is_confident(task.result()):
+                        return task.result()
+
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                if self._is_confident(result):
+                    return result
+                results.append(result)
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.to_thread(rasterizer.close)
+
+    @staticmethod
+    def _page_source(index: int, image: PreparedImage) -> str:
+        """Описание страницы PDF для лога."""
+        return f"PDF, страница {index + 1}, изображение {image.width}x{image.height}, {image.size} bytes"
+
+    async def _analyze_document(
+        self,
+        full_name: str,
+        workplace: str,
+        source: str,
+        image: Optional[PreparedImage] = None,
+        text: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Запрос анализа документа к модели по изображению или по тексту.
+
+        Args:
+            full_name: Полное имя врача для проверки
+            workplace: Место работы врача
+            source: Описание источника для лога
+            image: Изображение документа
+            text: Текст документа (если изображения нет)
+
+        Returns:
+            Словарь с результатами анализа документа
+        """
+        try:
+            if image is not None:
+                base64_image = base64.b64encode(image.data).decode('utf-8')
+                content = [
+                    {
+                        "type": "input_text",
+                        "text": f"Проанализируй этот документ на предмет медицинского образования/квалификации. "
+                                f"Ищи ФИО: {full_name}. "
+                                f"ОБЯЗАТЕЛЬНО проверь медицинские признаки документа: "
+                                f"медицинские термины, названия мед. учреждений, печати, подписи. "
+                                f"Верни подробный результат в JSON."
+                    },
+                    {
+                        "type": "input_image",
+                        "image_url": f"data:{image.mime_type};base64,{base64_image}"
+                    }
+                ]
+            else:
+                content = [
+                    {
+                        "type": "input_text",
+                        "text": f"Проанализируй текст документа (текстовый слой PDF) на предмет медицинского "
+                                f"образования/квалификации. Ищи ФИО: {full_name}. "
+                                f"ОБЯЗАТЕЛЬНО проверь медицинские признаки документа: медицинские термины, "
+                                f"названия мед. учреждений, номера и реквизиты. "
+                                f"Верни подробный результат в JSON.\n\nТекст документа:\n{text}"
+                    }
+                ]
+
+            logger.info(f"Анализ документа для врача {full_name}: {source}")
+
+            response = await self._create_response(dict(
                 model=self.model,
                 text={
                     "format": {
@@ -256,23 +602,10 @@ class OpenAIService:
                     },
                     {
                         "role": "user",
-                        "content": [
-                            {
-                                "type": "input_text",
-                                "text": f"Проанализируй этот документ на предмет медицинского образования/квалификации. "
-                                        f"Ищи ФИО: {full_name}. "
-                                        f"ОБЯЗАТЕЛЬНО проверь медицинские признаки документа: "
-                                        f"медицинские термины, названия мед. учреждений, печати, подписи. "
-                                        f"Верни подробный результат в JSON."
-                            },
-                            {
-                                "type": "input_image",
-                                "image_url": f"data:{file_type};base64,{base64_image}"
-                            }
-                        ]
+                        "content": content
                     }
                 ]
-            )
+            ))
 
             result = json.loads(response.output_text)
 
@@ -281,8 +614,7 @@ class OpenAIService:
             logger.info("=" * 60)
             logger.info(f"👤 User: {full_name}")
             logger.info(f"🏥 Workplace: {workplace}")
-            logger.info(f"📋 File Type: {file_type}")
-            logger.info(f"📏 Image Size: {len(image_data)} bytes")
+            logger.info(f"📋 Source: {source}")
             logger.info("-" * 60)
             logger.info("📄 JSON Response:")
             logger.info(json.dumps(result, ensure_ascii=False, indent=2))
@@ -292,9 +624,15 @@ class OpenAIService:
 
         except Exception as e:
             logger.error(f"Ошибка при анализе документа: {e}")
-            return {
-                "found": False,
-                "confidence": "low",
-                "explanation": f"Ошибка при анализе документа: {str(e)}",
-                "document_type": "unknown"
-            }
+            return self.document_error(e)
+
+    @staticmethod
+    def document_error(error: Exception) -> Dict[str, Any]:
+        """Результат анализа документа при ошибке запроса."""
+        return {
+            "found": False,
+            "confidence": "low",
+            "explanation": f"Ошибка при анализе документа: {str(error)}",
+            "document_type": "unknown",
+            "error": True
+        }
@@ -0,0 +1,122 @@
+"""Текстовый слой и растеризация страниц PDF-документов."""
+
+import io
+import re
+import threading
+from typing import List
+
+import pypdfium2 as pdfium
+from pypdf import PdfReader
+
+from bot.services.image_preprocessing import OUTPUT_MIME_TYPES, PreparedImage, encode_image, flatten_image
+
+# PDFium не потокобезопасен даже для разных документов
+_pdfium_lock = threading.Lock()
+
+_WORD_RE = re.compile(r"[^\W_]+(?:-[^\W_]+)*")
+
+# Основы слов: ищутся как подстроки в тексте без учета регистра
+MEDICAL_KEYWORDS = (
+    "медицин", "врач", "лечебн", "педиатр", "хирург", "стоматолог", "фармац",
+    "сестринск", "ординатур", "интернатур", "аккредитац", "здравоохранени",
+    "клиническ", "терапи", "акушер", "анестезиолог",
+)
+
+
+def is_pdf(data: bytes) -> bool:
+    """Проверка сигнатуры PDF (допускается мусор перед заголовком, как в просмотрщиках)."""
+    return b"%PDF-" in data[:1024]
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower().replace("ё", "е"))
+
+
+def contains_full_name(text: str, full_name: str) -> bool:
+    """Есть ли в тексте ФИО целиком: те же слова подряд без учета регистра и пунктуации."""
+    name = " ".join(_words(full_name))
+    return bool(name) and f" {name} " in f" {' '.join(_words(text))} "
+
+
+def find_medical_keywords(text: str) -> List[str]:
+    """Медицинские термины, найденные в тексте."""
+    lowered = text.lower().replace("ё", "е")
+    return [keyword for keyword in MEDICAL_KEYWORDS if keyword in lowered]
+
+
+def compact_text(text: str, max_chars: int) -> str:
+    """Текст страницы без лишних пробелов и переводов строк, не длиннее max_chars."""
+    return re.sub(r"\s+", " ", text).strip()[:max_chars]
+
+
+def extract_pdf_text(data: bytes, max_pages: int) -> List[str]:
+    """
+    Текстовый слой первых страниц PDF.
+
+    Для сканов без текстового слоя и поврежденных файлов возвращаются
+    пустые строки или пустой список. Функция синхронная - вызывать через
+    asyncio.to_thread.
+
+    :param data: Содержимое PDF.
+    :param max_pages: Сколько страниц читать.
+    :return: Текст каждой страницы.
+    """
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        return [page.extract_text() or "" for page in reader.pages[:max_pages]]
+    except Exception:
+        return []
+
+
+class PdfRasterizer:
+    """
+    Растеризация страниц PDF для анализа как изображений.
+
+    Масштаб выбирается так, чтобы не превышать ни `dpi`, ни `max_edge`
+    пикселей по большей стороне. Документ нужно закрыть через `close()`.
+    Методы синхронные - вызывать через asyncio.to_thread.
+    """
+
+    def __init__(
+        self,
+        data: bytes,
+        dpi: int = 150,
+        max_edge: int = 1600,
+        grayscale: bool = False,
+        output_format: str = "JPEG",
+        quality: int = 85,
+    ):
+        with _pdfium_lock:
+            self._pdf = pdfium.PdfDocument(data)
+            self.page_count = len(self._pdf)
+        self.original_size = len(data)
+        self.dpi = dpi
+        self.max_edge = max_edge
+        self.grayscale = grayscale
+        self.output_format = output_format
+        self.quality = quality
+
+    def render(self, index: int) -> PreparedImage:
+        """Страница с номером index (с нуля) в виде сжатого изображения."""
+        with _pdfium_lock:
+            page = self._pdf[index]
+            try:
+                width, height = page.get_size()  # в пунктах, 72 на дюйм
+                scale = min(self.dpi / 72, self.max_edge / max(width, height, 1))
+                bitmap = page.render(scale=scale, grayscale=self.grayscale)
+                image = bitmap.to_pil()
+            finally:
+                page.close()
+
+        image = flatten_image(image, self.grayscale)
+        return PreparedImage(
+            encode_image(image, self.output_format, self.quality),
+            OUTPUT_MIME_TYPES[self.output_format],
+            self.original_size,
+            "application/pdf",
+            *image.size,
+        )
+
+    def close(self) -> None:
+        with _pdfium_lock:
+            self._pdf.close()
@@ -0,0 +1,206 @@
+"""Дисковый кэш файлов Telegram по file_unique_id."""
+
+import asyncio
+import hashlib
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+import aiofiles
+from aiogram import Bot
+from loguru import logger
+
+from config.settings import settings
+
+_SAFE_NAME_RE = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+_PART_SUFFIX = ".part"
+
+
+class TelegramFileCache:
+    """
+    Каталог с загруженными из Telegram файлами.
+
+    Файлы хранятся под именем `file_unique_id`, который, в отличие от
+    `file_id`, одинаков для всех ботов и не меняется со временем. Время
+    загрузки - mtime файла, время последнего обращения - atime (выставляется
+    явно, поэтому не зависит от опций монтирования). Файлы старше `ttl_seconds`
+    удаляются, при превышении `max_bytes` удаляются давно не использованные.
+    Одновременные запросы одного файла выполняют одну загрузку.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, ttl_seconds: float):
+        """
+        Инициализация кэша.
+
+        :param directory: Каталог для файлов (создается при первой загрузке).
+        :param max_bytes: Максимальный суммарный размер файлов (0 - без кэша).
+        :param ttl_seconds: Время хранения файла с момента загрузки в секундах.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._loading: Dict[str, asyncio.Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, file_unique_id: str) -> Path:
+        name = file_unique_id if _SAFE_NAME_RE.match(file_unique_id) else hashlib.sha256(
+            file_unique_id.encode("utf-8")
+        ).hexdigest()
+        return self.directory / name
+
+    def _lookup(self, path: Path) -> bool:
+        """Проверка наличия неистекшего файла с обновлением времени обращения."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return False
+        now = time.time()
+        if now - stat.st_mtime > self.ttl_seconds:
+            return False
+        os.utime(path, (now, stat.st_mtime))
+        return True
+
+    async def get_path(self, bot: Bot, file_id: str, file_unique_id: Optional[str] = None) -> Path:
+        """
+        Путь к локальной копии файла, при отсутствии в кэше файл загружается.
+
+        :param bot: Бот, через который загружается файл.
+        :param file_id: ID файла для Bot API.
+        :param file_unique_id: Постоянный ID файла. Если не передан, берется из ответа get_file.
+        :return: Путь к файлу в каталоге кэша.
+        """
+        file = None
+        if file_unique_id is None:
+            file = await bot.get_file(file_id)
+            file_unique_id = file.file_unique_id
+
+        path = self._path(file_unique_id)
+        if await asyncio.to_thread(self._lookup, path):
+            self.hits += 1
+            return path
+
+        future = self._loading.get(file_unique_id)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._loading[file_unique_id] = future
+        try:
+            if file is None:
+                file = await bot.get_file(file_id)
+            await self._download(bot, file.file_path, path)
+            future.set_result(path)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # ошибка передается ожидающим, но не логируется как забытая
+            raise
+        finally:
+            self._loading.pop(file_unique_id, None)
+
+        await asyncio.to_thread(self.purge, path)
+        return path
+
+    async def read(self, bot: Bot, file_id: str, file_unique_id: Optional[str] = None) -> bytes:
+        """
+        Содержимое файла из кэша или из Telegram.
+
+        Файл может удалить `purge` другой загрузки между получением пути
+        и чтением - тогда он загружается повторно (один раз).
+        """
+        if not self.enabled:
+            file = await bot.download(file_id)
+            return file.read()
+        path = await self.get_path(bot, file_id, file_unique_id)
+        try:
+            return await self._read_file(path)
+        except FileNotFoundError:
+            logger.debug(f"Файл {path.name} удален из кэша до чтения, загружается повторно")
+        path = await self.get_path(bot, file_id, file_unique_id)
+        return await self._read_file(path)
+
+    @staticmethod
+    async def _read_file(path: Path) -> bytes:
+        async with aiofiles.open(path, "rb") as f:
+            return await f.read()
+
+    async def _download(self, bot: Bot, file_path: str, path: Path) -> None:
+        """Потоковая загрузка во временный файл с атомарным переименованием."""
+        await asyncio.to_thread(self.directory.mkdir, parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}{_PART_SUFFIX}")
+        try:
+            # aiogram пишет файл по частям через aiofiles, не собирая его в памяти
+            await bot.download_file(file_path, destination=tmp_path)
+            await asyncio.to_thread(os.replace, tmp_path, path)
+        except BaseException:
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+            raise
+
+    def purge(self, keep: Optional[Path] = None) -> int:
+        """
+        Удаление истекших файлов и давно не использованных сверх лимита размера.
+
+        :param keep: Файл, который не удаляется (только что загружен и еще не прочитан).
+        :return: Количество удаленных файлов.
+        """
+        now = time.time()
+        entries = []
+        kept_size = 0
+        removed = 0
+        try:
+            paths = list(self.directory.iterdir())
+        except FileNotFoundError:
+            return 0
+
+        for path in paths:
+            try:
+                stat = path.stat()
+                if path == keep:
+                    kept_size = stat.st_size
+                elif now - stat.st_mtime > self.ttl_seconds:
+                    path.unlink()
+                    removed += 1
+                elif not path.name.endswith(_PART_SUFFIX):
+                    entries.append((stat.st_atime, stat.st_size, path))
+            except FileNotFoundError:
+                continue
+
+        total = kept_size + sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            entries.sort(key=lambda entry: entry[0])
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+        if removed:
+            logger.debug(f"🧹 Из кэша файлов Telegram удалено файлов: {removed}")
+        return removed
+
+
+_file_cache: Optional[TelegramFileCache] = None
+
+
+def get_telegram_file_cache() -> TelegramFileCache:
+    """Общий для процесса кэш файлов Telegram с параметрами из настроек."""
+    global _file_cache
+    if _file_cache is None:
+        _file_cache = TelegramFileCache(
+            settings.telegram_file_cache_dir,
+            settings.telegram_file_cache_max_mb * 1024 * 1024,
+            settings.telegram_file_cache_ttl_hours * 3600,
+        )
+    return _file_cache
@@ -0,0 +1,168 @@
+"""Фоновая очередь проверок через OpenAI с пулом воркеров."""
+
+import asyncio
+import math
+import time
+from datetime import timedelta
+from typing import List, Optional
+
+from aiogram import Bot
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+from loguru import logger
+from openai import AsyncOpenAI
+
+from bot.database.manager import DatabaseManager
+from bot.database.models.verification_job import VerificationJob, VerificationJobOutcome, VerificationJobStatus
+from bot.services.verification_service import VerificationService
+
+
+class VerificationQueue:
+    """
+    Пул воркеров, выполняющих задачи верификации из таблицы verification_jobs.
+
+    Обработчик Telegram только ставит задачу в очередь и будит воркеров,
+    поэтому время ответа модели не задерживает обработку обновлений.
+    Итог задачи записывается в одной транзакции с изменениями верификации,
+    сообщения отправляются после коммита. При падении процесса задача
+    доставляется повторно (доставка «хотя бы один раз»): если итог уже
+    записан, повторяются только неотправленные сообщения, иначе задача
+    выполняется заново с ответом модели из кэша результатов.
+    Ошибка выполнения возвращает задачу в очередь с задержкой, после
+    `max_attempts` попыток пользователю сообщается об ошибке.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        bot: Bot,
+        storage: BaseStorage,
+        openai_client: Optional[AsyncOpenAI] = None,
+        workers: int = 2,
+        poll_interval: float = 5.0,
+        lease_seconds: float = 600,
+        max_attempts: int = 3,
+        retry_delay_seconds: float = 30,
+        keep_finished_days: float = 7,
+    ):
+        """
+        Инициализация очереди.
+
+        :param db_manager: Менеджер базы данных.
+        :param bot: Бот для загрузки документов и сообщений пользователям.
+        :param storage: Хранилище FSM диспетчера.
+        :param openai_client: Общий клиент OpenAI.
+        :param workers: Количество одновременно выполняемых задач.
+        :param poll_interval: Интервал проверки очереди без уведомлений в секундах
+            (задачи других процессов и отложенные повторы).
+        :param lease_seconds: Срок аренды задачи; после него задачу может взять другой воркер.
+        :param max_attempts: Максимальное количество попыток выполнения задачи.
+        :param retry_delay_seconds: Задержка перед повтором после ошибки в секундах.
+        :param keep_finished_days: Срок хранения завершенных задач в днях.
+        """
+        self.db_manager = db_manager
+        self.bot = bot
+        self.storage = storage
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.retry_delay = timedelta(seconds=retry_delay_seconds)
+        self.keep_finished = timedelta(days=keep_finished_days)
+        self.service = VerificationService(db_manager, openai_client, self)
+        self.avg_duration = 30.0  # среднее время выполнения задачи в секундах, уточняется по задачам
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Возобновление незавершенных задач и запуск воркеров."""
+        jobs = self.db_manager.verification_jobs
+        deleted = await jobs.delete_finished(self.keep_finished)
+        if deleted:
+            logger.info(f"Удалено завершенных задач верификации: {deleted}")
+        # SQLite обслуживает один процесс: все задачи в работе прерваны его прошлой остановкой.
+        # На PostgreSQL задачи остановленного воркера забираются после окончания аренды
+        if self.db_manager.backend.dialect == "sqlite":
+            resumed = await jobs.requeue_running()
+            if resumed:
+                logger.info(f"🔁 Возобновлено незавершенных задач верификации: {resumed}")
+
+        self._tasks = [asyncio.create_task(self._worker(number)) for number in range(self.workers)]
+        logger.info(f"Запущено воркеров очереди верификации: {self.workers}")
+
+    async def stop(self) -> None:
+        """
+        Остановка воркеров.
+
+        Прерванные задачи остаются в работе и возобновляются при следующем запуске.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self) -> None:
+        """Уведомление воркеров о новой задаче."""
+        self._wakeup.set()
+
+    def estimate_wait(self, position: int) -> float:
+        """
+        Оценка времени до завершения задачи на указанном месте в очереди, в секундах.
+
+        Задачи выполняются по `workers` одновременно, но не чаще, чем
+        позволяют лимиты модели OpenAI.
+        """
+        by_workers = math.ceil(position / self.workers) * self.avg_duration
+        by_limits = position * self.service.openai_service.request_interval()
+        return max(by_workers, by_limits)
+
+    async def _worker(self, number: int) -> None:
+        """Цикл воркера: взять задачу, выполнить, ждать новые при пустой очереди."""
+        while True:
+            # Сброс до чтения очереди: уведомление о задаче, поставленной во время чтения, не теряется
+            self._wakeup.clear()
+            try:
+                job = await self.db_manager.verification_jobs.claim(self.lease)
+            except Exception as e:
+                logger.error(f"❌ Воркер верификации {number}: ошибка чтения очереди: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._run(job)
+            except Exception as e:
+                logger.error(f"❌ Воркер верификации {number}: ошибка задачи {job.id}: {e}")
+
+    def _state(self, user_id: int) -> FSMContext:
+        """FSM пользователя в личном чате (стратегия GLOBAL_USER)."""
+        key = StorageKey(bot_id=self.bot.id, chat_id=user_id, user_id=user_id)
+        return FSMContext(storage=self.storage, key=key)
+
+    async def _run(self, job: VerificationJob) -> None:
+        """Выполнение задачи и фиксация результата."""
+        jobs = self.db_manager.verification_jobs
+        state = self._state(job.user_id)
+        logger.info(f"⚙️ Задача верификации {job.id} пользователя {job.user_id}, попытка {job.attempts}")
+
+        started = time.monotonic()
+        try:
+            await self.service.process_verification(self.bot, state, job.user_id, job.payload, job)
+            self.avg_duration = 0.8 * self.avg_duration + 0.2 * (time.monotonic() - started)
+        except Exception as e:
+            if job.attempts < self.max_attempts:
+                logger.warning(f"⚠️ Задача верификации {job.id} будет повторена: {e}")
+                await jobs.retry(job, self.retry_delay, str(e))
+                return
+            await self.service.report_verification_error(self.bot, state, job.user_id, job.payload, e, job)
+            await jobs.finish(job, VerificationJobStatus.FAILED, str(e))
+            return
+
+        status = VerificationJobStatus.FAILED if job.outcome == VerificationJobOutcome.ERROR else VerificationJobStatus.DONE
+        if not await jobs.finish(job, status):
+            logger.warning(f"⚠️ Аренда задачи верификации {job.id} истекла до завершения")
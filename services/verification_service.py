@@ -1,24 +1,40 @@
 """Сервис верификации медицинских работников."""
 
+from aiogram import Bot
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
+import hashlib
+import math
+from datetime import timedelta
 from loguru import logger
-from typing import Dict, Any
+from openai import AsyncOpenAI
+from typing import TYPE_CHECKING, Dict, Any, Optional
 
 from bot.database.manager import DatabaseManager
 from bot.services.openai_service import OpenAIService
 from bot.states.verification import VerificationStates
+from bot.utils.normalization import cache_key, normalize_text, registrable_domain
 from config.settings import settings
 import re
+from bot.database.models.verification_job import VerificationJob, VerificationJobOutcome
 from bot.database.models.verification_log import VerificationMethod, VerificationLog
 
+if TYPE_CHECKING:
+    from bot.services.verification_queue import VerificationQueue
+
 
 class VerificationService:
     """Сервис для обработки верификации пользователей."""
 
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        openai_client: Optional[AsyncOpenAI] = None,
+        queue: Optional["VerificationQueue"] = None,
+    ):
         self.db_manager = db_manager
-        self.openai_service = OpenAIService()
+        self.openai_service = OpenAIService(openai_client)
+        self.queue = queue
 
     def _normalize_name(self, name: str) -> str:
         """Нормализация ФИО для сравнения."""
@@ -49,74 +65,286 @@ class VerificationService:
             logger.warning("❌ ФИО НЕ совпадают")
             return False
 
-    async def start_verification_process(self, message: Message, state: FSMContext):
-        """Запуск процесса верификации через OpenAI."""
-        await message.answer(
-            "⏳ <b>Обработка верификации...</b>\n\n"
-            "Пожалуйста, подождите. Это может занять 1-3 минуты."
+    def _website_cache_key(self, data: Dict[str, Any]) -> str:
+        """Ключ кэша проверки по сайту: ФИО, место работы и регистрируемый домен."""
+        return cache_key(
+            VerificationMethod.WEBSITE.value,
+            self._normalize_name(data["full_name"]),
+            normalize_text(data["workplace"]),
+            registrable_domain(data["website_url"]),
+        )
+
+    async def _verify_website_cached(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Проверка по сайту с постоянным кэшем результатов.
+
+        Сохраняются положительные и отрицательные ответы (с разным сроком),
+        ответы с ошибкой запроса не сохраняются.
+        """
+        ttl_hours = settings.website_result_cache_ttl_hours
+        key: Optional[str] = self._website_cache_key(data) if ttl_hours > 0 else None
+        if key:
+            cached = await self.db_manager.verification_results.get(key)
+            if cached is not None:
+                logger.info(f"💾 Результат проверки сайта для {data['full_name']} взят из кэша")
+                return cached
+
+        result = await self.openai_service.verify_website(
+            full_name=data["full_name"],
+            workplace=data["workplace"],
+            website_url=data["website_url"]
+        )
+
+        if key and isinstance(result, dict) and not result.get("found"):
+            ttl_hours = min(ttl_hours, settings.website_result_cache_negative_ttl_hours)
+        await self._save_result(key, VerificationMethod.WEBSITE, result, ttl_hours)
+        return result
+
+    async def _verify_document_cached(self, data: Dict[str, Any], bot: Optional[Bot] = None) -> Dict[str, Any]:
+        """
+        Проверка документа с кэшем результатов по SHA-256 содержимого файла.
+
+        При повторной загрузке того же файла модель не вызывается: найденное
+        в документе ФИО из кэша сравнивается с введенным локально.
+        Отрицательные ответы хранятся меньше, как при проверке по сайту.
+        """
+        try:
+            content = await self.openai_service.download_document(
+                data["document_file_id"], data.get("document_file_unique_id"), bot
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при загрузке документа {data['document_file_id']}: {e}")
+            return self.openai_service.document_error(e)
+
+        ttl_hours = settings.document_result_cache_ttl_hours
+        key: Optional[str] = None
+        if ttl_hours > 0:
+            key = cache_key(VerificationMethod.DOCUMENT.value, hashlib.sha256(content).hexdigest())
+            cached = await self.db_manager.verification_results.get(key)
+            if cached is not None:
+                result = self._reuse_document_result(cached, data["full_name"])
+                if result is not None:
+                    logger.info(f"💾 Результат анализа документа для {data['full_name']} взят из кэша")
+                    return result
+
+        result = await self.openai_service.verify_diploma_document(
+            data["full_name"], content, data.get("document_mime_type", "image/jpeg"), data["workplace"]
         )
+        if isinstance(result, dict):
+            result = dict(result, analyzed_name=data["full_name"])
+            if key and not result.get("found"):
+                ttl_hours = min(ttl_hours, settings.document_result_cache_negative_ttl_hours)
+        await self._save_result(key, VerificationMethod.DOCUMENT, result, ttl_hours)
+        return result
+
+    def _reuse_document_result(self, cached: Dict[str, Any], full_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Результат анализа документа из кэша для введенного ФИО.
+
+        Для того же ФИО ответ возвращается как есть, для другого - found
+        пересчитывается сравнением с найденным в документе ФИО. Если ФИО
+        в документе не найдено, ответ не подходит (None).
+        """
+        if self._normalize_name(cached.get("analyzed_name", "")) == self._normalize_name(full_name):
+            return cached
+        found_name = cached.get("found_name")
+        if not found_name:
+            return None
+        return dict(cached, found=self._compare_full_names(full_name, found_name), analyzed_name=full_name)
+
+    async def _save_result(
+        self, key: Optional[str], method: VerificationMethod, result: Any, ttl_hours: int
+    ) -> None:
+        """Сохранение ответа модели в кэш результатов (ответы с ошибкой запроса не сохраняются)."""
+        if not key or ttl_hours <= 0 or not isinstance(result, dict) or result.get("error"):
+            return
+        try:
+            await self.db_manager.verification_results.put(key, method.value, result, timedelta(hours=ttl_hours))
+        except Exception as e:
+            logger.warning(f"⚠️ Не удалось сохранить результат проверки в кэш: {e}")
+
+    @staticmethod
+    def _format_wait(seconds: float) -> str:
+        """Время ожидания для сообщения пользователю."""
+        if seconds < 60:
+            return "меньше минуты"
+        return f"около {math.ceil(seconds / 60)} мин."
 
+    async def start_verification_process(self, message: Message, state: FSMContext):
+        """
+        Запуск процесса верификации через OpenAI.
+
+        Данные FSM ставятся в очередь верификации, проверку выполняет
+        воркер очереди. Без очереди проверка выполняется сразу.
+        """
         await state.set_state(VerificationStates.processing_verification)
 
         data = await state.get_data()
         user_id = message.from_user.id
 
-        try:
-            if data["method"] == VerificationMethod.WEBSITE:
-                result = await self.openai_service.verify_website(
-                    full_name=data["full_name"],
-                    workplace=data["workplace"],
-                    website_url=data["website_url"]
-                )
-            else:
-                result = await self.openai_service.verify_document(
-                    full_name=data["full_name"],
-                    workplace=data["workplace"],
-                    file_id=data["document_file_id"]
-                )
+        if self.queue is None:
+            await message.answer(
+                "⏳ <b>Обработка верификации...</b>\n\n"
+                "Пожалуйста, подождите. Это может занять 1-3 минуты."
+            )
+            try:
+                await self.process_verification(message.bot, state, user_id, data)
+            except Exception as e:
+                await self.report_verification_error(message.bot, state, user_id, data, e)
+            return
 
-            log = VerificationLog(
-                user_id=user_id,
-                method=data["method"],
-                full_name=data["full_name"],
-                workplace=data["workplace"],
-                website_url=data.get("website_url"),
-                details=f"{data['full_name']} - {data['workplace']}",
-                openai_response=str(result),
-                result="processing"
+        try:
+            # Сообщение отправляется до постановки в очередь, чтобы не прийти позже результата
+            position = await self.db_manager.verification_jobs.count_active() + 1
+            await message.answer(
+                "⏳ <b>Обработка верификации...</b>\n\n"
+                f"Ваше место в очереди: <b>{position}</b>\n"
+                f"Примерное время ожидания: {self._format_wait(self.queue.estimate_wait(position))}.\n\n"
+                "Пожалуйста, подождите, результат придет в этот чат."
             )
-            await self.db_manager.logs.add(log)
+            job_id = await self.db_manager.verification_jobs.enqueue(user_id, data.get("group_id"), data)
+        except Exception as e:
+            await self.report_verification_error(message.bot, state, user_id, data, e)
+            return
+        self.queue.wake()
+        logger.info(f"📥 Верификация пользователя {user_id} поставлена в очередь (задача {job_id})")
+
+    async def process_verification(
+        self,
+        bot: Bot,
+        state: FSMContext,
+        user_id: int,
+        data: Dict[str, Any],
+        job: Optional[VerificationJob] = None,
+    ):
+        """
+        Проверка данных пользователя и завершение верификации.
+
+        Для задачи очереди итог записывается в задачу в одной транзакции
+        с изменениями верификации, сообщения отправляются после коммита,
+        после чего задача отмечается как уведомленная. При повторной доставке
+        задачи с записанным итогом изменения в базе не повторяются, а
+        сообщения отправляются снова, только если отметки об уведомлении нет.
+        Ответ модели при повторе берется из кэша результатов.
+
+        :param bot: Бот для загрузки документа и сообщений пользователю.
+        :param state: FSM пользователя.
+        :param user_id: ID пользователя.
+        :param data: Данные FSM на момент запуска верификации.
+        :param job: Задача очереди (None - проверка без очереди).
+        """
+        if job is not None and job.outcome is not None:
+            if job.notified:
+                logger.info(f"Задача верификации {job.id} уже завершена с итогом {job.outcome}, повтор пропущен")
+                return
+            logger.info(f"Итог задачи верификации {job.id} ({job.outcome}) записан, повторяется уведомление")
+            await self._notify_outcome(bot, state, user_id, data, VerificationJobOutcome(job.outcome), job)
+            return
 
-            is_verified = self._analyze_openai_json_response(result, data["full_name"])
+        if data["method"] == VerificationMethod.WEBSITE:
+            result = await self._verify_website_cached(data)
+        else:
+            result = await self._verify_document_cached(data, bot)
+
+        log = VerificationLog(
+            user_id=user_id,
+            method=data["method"],
+            full_name=data["full_name"],
+            workplace=data["workplace"],
+            website_url=data.get("website_url"),
+            details=f"{data['full_name']} - {data['workplace']}",
+            openai_response=str(result),
+            result="processing"
+        )
 
+        is_verified = self._analyze_openai_json_response(result, data["full_name"])
+        outcome = VerificationJobOutcome.VERIFIED if is_verified else VerificationJobOutcome.REJECTED
+        group_id = data.get("group_id")
+
+        async with self.db_manager.transaction():
+            if not await self._record_outcome(job, outcome):
+                return
+            await self.db_manager.logs.add(log)
             if is_verified:
-                await self._handle_successful_verification(message, state, data)
+                await self._save_successful_verification(user_id, group_id)
             else:
-                await self._handle_failed_verification(message, state)
+                await self._save_failed_verification(user_id, group_id)
 
-        except Exception as e:
-            logger.error(f"Ошибка при верификации пользователя {user_id}: {e}")
-
-            log = VerificationLog(
-                user_id=user_id,
-                method=data.get("method"),
-                full_name=data.get("full_name"),
-                workplace=data.get("workplace"),
-                website_url=data.get("website_url"),
-                details=f"{data.get('full_name', 'N/A')} - {data.get('workplace', 'N/A')}",
-                result="error",
-                openai_response=f"Ошибка: {str(e)}"
-            )
+        await self._notify_outcome(bot, state, user_id, data, outcome, job)
+
+    async def _notify_outcome(
+        self,
+        bot: Bot,
+        state: FSMContext,
+        user_id: int,
+        data: Dict[str, Any],
+        outcome: VerificationJobOutcome,
+        job: Optional[VerificationJob] = None,
+    ) -> None:
+        """Сообщение пользователю о записанном итоге и отметка об уведомлении в задаче."""
+        if outcome == VerificationJobOutcome.VERIFIED:
+            await self._handle_successful_verification(bot, state, user_id, data)
+        elif outcome == VerificationJobOutcome.REJECTED:
+            await self._handle_failed_verification(bot, state, user_id, data)
+        else:
+            await self._send_error_message(bot, state, user_id)
+        if job is not None:
+            await self.db_manager.verification_jobs.mark_notified(job)
+
+    async def _record_outcome(self, job: Optional[VerificationJob], outcome: VerificationJobOutcome) -> bool:
+        """Запись итога задачи очереди (вызывается внутри транзакции). False - итог уже записан."""
+        if job is None:
+            return True
+        if await self.db_manager.verification_jobs.record_outcome(job, outcome):
+            return True
+        logger.warning(f"⚠️ Итог задачи верификации {job.id} уже записан или аренда истекла, изменения пропущены")
+        return False
+
+    async def report_verification_error(
+        self,
+        bot: Bot,
+        state: FSMContext,
+        user_id: int,
+        data: Dict[str, Any],
+        error: Exception,
+        job: Optional[VerificationJob] = None,
+    ):
+        """Запись ошибки верификации в лог и сообщение пользователю."""
+        logger.error(f"Ошибка при верификации пользователя {user_id}: {error}")
+
+        log = VerificationLog(
+            user_id=user_id,
+            method=data.get("method"),
+            full_name=data.get("full_name"),
+            workplace=data.get("workplace"),
+            website_url=data.get("website_url"),
+            details=f"{data.get('full_name', 'N/A')} - {data.get('workplace', 'N/A')}",
+            result="error",
+            openai_response=f"Ошибка: {str(error)}"
+        )
+        async with self.db_manager.transaction():
+            if not await self._record_outcome(job, VerificationJobOutcome.ERROR):
+                return
             await self.db_manager.logs.add(log)
 
-            try:
-                await message.bot.send_message(
-                    message.from_user.id,
-                    "❌ <b>Ошибка при обработке верификации</b>\n\n"
-                    "Произошла техническая ошибка. Попробуйте еще раз позже или обратитесь к администратору."
-                )
-            except Exception as send_error:
-                logger.error(f"Не удалось отправить сообщение об ошибке пользователю {user_id}: {send_error}")
+        await self._notify_outcome(bot, state, user_id, data, VerificationJobOutcome.ERROR, job)
+
+    async def _send_error_message(self, bot: Bot, state: FSMContext, user_id: int) -> None:
+        """Сообщение пользователю о технической ошибке верификации."""
+        try:
+            await bot.send_message(
+                user_id,
+                "❌ <b>Ошибка при обработке верификации</b>\n\n"
+                "Произошла техническая ошибка. Попробуйте еще раз позже или обратитесь к администратору."
+            )
+        except Exception as send_error:
+            logger.error(f"Не удалось отправить сообщение об ошибке пользователю {user_id}: {send_error}")
+        await self._clear_processing_state(state)
+
+    @staticmethod
+    async def _clear_processing_state(state: FSMContext) -> None:
+        """Сброс FSM, только если пользователь еще ждет результата (не начал новую верификацию)."""
+        if await state.get_state() == VerificationStates.processing_verification.state:
             await state.clear()
 
     def _analyze_openai_json_response(self, result: Dict[str, Any], input_full_name: str) -> bool:
@@ -186,46 +414,59 @@ class VerificationService:
             logger.info("=" * 60)
             return False
 
+    async def _save_successful_verification(self, user_id: int, group_id: Optional[int]):
+        """Изменения в базе после успешной верификации (без group_id изменений нет)."""
+        if not group_id:
+            return
+
+        async with self.db_manager.transaction():
+            await self.db_manager.user_group_verifications.update_verified_status(user_id, group_id, True, "manual")
+
+            # Сбрасываем флаг requires_verification после успешной верификации
+            await self.db_manager.user_group_verifications.update_requires_verification(user_id, group_id, False)
+
+            # Сбрасываем счетчик сообщений после успешной верификации
+            await self.db_manager.message_counts.reset_count(user_id, group_id)
+
+            await self.db_manager.logs.update_verification_result(user_id, "success")
+            await self.db_manager.user_group_verifications.update_state(user_id, group_id, None)
+
+    async def _save_failed_verification(self, user_id: int, group_id: Optional[int]):
+        """Изменения в базе после неудачной верификации."""
+        async with self.db_manager.transaction():
+            await self.db_manager.logs.update_verification_result(user_id, "failed")
+            if group_id:
+                await self.db_manager.user_group_verifications.update_state(user_id, group_id, None)
+            else:
+                await self.db_manager.users.update_step(user_id, None)
+
     async def _handle_successful_verification(
         self,
-        message: Message,
+        bot: Bot,
         state: FSMContext,
+        user_id: int,
         data: dict
     ):
-        """Обработка успешной верификации."""
-        user_id = message.from_user.id
-
-        state_data = await state.get_data()
-        group_id = state_data.get('group_id')
+        """Сообщение пользователю об успешной верификации (изменения в базе уже записаны)."""
+        group_id = data.get('group_id')
 
         if not group_id:
             logger.error(f"Не найден group_id в FSM state для пользователя {user_id}")
             try:
-                await message.bot.send_message(
-                    message.from_user.id,
+                await bot.send_message(
+                    user_id,
                     "❌ Ошибка: не удалось определить группу для верификации."
                 )
             except Exception as e:
                 logger.error(f"Не удалось отправить сообщение пользователю {user_id}: {e}")
             return
 
-        await self.db_manager.user_group_verifications.update_verified_status(user_id, group_id, True, "manual")
-
-        # Сбрасываем флаг requires_verification после успешной верификации
-        await self.db_manager.user_group_verifications.update_requires_verification(user_id, group_id, False)
-        
-        # Сбрасываем счетчик сообщений после успешной верификации
-        await self.db_manager.message_counts.reset_count(user_id, group_id)
-
-        await self.db_manager.logs.update_verification_result(user_id, "success")
-        await self.db_manager.user_group_verifications.update_state(user_id, group_id, None)
-
         logger.debug(f"✅ Пользователь {user_id} верифицирован в группе {group_id}, кэш обновится автоматически")
 
         success_message = "🎉 <b>Верификация успешно завершена!</b>"
 
         try:
-            await message.bot.send_message(message.from_user.id, success_message)
+            await bot.send_message(user_id, success_message)
         except Exception as e:
             logger.error(f"Не удалось отправить сообщение о успешной верификации пользователю {user_id}: {e}")
 
@@ -235,29 +476,24 @@ class VerificationService:
         except Exception as e:
             logger.debug(f"Не удалось удалить сообщение с предупреждением для {user_id}: {e}")
 
-        await state.clear()
+        await self._clear_processing_state(state)
         logger.info(
             f"Пользователь {user_id} успешно верифицирован в группе {group_id}: {data['full_name']} - {data['workplace']}")
 
     async def _handle_failed_verification(
         self,
-        message: Message,
-        state: FSMContext
+        bot: Bot,
+        state: FSMContext,
+        user_id: int,
+        data: dict
     ):
-        """Обработка неудачной верификации."""
-        user_id = message.from_user.id
-
-        state_data = await state.get_data()
-        group_id = state_data.get('group_id')
-
-        await self.db_manager.logs.update_verification_result(user_id, "failed")
+        """Сообщение пользователю о неудачной верификации (изменения в базе уже записаны)."""
+        group_id = data.get('group_id')
 
         if group_id:
-            await self.db_manager.user_group_verifications.update_state(user_id, group_id, None)
             verification = await self.db_manager.user_group_verifications.get_by_user_and_group(user_id, group_id)
             remaining_attempts = settings.max_verification_attempts - verification.attempts_count if verification else 0
         else:
-            await self.db_manager.users.update_step(user_id, None)
             user = await self.db_manager.users.get_by_id(user_id)
             remaining_attempts = settings.max_verification_attempts - user.attempts_count if user else 0
 
@@ -267,11 +503,11 @@ class VerificationService:
             failure_message += "\n\n🔄 Используйте команду /start для новой попытки"
 
         try:
-            await message.bot.send_message(message.from_user.id, failure_message)
+            await bot.send_message(user_id, failure_message)
         except Exception as e:
             logger.error(f"Не удалось отправить сообщение о неудачной верификации пользователю {user_id}: {e}")
 
-        await state.clear()
+        await self._clear_processing_state(state)
 
         group_info = f" в группе {group_id}" if group_id else ""
         logger.info(
@@ -55,20 +55,11 @@ class WhitelistService:
         return entry is not None
 
     async def is_in_whitelist(self, user_id: int, username: str = None, group_id: int = None) -> bool:
-        """Проверяет по ID и username, есть ли пользователь в whitelist."""
+        """Проверяет по ID и username (без учета регистра), есть ли пользователь в whitelist."""
         if not group_id:
             return False
 
-        if await self.whitelist_repo.is_whitelisted(user_id, group_id):
-            return True
-
-        if username:
-            entries = await self.whitelist_repo.get_by_group(group_id)
-            for entry in entries:
-                if entry.username == username:
-                    return True
-
-        return False
+        return await self.whitelist_repo.contains(group_id, user_id, username)
 
     async def get_whitelist(self, group_id: int) -> List[WhitelistEntry]:
         """Возвращает всех пользователей в белом списке для указанной группы."""
@@ -77,9 +68,12 @@ class WhitelistService:
     async def remove_by_entry_id(self, entry_id: int) -> bool:
         """Удаляет запись из whitelist по ID записи."""
         try:
-            await self.whitelist_repo.remove_by_id(entry_id)
-            logger.info(f"Запись whitelist с ID {entry_id} удалена.")
-            return True
+            success = await self.whitelist_repo.remove_by_id(entry_id)
+            if success:
+                logger.info(f"Запись whitelist с ID {entry_id} удалена.")
+            else:
+                logger.warning(f"Попытка удалить несуществующую запись whitelist с ID {entry_id}.")
+            return success
         except Exception as e:
             logger.error(f"Ошибка удаления записи whitelist с ID {entry_id}: {e}")
             return False
@@ -87,11 +81,7 @@ class WhitelistService:
     async def check_user_in_whitelist(self, user_id: int, username: str = None, group_id: int = None) -> bool:
         """Проверяет, находится ли пользователь в whitelist для указанной группы."""
         if not group_id:
-            entries = await self.whitelist_repo.get_all()
-            for entry in entries:
-                if entry.user_id == user_id or (username and entry.username == username):
-                    return True
-            return False
+            return await self.whitelist_repo.is_whitelisted_anywhere(user_id, username)
 
         return await self.is_in_whitelist(user_id, username, group_id)
 
@@ -120,8 +110,9 @@ class WhitelistService:
                 verification = await self.db_manager.user_group_verifications.get_or_create(user_id, group_id)
 
             if not verification.verified:
-                await self.db_manager.user_group_verifications.update_verified_status(user_id, group_id, True, "whitelist")
-                await self.db_manager.user_group_verifications.update_requires_verification(user_id, group_id, False)
+                async with self.db_manager.transaction():
+                    await self.db_manager.user_group_verifications.update_verified_status(user_id, group_id, True, "whitelist")
+                    await self.db_manager.user_group_verifications.update_requires_verification(user_id, group_id, False)
                 logger.info(
                     f"Пользователь {user_id} ({username}) автоматически верифицирован через whitelist в группе {group_id}")
                 return True
@@ -148,8 +139,9 @@ class WhitelistService:
             verification = await self.db_manager.user_group_verifications.get_by_user_and_group(user_id, group_id)
             
             if verification and not verification.verified:
-                await self.db_manager.user_group_verifications.update_verified_status(user_id, group_id, True, "whitelist")
-                await self.db_manager.user_group_verifications.update_requires_verification(user_id, group_id, False)
+                async with self.db_manager.transaction():
+                    await self.db_manager.user_group_verifications.update_verified_status(user_id, group_id, True, "whitelist")
+                    await self.db_manager.user_group_verifications.update_requires_verification(user_id, group_id, False)
                 
                 identifier = f"@{username}" if username else str(user_id)
                 logger.info(f"Автоматически завершена верификация для пользователя {identifier} (добавлен в whitelist)")
@@ -1,13 +0,0 @@
-CREATE TABLE IF NOT EXISTS users (
-    telegram_id INTEGER PRIMARY KEY,
-    username TEXT,
-    first_name TEXT,
-    last_name TEXT,
-    language_code TEXT,
-    is_premium BOOLEAN DEFAULT FALSE,
-    verified BOOLEAN DEFAULT FALSE,
-    verified_at TIMESTAMP,
-    state TEXT,
-    attempts_count INTEGER DEFAULT 0,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
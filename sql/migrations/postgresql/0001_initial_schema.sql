@@ -0,0 +1,88 @@
+-- Базовая схема для PostgreSQL (соответствует sqlite/0001_initial_schema.sql)
+
+CREATE TABLE IF NOT EXISTS users (
+    telegram_id BIGINT PRIMARY KEY,
+    username TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    language_code TEXT,
+    is_premium BOOLEAN DEFAULT FALSE,
+    verified BOOLEAN DEFAULT FALSE,
+    verified_at TIMESTAMP,
+    state TEXT,
+    attempts_count INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS groups (
+    group_id BIGINT PRIMARY KEY,
+    group_name TEXT,
+    is_active BOOLEAN,
+    checkin_mode BOOLEAN DEFAULT FALSE,
+    added_at TIMESTAMP,
+    updated_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS admins (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    user_id BIGINT NOT NULL,
+    group_id BIGINT,
+    role TEXT,
+    added_at TIMESTAMP,
+    UNIQUE(user_id, group_id)
+);
+
+CREATE TABLE IF NOT EXISTS verification_logs (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    user_id BIGINT,
+    method TEXT,
+    full_name TEXT,
+    workplace TEXT,
+    website_url TEXT,
+    details TEXT,
+    openai_response TEXT,
+    result TEXT,
+    created_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS whitelist (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    group_id BIGINT NOT NULL,
+    user_id BIGINT,
+    added_by BIGINT,
+    added_at TIMESTAMP,
+    notes TEXT,
+    username TEXT,
+    input_type TEXT
+);
+
+CREATE TABLE IF NOT EXISTS message_count (
+    user_id BIGINT NOT NULL,
+    group_id BIGINT NOT NULL,
+    count INTEGER DEFAULT 1,
+    first_message_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_message_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, group_id)
+);
+
+CREATE TABLE IF NOT EXISTS user_group_verifications (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    user_id BIGINT NOT NULL REFERENCES users (telegram_id),
+    group_id BIGINT NOT NULL REFERENCES groups (group_id),
+    verified BOOLEAN DEFAULT FALSE,
+    requires_verification BOOLEAN DEFAULT FALSE,
+    verification_type TEXT,
+    verified_at TIMESTAMP,
+    attempts_count INTEGER DEFAULT 0,
+    state TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (user_id, group_id)
+);
+
+-- Поиск пользователей по username без учета регистра
+CREATE INDEX IF NOT EXISTS idx_users_username ON users (lower(username));
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_whitelist_user_group
+ON whitelist (user_id, group_id)
+WHERE user_id IS NOT NULL;
@@ -0,0 +1,29 @@
+-- Индексы для запросов горячего пути
+
+-- Последний лог пользователя (update_verification_result)
+CREATE INDEX IF NOT EXISTS idx_verification_logs_user_created
+ON verification_logs(user_id, created_at);
+
+-- Очистка старых логов (cleanup_old)
+CREATE INDEX IF NOT EXISTS idx_verification_logs_created
+ON verification_logs(created_at);
+
+-- Очистка старых счетчиков сообщений (cleanup_old_counts)
+CREATE INDEX IF NOT EXISTS idx_message_count_last_message
+ON message_count(last_message_at);
+
+-- Поиск давно не верифицированных пользователей (GroupMonitorService)
+CREATE INDEX IF NOT EXISTS idx_users_verified_created
+ON users(verified, created_at);
+
+-- Проверка whitelist по username
+CREATE INDEX IF NOT EXISTS idx_whitelist_group_username
+ON whitelist(group_id, username);
+
+-- Администраторы группы
+CREATE INDEX IF NOT EXISTS idx_admins_group
+ON admins(group_id);
+
+-- Верификации участников группы
+CREATE INDEX IF NOT EXISTS idx_user_group_verifications_group
+ON user_group_verifications(group_id);
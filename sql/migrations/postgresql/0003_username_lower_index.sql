@@ -0,0 +1,2 @@
+-- В PostgreSQL индекс idx_users_username по lower(username) создается базовой миграцией.
+-- Файл сохраняет нумерацию версий, общую с sqlite/0003_username_lower_index.sql.
@@ -0,0 +1,5 @@
+-- Итог задачи верификации: verified / rejected / error. Записывается в одной транзакции
+-- с изменениями верификации пользователя и только текущим обработчиком (по номеру попытки),
+-- поэтому повторная доставка задачи не выполняет эти изменения еще раз (сообщения - см. 0009).
+
+ALTER TABLE verification_jobs ADD COLUMN outcome TEXT;
@@ -0,0 +1,6 @@
+-- Поиск по username через lower(), одинаковый для SQLite и PostgreSQL.
+-- Для ASCII lower() дает тот же результат, что и COLLATE NOCASE.
+
+DROP INDEX IF EXISTS idx_users_username;
+
+CREATE INDEX IF NOT EXISTS idx_users_username ON users(lower(username));
@@ -0,0 +1,11 @@
+-- Поиск в whitelist по username без учета регистра через lower(), как для users в 0003.
+
+-- Проверка username в группе (WhitelistRepository.is_username_whitelisted)
+DROP INDEX IF EXISTS idx_whitelist_group_username;
+
+CREATE INDEX IF NOT EXISTS idx_whitelist_group_username_lower
+ON whitelist(group_id, lower(username));
+
+-- Проверка без привязки к группе (WhitelistRepository.is_whitelisted_anywhere)
+CREATE INDEX IF NOT EXISTS idx_whitelist_username_lower
+ON whitelist(lower(username));
@@ -0,0 +1,15 @@
+-- Кэш результатов проверок через OpenAI (VerificationResultRepository).
+-- cache_key - SHA-256 нормализованных входных данных проверки.
+
+CREATE TABLE IF NOT EXISTS verification_result_cache (
+    cache_key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    found BOOLEAN NOT NULL DEFAULT FALSE,
+    result TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL
+);
+
+-- Удаление устаревших записей (delete_expired)
+CREATE INDEX IF NOT EXISTS idx_verification_result_cache_expires
+ON verification_result_cache(expires_at);
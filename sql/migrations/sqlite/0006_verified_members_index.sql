@@ -0,0 +1,6 @@
+-- Частичный индекс верифицированных участников: загрузка снимка при старте
+-- (UserGroupVerificationRepository.load_verified_members) читает только индекс
+-- в порядке (group_id, user_id), без сканирования всей таблицы.
+CREATE INDEX IF NOT EXISTS idx_user_group_verifications_verified
+ON user_group_verifications(group_id, user_id)
+WHERE verified = TRUE;
@@ -0,0 +1,21 @@
+-- Очередь фоновых проверок через OpenAI (VerificationJobRepository).
+-- status: pending - ждет обработчика с available_at, running - взята обработчиком,
+-- available_at - срок аренды, после которого задача считается брошенной;
+-- done / failed - завершена. payload - данные FSM на момент постановки в JSON.
+
+CREATE TABLE IF NOT EXISTS verification_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    group_id INTEGER,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at TIMESTAMP NOT NULL,
+    error TEXT,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL
+);
+
+-- Выбор следующей задачи (claim) и удаление завершенных (delete_finished)
+CREATE INDEX IF NOT EXISTS idx_verification_jobs_status_available
+ON verification_jobs(status, available_at);
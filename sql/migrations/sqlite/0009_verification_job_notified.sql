@@ -0,0 +1,5 @@
+-- Отметка об отправке итога задачи пользователю. Итог (outcome) фиксируется до отправки
+-- сообщений, поэтому задача, доставленная повторно после падения между этими шагами,
+-- видит итог без отметки и повторяет только сообщения, без изменений в базе.
+
+ALTER TABLE verification_jobs ADD COLUMN notified BOOLEAN NOT NULL DEFAULT FALSE;
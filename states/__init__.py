@@ -1,7 +1,10 @@
 """FSM состояния для процесса верификации врачей."""
 
 from .verification import VerificationStates
+from .codes import VerificationStateCode, VerificationTypeCode
 
 __all__ = [
     'VerificationStates',
+    'VerificationStateCode',
+    'VerificationTypeCode',
 ]
@@ -0,0 +1,64 @@
+"""Целочисленные коды состояний и типов верификации для компактной схемы БД."""
+
+from enum import IntEnum
+from typing import Dict, Optional
+
+from .verification import VerificationStates
+
+
+class VerificationStateCode(IntEnum):
+    """
+    Код состояния верификации в user_group_verifications.
+
+    Имена совпадают с состояниями VerificationStates. Коды хранятся
+    в базе, поэтому существующие значения менять нельзя - только добавлять.
+    """
+
+    entering_full_name = 1
+    entering_workplace = 2
+    choosing_verification_method = 3
+    entering_website_url = 4
+    uploading_document = 5
+    processing_verification = 6
+    verification_completed = 7
+    verification_failed = 8
+    waiting_for_start = 9
+    verification_timeout = 10
+    pending_removal = 11
+
+
+class VerificationTypeCode(IntEnum):
+    """Код способа верификации (verification_type) в user_group_verifications."""
+
+    manual = 1
+    whitelist = 2
+    auto_verified = 3
+
+
+STATE_BY_CODE: Dict[int, str] = {
+    code: getattr(VerificationStates, code.name).state for code in VerificationStateCode
+}
+CODE_BY_STATE: Dict[str, int] = {state: code for code, state in STATE_BY_CODE.items()}
+
+TYPE_BY_CODE: Dict[int, str] = {code: code.name for code in VerificationTypeCode}
+CODE_BY_TYPE: Dict[str, int] = {name: code for code, name in TYPE_BY_CODE.items()}
+
+
+def encode_state(state: Optional[str]) -> Optional[int]:
+    """Код состояния FSM (None - состояние не задано)."""
+    if state is None:
+        return None
+    try:
+        return CODE_BY_STATE[state]
+    except KeyError:
+        raise ValueError(f"Неизвестное состояние верификации: {state}") from None
+
+
+def encode_verification_type(verification_type: Optional[str]) -> Optional[int]:
+    """Код способа верификации (None - не задан)."""
+    if verification_type is None:
+        return None
+    try:
+        return CODE_BY_TYPE[verification_type]
+    except KeyError:
+        raise ValueError(f"Неизвестный тип верификации: {verification_type}") from None
@@ -0,0 +1,36 @@
+"""Общие фикстуры тестов: хранилища SQLite и PostgreSQL."""
+
+import os
+
+import pytest
+import pytest_asyncio
+
+from bot.database.backends import PostgresBackend, SQLiteBackend
+
+# Строка подключения к тестовой базе PostgreSQL; без нее тесты PostgreSQL пропускаются
+POSTGRES_DSN = os.getenv("TEST_POSTGRES_DSN")
+
+_TEST_TABLE_DDL = {
+    "sqlite": "CREATE TABLE backend_test (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL)",
+    "postgresql": "CREATE TABLE backend_test (id SERIAL PRIMARY KEY, name TEXT NOT NULL)",
+}
+
+
+@pytest_asyncio.fixture(params=["sqlite", "postgresql"])
+async def backend(request, tmp_path):
+    """Подключенное хранилище с пустой таблицей backend_test."""
+    if request.param == "sqlite":
+        storage = SQLiteBackend(str(tmp_path / "test.db"))
+    else:
+        if not POSTGRES_DSN:
+            pytest.skip("TEST_POSTGRES_DSN не задан")
+        storage = PostgresBackend(POSTGRES_DSN, max_size=4)
+
+    await storage.connect()
+    try:
+        await storage.execute("DROP TABLE IF EXISTS backend_test")
+        await storage.execute(_TEST_TABLE_DDL[storage.dialect])
+        yield storage
+        await storage.execute("DROP TABLE IF EXISTS backend_test")
+    finally:
+        await storage.close()
@@ -0,0 +1,119 @@
+"""Тесты хранилищ SQLite и PostgreSQL через общий интерфейс StorageBackend."""
+
+import asyncio
+
+import pytest
+
+from bot.database.backends.postgres import to_postgres_placeholders
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("SELECT 1", "SELECT 1"),
+        ("SELECT * FROM users WHERE user_id = ?", "SELECT * FROM users WHERE user_id = $1"),
+        ("UPDATE t SET a = ?, b = ? WHERE id = ?", "UPDATE t SET a = $1, b = $2 WHERE id = $3"),
+        ("SELECT '?' AS mark, a FROM t WHERE b = ?", "SELECT '?' AS mark, a FROM t WHERE b = $1"),
+        ("SELECT 'it''s ?' FROM t WHERE a = ? AND b = ?", "SELECT 'it''s ?' FROM t WHERE a = $1 AND b = $2"),
+        ("SELECT ? || '' || ?", "SELECT $1 || '' || $2"),
+    ],
+)
+def test_to_postgres_placeholders(query, expected):
+    assert to_postgres_placeholders(query) == expected
+
+
+async def _names(backend):
+    rows = await backend.fetchall("SELECT name FROM backend_test ORDER BY id")
+    return [row["name"] for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_execute_returns_rowcount(backend):
+    await backend.executemany("INSERT INTO backend_test (name) VALUES (?)", [("a",), ("b",), ("c",)])
+
+    assert await backend.execute("UPDATE backend_test SET name = ? WHERE name <> ?", ("x", "a")) == 2
+    assert await backend.execute("DELETE FROM backend_test WHERE name = ?", ("missing",)) == 0
+    assert await _names(backend) == ["a", "x", "x"]
+
+
+@pytest.mark.asyncio
+async def test_execute_returning(backend):
+    first = await backend.execute_returning(
+        "INSERT INTO backend_test (name) VALUES (?) RETURNING id, name", ("first",)
+    )
+    second = await backend.execute_returning(
+        "INSERT INTO backend_test (name) VALUES (?) RETURNING id", ("second",)
+    )
+
+    assert first["name"] == "first"
+    assert second["id"] > first["id"]
+    assert await backend.execute_returning(
+        "UPDATE backend_test SET name = ? WHERE id = ? RETURNING id", ("none", -1)
+    ) is None
+    assert await _names(backend) == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_transaction_commit(backend):
+    committed = []
+
+    async with backend.transaction():
+        assert backend.in_transaction
+        await backend.execute("INSERT INTO backend_test (name) VALUES (?)", ("a",))
+        async with backend.transaction():
+            await backend.execute("INSERT INTO backend_test (name) VALUES (?)", ("b",))
+        backend.after_commit(lambda: committed.append("callback"))
+        # Внутри транзакции видны собственные незафиксированные изменения
+        assert await _names(backend) == ["a", "b"]
+        assert committed == []
+
+    assert not backend.in_transaction
+    assert committed == ["callback"]
+    assert await _names(backend) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_transaction_rollback(backend):
+    committed = []
+    await backend.execute("INSERT INTO backend_test (name) VALUES (?)", ("kept",))
+
+    with pytest.raises(RuntimeError):
+        async with backend.transaction():
+            await backend.execute("INSERT INTO backend_test (name) VALUES (?)", ("lost",))
+            await backend.execute("UPDATE backend_test SET name = ? WHERE name = ?", ("changed", "kept"))
+            backend.after_commit(lambda: committed.append("callback"))
+            raise RuntimeError("rollback")
+
+    assert not backend.in_transaction
+    assert committed == []
+    assert await _names(backend) == ["kept"]
+
+
+@pytest.mark.asyncio
+async def test_after_commit_outside_transaction(backend):
+    committed = []
+    backend.after_commit(lambda: committed.append("callback"))
+    assert committed == ["callback"]
+
+
+@pytest.mark.asyncio
+async def test_lock_schema_serializes_transactions(backend):
+    events = []
+    first_locked = asyncio.Event()
+
+    async def first():
+        async with backend.transaction():
+            await backend.lock_schema()
+            first_locked.set()
+            await asyncio.sleep(0.2)
+            events.append("first done")
+
+    async def second():
+        await first_locked.wait()
+        async with backend.transaction():
+            await backend.lock_schema()
+            events.append("second locked")
+
+    await asyncio.wait_for(asyncio.gather(first(), second()), timeout=10)
+
+    assert events == ["first done", "second locked"]
@@ -0,0 +1,71 @@
+"""Тесты групп: записи, созданные до регистрации группы ботом."""
+
+import pytest
+
+from bot.database.manager import DatabaseManager
+from bot.database.models.group import Group
+
+
+async def _restart(path):
+    manager = DatabaseManager(str(path))
+    await manager.init_database()
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_verification_for_unregistered_group_survives_restart(tmp_path):
+    path = tmp_path / "bot.db"
+    manager = await _restart(path)
+    await manager.user_group_verifications.get_or_create(1, -100)
+    await manager.user_group_verifications.create_for_new_member(2, -200)
+    await manager.close()
+
+    manager = await _restart(path)
+    try:
+        for group_id in (-100, -200):
+            group = await manager.groups.get_by_id(group_id)
+            assert group.group_name == ""
+            assert not group.is_active
+        assert await manager.groups.get_active() == []
+
+        await manager.groups.add_or_update(Group(group_id=-100, group_name="Врачи", is_active=True))
+        assert [group.group_name for group in await manager.groups.get_active()] == ["Врачи"]
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_nameless_active_group_from_older_version(tmp_path):
+    path = tmp_path / "bot.db"
+    manager = await _restart(path)
+    await manager.backend.execute(
+        "INSERT INTO groups (group_id, is_active, added_at, updated_at) "
+        "VALUES (?, TRUE, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+        (-300,),
+    )
+    await manager.close()
+
+    manager = await _restart(path)
+    try:
+        assert [(group.group_id, group.group_name) for group in await manager.groups.get_active()] == [(-300, "")]
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_group_cache_not_updated_on_rollback(tmp_path):
+    manager = await _restart(tmp_path / "bot.db")
+    try:
+        await manager.groups.add_or_update(Group(group_id=-100, group_name="Врачи", is_active=True))
+
+        with pytest.raises(RuntimeError):
+            async with manager.transaction():
+                await manager.groups.set_active_status(-100, False)
+                await manager.groups.toggle_checkin_mode(-100)
+                raise RuntimeError("rollback")
+
+        group = await manager.groups.get_by_id(-100)
+        assert group.is_active
+        assert not group.checkin_mode
+    finally:
+        await manager.close()
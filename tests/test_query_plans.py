@@ -0,0 +1,136 @@
+"""
+Планы SQL-запросов репозиториев.
+
+Каждый запрос из репозиториев проверяется через EXPLAIN QUERY PLAN на
+схеме из миграций SQLite: полное сканирование (SCAN) горячих таблиц
+в запросе с WHERE считается ошибкой.
+"""
+
+import ast
+import importlib
+import re
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from bot.database.migrations import discover_migrations
+
+# Таблицы, которые растут вместе с количеством пользователей и сообщений
+HOT_TABLES = {
+    "users",
+    "verification_logs",
+    "message_count",
+    "whitelist",
+    "admins",
+    "user_group_verifications",
+}
+
+SQL_START_RE = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH|REPLACE)\b", re.IGNORECASE)
+SCAN_RE = re.compile(r"^SCAN (\w+)")
+SCAN_INDEX_RE = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+WHERE_RE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+
+
+def repository_modules():
+    """Модули репозиториев в пакете бота."""
+    directory = Path(importlib.import_module("bot.database.repositories.base").__file__).parent
+    return sorted(path for path in directory.iterdir() if path.is_file() and path.suffix == ".py")
+
+
+def render_f_string(node):
+    """Подстановка NULL вместо выражений f-строки (подходит для фрагментов вида {now})."""
+    parts = []
+    for value in node.values:
+        if isinstance(value, ast.Constant):
+            parts.append(str(value.value))
+        else:
+            parts.append("NULL")
+    return "".join(parts)
+
+
+def extract_queries(path):
+    """SQL-строки модуля: (функция, строка, запрос)."""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+
+    queries = []
+    for func in ast.walk(tree):
+        if not isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        f_string_parts = set()
+        for node in ast.walk(func):
+            if isinstance(node, ast.JoinedStr):
+                f_string_parts.update(id(value) for value in node.values)
+                sql = render_f_string(node)
+            elif isinstance(node, ast.Constant) and isinstance(node.value, str) and id(node) not in f_string_parts:
+                sql = node.value
+            else:
+                continue
+            if SQL_START_RE.match(sql):
+                queries.append((func.name, node.lineno, sql))
+    return queries
+
+
+def collect_queries():
+    """Параметры теста: запрос с идентификатором вида файл:строка функция()."""
+    return [
+        pytest.param(sql, id=f"{path.name}:{lineno} {func_name}()")
+        for path in repository_modules()
+        for func_name, lineno, sql in extract_queries(path)
+    ]
+
+
+QUERIES = collect_queries()
+
+
+@pytest.fixture(scope="module")
+def schema():
+    """База в памяти со всеми миграциями, как рабочая."""
+    conn = sqlite3.connect(":memory:")
+    for migration in discover_migrations():
+        for statement in migration.statements():
+            conn.execute(statement)
+    yield conn
+    conn.close()
+
+
+def partial_indexes(conn):
+    """Имена частичных индексов (CREATE INDEX ... WHERE)."""
+    rows = conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")
+    return {name for name, sql in rows if WHERE_RE.search(sql)}
+
+
+def full_scans(conn, sql):
+    """Полные сканирования горячих таблиц в плане запроса."""
+    params = (None,) * sql.count("?")
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    partial = partial_indexes(conn)
+
+    scans = []
+    for row in plan:
+        detail = row[-1]
+        match = SCAN_RE.match(detail)
+        if not match or match.group(1) not in HOT_TABLES:
+            continue
+        # Частичный индекс содержит только отобранные условием строки
+        index = SCAN_INDEX_RE.search(detail)
+        if index and index.group(1) in partial:
+            continue
+        scans.append(detail)
+    return scans
+
+
+def test_queries_found():
+    assert QUERIES, "в репозиториях не найдено ни одного SQL-запроса"
+
+
+@pytest.mark.parametrize("sql", QUERIES)
+def test_no_full_scan_of_hot_tables(schema, sql):
+    try:
+        scans = full_scans(schema, sql)
+    except sqlite3.Error as e:
+        pytest.fail(f"запрос не разбирается SQLite: {e}")
+
+    # Запрос без WHERE - осознанная выгрузка всей таблицы
+    if WHERE_RE.search(sql):
+        assert not scans, "; ".join(scans)
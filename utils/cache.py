@@ -0,0 +1,142 @@
+"""Ограниченный LRU-кэш с TTL записей и однократной загрузкой (single-flight)."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class LRUCache(Generic[K, V]):
+    """
+    LRU-кэш в памяти процесса с временем жизни для каждой записи.
+
+    При переполнении вытесняется запись, к которой дольше всего не обращались.
+    `get_or_load` объединяет конкурентные загрузки одного ключа: загрузчик
+    вызывается один раз, остальные задачи ждут его результат.
+
+    Кэш не защищен от изменения значений: возвращаемые объекты общие,
+    изменять их нельзя.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        """
+        Инициализация кэша.
+
+        :param maxsize: Максимальное количество записей.
+        :param ttl: Время жизни записи в секундах по умолчанию (None - без ограничения).
+        """
+        if maxsize <= 0:
+            raise ValueError("Размер кэша должен быть больше 0")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._loading: Dict[K, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: K, default=None):
+        """Значение по ключу или default, если записи нет или она устарела."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """
+        Сохранение значения.
+
+        Загрузка этого ключа, начатая до вызова, не перезапишет значение.
+
+        :param ttl: Время жизни записи в секундах (по умолчанию - TTL кэша).
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else float("inf")
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        self._loading.pop(key, None)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """
+        Удаление записи.
+
+        Загрузка этого ключа, начатая до вызова, не сохранит свой результат в кэш.
+        """
+        self._data.pop(key, None)
+        self._loading.pop(key, None)
+
+    def clear(self) -> None:
+        """Удаление всех записей."""
+        self._data.clear()
+        self._loading.clear()
+
+    async def get_or_load(
+        self,
+        key: K,
+        loader: Callable[[], Awaitable[V]],
+        ttl: Optional[float] = None,
+        cache_if: Optional[Callable[[V], bool]] = None,
+    ) -> V:
+        """
+        Значение из кэша или результат загрузчика.
+
+        :param key: Ключ.
+        :param loader: Корутина-функция загрузки значения.
+        :param ttl: Время жизни записи в секундах (по умолчанию - TTL кэша).
+        :param cache_if: Сохранять результат, только если условие истинно (по умолчанию - всегда).
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await loader()
+        except Exception as e:
+            self._finish_loading(key, future)
+            future.set_exception(e)
+            # Исключение получает вызывающий, ожидающих задач может не быть
+            future.exception()
+            raise
+        except BaseException:
+            self._finish_loading(key, future)
+            future.cancel()
+            raise
+
+        # Ключ мог быть инвалидирован или записан во время загрузки - тогда результат не сохраняется
+        if self._finish_loading(key, future) and (cache_if is None or cache_if(value)):
+            self.set(key, value, ttl)
+        future.set_result(value)
+        return value
+
+    def _finish_loading(self, key: K, future: asyncio.Future) -> bool:
+        """Снятие отметки о загрузке. Возвращает False, если ключ инвалидирован или записан во время загрузки."""
+        if self._loading.get(key) is future:
+            del self._loading[key]
+            return True
+        return False
@@ -0,0 +1,58 @@
+"""Нормализация входных данных верификации для ключей кэша результатов."""
+
+import hashlib
+import ipaddress
+import re
+from typing import Optional
+from urllib.parse import urlsplit
+
+# Суффиксы второго уровня, под которыми регистрируются домены организаций
+# (выборка из Public Suffix List для доменов, встречающихся у медорганизаций)
+_SECOND_LEVEL_SUFFIXES = frozenset({
+    "com.ru", "net.ru", "org.ru", "pp.ru", "msk.ru", "spb.ru", "msk.su", "spb.su",
+    "com.ua", "org.ua", "kiev.ua", "com.by", "org.by", "com.kz", "org.kz",
+    "co.uk", "org.uk", "ac.uk", "com.au", "org.au", "co.il", "org.il",
+})
+
+_PUNCTUATION_RE = re.compile(r"[.,;:\"'«»„“”()№]")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Строка без учета регистра, кавычек, знаков препинания и лишних пробелов."""
+    if not value:
+        return ""
+    value = _PUNCTUATION_RE.sub(" ", value.casefold())
+    return _SPACES_RE.sub(" ", value).strip()
+
+
+def registrable_domain(url: Optional[str]) -> str:
+    """
+    Регистрируемый домен сайта: `https://www.gp1.spb.ru/doctors` → `gp1.spb.ru`.
+
+    Кириллические домены приводятся к punycode, IP-адреса возвращаются как есть.
+    """
+    if not url:
+        return ""
+    value = url.strip().lower()
+    if "://" not in value:
+        value = "https://" + value
+    host = (urlsplit(value).hostname or "").rstrip(".")
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    try:
+        host = host.encode("idna").decode("ascii")
+    except UnicodeError:
+        pass
+
+    labels = host.split(".")
+    size = 3 if ".".join(labels[-2:]) in _SECOND_LEVEL_SUFFIXES else 2
+    return ".".join(labels[-size:])
+
+
+def cache_key(*parts: str) -> str:
+    """SHA-256 нормализованных частей ключа."""
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
@@ -6,6 +6,7 @@ from aiogram.types import CallbackQuery
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from bot.services.admin_service import AdminService
+from bot.services.bot_api_cache import BotApiCache
 from bot.services.whitelist_service import WhitelistService
 from config.settings import Settings
 from .utils import check_admin_permissions, get_whitelist_management_text_and_keyboard
@@ -42,7 +43,8 @@ async def list_whitelisted_users(
     callback: CallbackQuery,
     admin_service: AdminService,
     whitelist_service: WhitelistService,
-    settings: Settings
+    settings: Settings,
+    bot_api: BotApiCache
 ):
     """Отображает список пользователей в белом списке."""
     group_id = int(callback.data.split(':')[-1])
@@ -62,7 +64,7 @@ async def list_whitelisted_users(
                 user_info = f"@{entry.username}"
 
             try:
-                admin_user = await callback.bot.get_chat_member(callback.message.chat.id, entry.added_by)
+                admin_user = await bot_api.get_chat_member(callback.message.chat.id, entry.added_by)
                 if admin_user.user.username:
                     admin_info = f"@{admin_user.user.username}"
                 else: